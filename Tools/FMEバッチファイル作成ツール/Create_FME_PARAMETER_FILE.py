@@ -19,26 +19,63 @@ c:\temp\command.fmw --SourceDataset_ACAD "\"\"C:\FMEData\Data\Water\distribution
 10/19の更新： 
 ・v118用にiur1.4のxsdスキーマファイルを指定できるように更新
 
+2026/10/18の更新：
+・1つのFMEのプロセスで都市全体を変換すると1コアで数時間かかるため、CityGML ファイルをファイルサイズの合計が均等になるように
+  N個（シャード）に分割して、シャードごとにパラメータファイルと出力するFGDBを作成できるように更新
+  例）ConvBuilding.par, 11100_bldg.gdb を3分割 → ConvBuilding_1.par ～ ConvBuilding_3.par, 11100_bldg_1.gdb ～ 11100_bldg_3.gdb
+・作成したパラメータファイルを、指定した並列数でFMEを同時に実行するランナーを追加（シャードごとの処理時間と終了コードを表示）
+  fme.exe のパスは引数で指定できる（省略した場合はレジストリの Data Interoperability のインストール先）
+・パラメータ 6: 分割数、7: 実行する(true/false)、8: 並列数、9: fme.exe のパス を追加（いずれも省略可）
+・変換する範囲（AOI）を指定できるように更新。ファイル名の先頭の標準地域メッシュコード（例: 53394611_bldg_6697.gml）から
+  ファイルごとの範囲を求めてメモリ上の索引を作成し、AOI と重なるファイルだけをFMEに渡す
+  AOI は経緯度の矩形「最小経度 最小緯度 最大経度 最大緯度」か、メッシュコードの一覧（; または , 区切り）で指定
+  オプションで、AOI の矩形をFMEの CITYGML_IN_SEARCH_ENVELOPE_MINX/MINY/MAXX/MAXY に設定する
+・パラメータ 10: 変換する範囲（AOI）、11: AOI を検索範囲(SEARCH_ENVELOPE)に設定する(true/false) を追加（いずれも省略可）
+・fme.exe のパスに *.py（Tools/benchmark/fme_stub_v100.py などのスタブ）を指定した場合は python で実行するように更新
+
 Author      :
 Copyright   :
 Created     :2021/06/08
-LastUpdated :2021/10/19
+LastUpdated :2026/10/18
 ArcGIS Version: ArcGIS Pro 2.6 以上
 """
 
 import os,sys
+import re
 import glob
+import time
+import heapq
+import subprocess
+import concurrent.futures
 import arcpy
-import winreg
+try:
+    import winreg
+except ImportError:
+    winreg = None # Windows 以外（fme.exe のパスを指定して実行する場合）
 
 PARAM1_SOURCE_DATASET=r"--SourceDataset_CITYGML"
 PARAM2_TEMPLATE_XML=r"--TEMPLATEFILE_GEODATABASE_FILE"
 PARAM3_DEST_DATASET=r"--DestDataset_GEODATABASE_FILE"
 PARAM4_ADE_XSD=r"--ADE_XSD_DOC_CITYGML"
+PARAM5_USE_SEARCH_ENVELOPE=r"--CITYGML_IN_USE_SEARCH_ENVELOPE_CITYGML_1"
+PARAM5_SEARCH_ENVELOPE_MINX=r"--CITYGML_IN_SEARCH_ENVELOPE_MINX_CITYGML_1"
+PARAM5_SEARCH_ENVELOPE_MINY=r"--CITYGML_IN_SEARCH_ENVELOPE_MINY_CITYGML_1"
+PARAM5_SEARCH_ENVELOPE_MAXX=r"--CITYGML_IN_SEARCH_ENVELOPE_MAXX_CITYGML_1"
+PARAM5_SEARCH_ENVELOPE_MAXY=r"--CITYGML_IN_SEARCH_ENVELOPE_MAXY_CITYGML_1"
 
 #FME_EXE_PATH=r"C:\Program Files\ArcGIS\Data Interoperability for ArcGIS Pro\fme.exe"
 PARAM_PARAMETER_FILE=r"PARAMETER_FILE"
 
+#シャードごとのFMEの実行ログの拡張子（パラメータファイル名 + .log）
+LOG_FILE_EXT=".log"
+
+#ファイル名の先頭の標準地域メッシュコード（1次～1/8地域メッシュ）
+MESH_CODE_PATTERN=re.compile(r"^(\d{4}|\d{6}|\d{8,11})_")
+#メッシュの範囲は 1/8秒 単位の整数で計算（隣り合うメッシュの境界で誤差が出ないように）
+MESH_UNITS_PER_DEGREE=3600 * 8
+#メッシュコードの桁数ごとの (緯度方向の大きさ, 経度方向の大きさ)（1/8秒 単位）
+MESH_SIZES={4: (19200, 28800), 6: (2400, 3600), 8: (240, 360), 9: (120, 180), 10: (60, 90), 11: (30, 45)}
+
 def getArcGISPro_InstallDir():
     '''
     レジストリからArcGIS Pro の InstallDir を取得
@@ -73,33 +110,187 @@ def createMultipleDatasetPath(files):
     sfiles = "\\\"{}\\\"".format(sfiles)
     return sfiles
 
-def createParameterFile(fmw_model, citygml_folders, schema_xml, output_gdb, param_file, xsd_file):
+def listCityGmlFiles(citygml_folders):
+    '''
+    ";" 区切りの複数フォルダから *.gml ファイルの一覧を作成
+    '''
+    folders = citygml_folders.split(";")
+    fileslist = []
+    for folder in folders:
+        files = glob.glob(folder + os.path.sep + "*.gml")
+        fileslist.extend(files)
+    return fileslist
+
+def shardFiles(files, shards):
+    '''
+    ファイルサイズの合計が均等になるように、ファイルの一覧を shards 個に分割
+    サイズの大きいファイルから順に、合計が最も小さいシャードに割り当てる（シャード内は元の順序）
+    [(ファイルの一覧, 合計サイズ), ...] を返却（ファイルがないシャードは除く）
+    '''
+    shards = max(1, min(shards, len(files)))
+    sizes = [(os.path.getsize(f), i) for i, f in enumerate(files)]
+    sizes.sort(key=lambda x: (-x[0], x[1]))
+    heap = [(0, n, []) for n in range(shards)]
+    for size, i in sizes:
+        total, n, indexes = heapq.heappop(heap)
+        indexes.append(i)
+        heapq.heappush(heap, (total + size, n, indexes))
+    result = []
+    for total, n, indexes in sorted(heap, key=lambda x: x[1]):
+        if len(indexes) > 0:
+            result.append(([files[i] for i in sorted(indexes)], total))
+    return result
+
+def getShardPath(path, shard_no):
+    '''
+    シャード番号をつけたパスを作成（例: ConvBuilding.par → ConvBuilding_1.par）
+    '''
+    base, ext = os.path.splitext(path)
+    return "{0}_{1}{2}".format(base, shard_no, ext)
+
+def decodeMeshCode(code):
+    '''
+    標準地域メッシュコード（4, 6, 8桁 と 2分の1, 4分の1, 8分の1 地域メッシュの 9～11桁）から
+    範囲 (最小経度, 最小緯度, 最大経度, 最大緯度) を 1/8秒 単位の整数で返却（不正なコードの場合は None）
+    '''
+    if len(code) not in MESH_SIZES or not code.isdigit():
+        return None
+    lat = int(code[0:2]) * 19200
+    lon = (int(code[2:4]) + 100) * MESH_UNITS_PER_DEGREE
+    if len(code) >= 6:
+        s, t = int(code[4]), int(code[5])
+        if s > 7 or t > 7:
+            return None
+        lat += s * 2400
+        lon += t * 3600
+    if len(code) >= 8:
+        lat += int(code[6]) * 240
+        lon += int(code[7]) * 360
+    for n in range(8, len(code)):
+        #2分の1 以下の地域メッシュは 1:南西, 2:南東, 3:北西, 4:北東
+        c = int(code[n])
+        if c < 1 or c > 4:
+            return None
+        h, w = MESH_SIZES[n + 1]
+        lat += ((c - 1) // 2) * h
+        lon += ((c - 1) % 2) * w
+    h, w = MESH_SIZES[len(code)]
+    return (lon, lat, lon + w, lat + h)
+
+def toDegrees(extent):
+    return tuple([v / float(MESH_UNITS_PER_DEGREE) for v in extent])
+
+def parseAoi(aoi_text):
+    '''
+    変換する範囲（AOI）の文字列から、範囲 (最小経度, 最小緯度, 最大経度, 最大緯度) を度で返却
+    「最小経度 最小緯度 最大経度 最大緯度」の矩形か、メッシュコードの一覧（; または , 区切り。複数の場合はすべてを含む範囲）
+    '''
+    tokens = [t for t in re.split(r"[;,\s]+", aoi_text.strip()) if t != ""]
+    if len(tokens) == 0:
+        return None
+    if all([t.isdigit() for t in tokens]):
+        extents = []
+        for t in tokens:
+            extent = decodeMeshCode(t)
+            if extent is None:
+                raise ValueError(u"{0} は標準地域メッシュコードではありません".format(t))
+            extents.append(extent)
+        return toDegrees((min([e[0] for e in extents]), min([e[1] for e in extents]),
+                          max([e[2] for e in extents]), max([e[3] for e in extents])))
+    if len(tokens) != 4:
+        raise ValueError(u"{0} は「最小経度 最小緯度 最大経度 最大緯度」の形式で指定してください".format(aoi_text))
+    minx, miny, maxx, maxy = [float(t) for t in tokens]
+    if minx >= maxx or miny >= maxy:
+        raise ValueError(u"{0} の最小値が最大値以上です".format(aoi_text))
+    return (minx, miny, maxx, maxy)
+
+class MeshFileIndex(object):
+    '''
+    ファイル名のメッシュコードから求めたファイルごとの範囲を、1次メッシュごとにまとめたメモリ上の索引
+    '''
+    def __init__(self, files):
+        self.meshes = {} # 1次メッシュコード: [(範囲, ファイル), ...]
+        self.unknown = [] # メッシュコードがないファイル
+        for f in files:
+            m = MESH_CODE_PATTERN.match(os.path.basename(f))
+            extent = decodeMeshCode(m.group(1)) if m else None
+            if extent is None:
+                self.unknown.append(f)
+            else:
+                self.meshes.setdefault(m.group(1)[0:4], []).append((extent, f))
+
+    def query(self, aoi):
+        '''
+        範囲 (最小経度, 最小緯度, 最大経度, 最大緯度)（度）と重なるファイルを返却（境界で接するだけのファイルは除く）
+        '''
+        minx, miny, maxx, maxy = [v * MESH_UNITS_PER_DEGREE for v in aoi]
+        result = []
+        for first in self.meshes:
+            fminx, fminy, fmaxx, fmaxy = decodeMeshCode(first)
+            if fminx >= maxx or fmaxx <= minx or fminy >= maxy or fmaxy <= miny:
+                continue
+            for extent, f in self.meshes[first]:
+                if extent[0] < maxx and extent[2] > minx and extent[1] < maxy and extent[3] > miny:
+                    result.append(f)
+        return result
+
+def selectFilesByAoi(fileslist, aoi):
+    '''
+    ファイルの一覧から、AOI と重なるファイルを元の順序で返却（メッシュコードがないファイルは対象に含める）
+    '''
+    index = MeshFileIndex(fileslist)
+    selected = set(index.query(aoi))
+    selected.update(index.unknown)
+    if len(index.unknown) > 0:
+        arcpy.AddWarning(u"ファイル名にメッシュコードがない {0} ファイルは範囲に関係なく変換します".format(len(index.unknown)))
+    arcpy.AddMessage(u"変換する範囲と重なる {0} / {1} ファイルを変換します".format(len(selected), len(fileslist)))
+    return [f for f in fileslist if f in selected]
+
+def createEnvelopeParameters(aoi):
+    '''
+    AOI の矩形をFMEの検索範囲（SEARCH_ENVELOPE）に設定するパラメータを作成（座標の順序は SRS_AXIS_ORDER 2,1,3 で 経度, 緯度）
+    '''
+    minx, miny, maxx, maxy = aoi
+    return "{0} YES {1} {2!r} {3} {4!r} {5} {6!r} {7} {8!r}".format(PARAM5_USE_SEARCH_ENVELOPE,
+        PARAM5_SEARCH_ENVELOPE_MINX, minx, PARAM5_SEARCH_ENVELOPE_MINY, miny,
+        PARAM5_SEARCH_ENVELOPE_MAXX, maxx, PARAM5_SEARCH_ENVELOPE_MAXY, maxy)
+
+def createParameters(fmw_model, fileslist, schema_xml, output_gdb, xsd_file, envelope=None):
+    '''
+    パラメータファイルの中身を作成
+    envelope には検索範囲に設定する (最小経度, 最小緯度, 最大経度, 最大緯度) を指定
+    '''
+    param0 = "\"{0}\"".format(fmw_model)
+    param2 = "{0} \"{1}\"".format(PARAM2_TEMPLATE_XML, schema_xml)
+    param3 = "{0} \"{1}\"".format(PARAM3_DEST_DATASET, output_gdb)
+    param4 = "{0} \"{1}\"".format(PARAM4_ADE_XSD, xsd_file)
+    files_param = createMultipleDatasetPath(fileslist)
+    param1 = "{0} \"{1}\"".format(PARAM1_SOURCE_DATASET, files_param)
+
+    params = "{0} {1} {2} {3}".format(param0, param1, param2, param3)
+    #v118用にiur1.4のxsdスキーマファイルを指定
+    if xsd_file is not None:
+        params = "{0} {1} {2} {3} {4}".format(param0, param1, param2, param3, param4)
+    if envelope is not None:
+        params = "{0} {1}".format(params, createEnvelopeParameters(envelope))
+    return params
+
+def createParameterFile(fmw_model, citygml_folders, schema_xml, output_gdb, param_file, xsd_file, aoi=None, use_envelope=False):
     '''
     >fme.exe PARAMETER_FILE <parameterFile>
     での実行用にparameterFile　を作成する
+    aoi を指定した場合は範囲と重なるファイルだけを対象にし、use_envelope の場合は検索範囲にも設定する
     '''
     blResult = True
     try:
-        param0 = "\"{0}\"".format(fmw_model)
-        param2 = "{0} \"{1}\"".format(PARAM2_TEMPLATE_XML, schema_xml)
-        param3 = "{0} \"{1}\"".format(PARAM3_DEST_DATASET, output_gdb)
-        param4 = "{0} \"{1}\"".format(PARAM4_ADE_XSD, xsd_file)
         #単独フォルダ：
         #files = glob.glob(citygml_folder + os.path.sep + "*.gml")
         #files_param = createMultipleDatasetPath(files)
         #複数フォルダ：
-        folders = citygml_folders.split(";")
-        fileslist = []
-        for folder in folders:
-            files = glob.glob(folder + os.path.sep + "*.gml")
-            fileslist.extend(files)
-        files_param = createMultipleDatasetPath(fileslist)
-        param1 = "{0} \"{1}\"".format(PARAM1_SOURCE_DATASET, files_param)
-        
-        params = "{0} {1} {2} {3}".format(param0, param1, param2, param3)
-        #v118用にiur1.4のxsdスキーマファイルを指定
-        if xsd_file is not None:
-            params = "{0} {1} {2} {3} {4}".format(param0, param1, param2, param3, param4)
+        fileslist = listCityGmlFiles(citygml_folders)
+        if aoi is not None:
+            fileslist = selectFilesByAoi(fileslist, aoi)
+        params = createParameters(fmw_model, fileslist, schema_xml, output_gdb, xsd_file, aoi if use_envelope else None)
             
         with open(param_file, 'w', encoding='shift_jis') as f:
             f.write(params)
@@ -107,7 +298,101 @@ def createParameterFile(fmw_model, citygml_folders, schema_xml, output_gdb, para
         arcpy.AddError(e.args[0])
         blResult = False
     return blResult
-        
+
+def createShardedParameterFiles(fmw_model, citygml_folders, schema_xml, output_gdb, param_file, xsd_file, shards, aoi=None, use_envelope=False):
+    '''
+    CityGML ファイルをファイルサイズの合計が均等になるように shards 個に分割して、シャードごとに
+    パラメータファイルと出力するFGDBのパスにシャード番号をつけてパラメータファイルを作成する
+    [(パラメータファイル, 出力FGDB, ファイル数, 合計サイズ), ...] を返却（エラーの場合は None）
+    '''
+    try:
+        fileslist = listCityGmlFiles(citygml_folders)
+        if aoi is not None:
+            fileslist = selectFilesByAoi(fileslist, aoi)
+        if len(fileslist) == 0:
+            arcpy.AddError(u"{0} には変換するCityGML ファイル（*.gml）がありません".format(citygml_folders))
+            return None
+        results = []
+        for n, (files, total) in enumerate(shardFiles(fileslist, shards), 1):
+            shard_param_file = getShardPath(param_file, n)
+            shard_gdb = getShardPath(output_gdb, n)
+            params = createParameters(fmw_model, files, schema_xml, shard_gdb, xsd_file, aoi if use_envelope else None)
+            with open(shard_param_file, 'w', encoding='shift_jis') as f:
+                f.write(params)
+            arcpy.AddMessage(u"{0}: {1} ファイル（{2:.1f} MB） → {3}".format(shard_param_file, len(files), total / 1048576.0, shard_gdb))
+            results.append((shard_param_file, shard_gdb, len(files), total))
+        return results
+    except Exception as e:
+        arcpy.AddError(e.args[0])
+        return None
+
+def getFmeExePath():
+    '''
+    Data Interoperability for ArcGIS Pro の fme.exe のパスを取得
+    '''
+    return os.path.join(getDataInterop_InstallDir(), "fme.exe")
+
+def runParameterFile(fme_exe, param_file):
+    '''
+    >fme.exe PARAMETER_FILE <parameterFile>
+    を実行し、(終了コード, 処理時間(秒)) を返却。FMEの出力はパラメータファイル名 + .log に保存
+    '''
+    started = time.time()
+    log_file = param_file + LOG_FILE_EXT
+    fme_dir = os.path.dirname(fme_exe)
+    cmd = [fme_exe, PARAM_PARAMETER_FILE, param_file]
+    #fme.exe の代わりのスタブ（*.py）を指定した場合は python で実行
+    if fme_exe.lower().endswith(".py"):
+        cmd = [sys.executable] + cmd
+    with open(log_file, 'wb') as log:
+        #Data Interoperability はFME.exe へのパスを環境変数に設定していないので、fme.exe のフォルダで実行
+        proc = subprocess.run(cmd, stdout=log, stderr=subprocess.STDOUT,
+                              cwd=fme_dir if fme_dir else None)
+    return proc.returncode, time.time() - started
+
+def formatSeconds(sec):
+    '''
+    秒を h:mm:ss の形式にする
+    '''
+    sec = int(sec)
+    return "{0}:{1:02d}:{2:02d}".format(sec // 3600, (sec % 3600) // 60, sec % 60)
+
+def runParameterFiles(param_files, workers=None, fme_exe=None):
+    '''
+    複数のパラメータファイルを workers の並列数でFMEを同時に実行し、シャードごとの処理時間と終了コードを表示
+    fme_exe を省略した場合はレジストリから取得した fme.exe を使用
+    [(パラメータファイル, 終了コード, 処理時間(秒)), ...] を返却
+    '''
+    if fme_exe is None or fme_exe == "":
+        fme_exe = getFmeExePath()
+    if workers is None or workers <= 0:
+        workers = len(param_files)
+    workers = max(1, min(workers, len(param_files)))
+    arcpy.AddMessage(u"{0} 個のパラメータファイルを {1} 並列で実行します: {2}".format(len(param_files), workers, fme_exe))
+
+    started = time.time()
+    results = []
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = dict((executor.submit(runParameterFile, fme_exe, f), f) for f in param_files)
+        for future in concurrent.futures.as_completed(futures):
+            param_file = futures[future]
+            try:
+                returncode, elapsed = future.result()
+            except OSError as e:
+                arcpy.AddError(u"{0}: 実行できませんでした（{1}）".format(param_file, e))
+                results.append((param_file, None, 0.0))
+                continue
+            if returncode == 0:
+                arcpy.AddMessage(u"{0}: 終了コード {1}, 処理時間 {2}".format(param_file, returncode, formatSeconds(elapsed)))
+            else:
+                arcpy.AddWarning(u"{0}: 終了コード {1}, 処理時間 {2}（ログ: {3}）".format(param_file, returncode, formatSeconds(elapsed), param_file + LOG_FILE_EXT))
+            results.append((param_file, returncode, elapsed))
+
+    failed = len([r for r in results if r[1] != 0])
+    arcpy.AddMessage(u"全体の処理時間 {0}（成功 {1} / 失敗 {2}）".format(formatSeconds(time.time() - started), len(results) - failed, failed))
+    order = dict((f, i) for i, f in enumerate(param_files))
+    results.sort(key=lambda r: order[r[0]])
+    return results
 
 
 def main():
@@ -132,23 +417,55 @@ def main():
         
         #v118用にiur1.4のxsdスキーマファイルを指定
         xsd_file = None
-        if arcpy.GetArgumentCount() == 6:
+        if arcpy.GetArgumentCount() >= 6 and arcpy.GetParameterAsText(5) != "":
             xsd_file = arcpy.GetParameterAsText(5)
         
+        #分割数、実行するかどうか、並列数、fme.exe のパス
+        shards = 1
+        if arcpy.GetArgumentCount() >= 7 and arcpy.GetParameterAsText(6) != "":
+            shards = int(arcpy.GetParameterAsText(6))
+        run = False
+        if arcpy.GetArgumentCount() >= 8:
+            run = arcpy.GetParameterAsText(7).lower() == "true"
+        workers = None
+        if arcpy.GetArgumentCount() >= 9 and arcpy.GetParameterAsText(8) != "":
+            workers = int(arcpy.GetParameterAsText(8))
+        fme_exe = None
+        if arcpy.GetArgumentCount() >= 10 and arcpy.GetParameterAsText(9) != "":
+            fme_exe = arcpy.GetParameterAsText(9)
+        
+        #変換する範囲（AOI）と、検索範囲に設定するかどうか
+        aoi = None
+        if arcpy.GetArgumentCount() >= 11 and arcpy.GetParameterAsText(10) != "":
+            aoi = parseAoi(arcpy.GetParameterAsText(10))
+        use_envelope = False
+        if arcpy.GetArgumentCount() >= 12:
+            use_envelope = arcpy.GetParameterAsText(11).lower() == "true"
+        
         #チェック
         
         #パラメータファイルの中身を作成
 
         
         #パラメータファイルをSJISファイルとして保存
-        blResult = createParameterFile(fmw_model, citygml_folders, schema_xml, output_gdb, param_file, xsd_file)      
+        if shards > 1:
+            shard_results = createShardedParameterFiles(fmw_model, citygml_folders, schema_xml, output_gdb, param_file, xsd_file, shards, aoi, use_envelope)
+            blResult = shard_results is not None
+            param_files = [r[0] for r in shard_results] if blResult else []
+        else:
+            blResult = createParameterFile(fmw_model, citygml_folders, schema_xml, output_gdb, param_file, xsd_file, aoi, use_envelope)
+            param_files = [param_file]
 
         if blResult:
             arcpy.AddMessage(u"PARAMETER_FILEの作成終了")
-            # パラメータファイルを指定したコマンドを作成
-            FME_EXE_PATH = os.path.join(getDataInterop_InstallDir(), "fme.exe")
-            cmd = "\"{0}\" {1} \"{2}\"".format(FME_EXE_PATH, PARAM_PARAMETER_FILE, param_file)
-            arcpy.AddMessage(u"次の実行コマンドで実行してください: {0}".format(cmd))
+            if run:
+                runParameterFiles(param_files, workers, fme_exe)
+            else:
+                # パラメータファイルを指定したコマンドを作成
+                FME_EXE_PATH = fme_exe if fme_exe is not None else getFmeExePath()
+                for f in param_files:
+                    cmd = "\"{0}\" {1} \"{2}\"".format(FME_EXE_PATH, PARAM_PARAMETER_FILE, f)
+                    arcpy.AddMessage(u"次の実行コマンドで実行してください: {0}".format(cmd))
 
         arcpy.AddMessage(u"処理終了：")
     except arcpy.ExecuteError:
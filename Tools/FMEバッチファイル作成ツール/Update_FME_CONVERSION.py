@@ -0,0 +1,522 @@
+# coding : utf-8
+"""
+Name        :Update_FME_CONVERSION.py
+Purpose     :3D都市モデルのデータが一部のタイル（CityGML ファイル）だけ修正されて再公開された場合に、
+             すべての *.gml を変換し直さずに、変更されたファイルだけを変換して、変換済みのFGDBのフィーチャを置き換えるツール
+
+1) 変換済みのFGDBと同じフォルダに、変換元のファイルの一覧（マニフェスト）を <FGDB名>_source_manifest.sqlite として記録する
+   ・ファイルのパス、サイズ、更新日時、ハッシュ値
+   ・ファイルごとに、どのフィーチャクラスにどのフィーチャ（*_gml_id の値）を出力したか
+2) 再実行時は、マニフェストと比較して追加、変更、削除されたファイルを検出する
+   ・サイズ、更新日時が変わったファイルだけハッシュ値を計算し、内容が変わっていなければ変更なしとする
+3) 追加、変更されたファイルだけをパラメータファイルにして、FMEで作業用のFGDB（<FGDB名>_staging.gdb）に変換する
+4) 作業用のFGDBのフィーチャを変換済みのFGDBに追加してから、変更、削除されたファイルから出力したフィーチャを
+   追加前に記録した OBJECTID で削除する
+   ・追加に失敗した場合は、追加したフィーチャを削除して変換済みのFGDBを元に戻す
+   ・削除するフィーチャの OBJECTID はマニフェストに記録し、削除が中断された場合は次回の実行時に削除する
+5) 追加、削除したフィーチャクラスの汎用属性の展開の進捗の記録（expand_journal）を削除し、再実行が必要な後処理のツールを表示する
+   （作業用のFGDBから追加したフィーチャには、汎用属性の展開などの後処理が行われていないため）
+
+※ フィーチャと変換元のファイルの対応は、フィーチャクラスの *_gml_id フィールド（複数ある場合は最後の、親の建物などの gml_id）の値が
+   ファイル内の gml:id に含まれるかどうかで判定する
+※ マニフェストがない場合は、変換済みのFGDBと現在のファイルからマニフェストを作成する（変換は行わない）
+   変換済みのFGDBがない場合は、すべてのファイルを変換してからマニフェストを作成する
+
+パラメータ
+  0: FMW のモデル、1: テンプレートGDBスキーマファイル、2: 変換するCityGMLが入っているフォルダ（; 区切りで複数指定可）
+  3: 変換済みの3D都市モデルのFGDB、4: 出力するパラメータファイル
+  5: iur1.4のxsdスキーマファイル（省略可）、6: fme.exe のパス（省略可）
+
+Author      :
+Copyright   :
+Created     :2026/10/18
+LastUpdated :2026/10/18
+ArcGIS Version: ArcGIS Pro 2.6 以上
+"""
+
+import os,sys
+import re
+import hashlib
+import sqlite3
+import arcpy
+
+import Create_FME_PARAMETER_FILE as cfp
+
+# 後処理のツールの対象のフィーチャクラス、汎用属性の展開の進捗の記録は Tools/script のツールと共通
+SCRIPT_FOLDER = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "script")
+if SCRIPT_FOLDER not in sys.path:
+    sys.path.append(SCRIPT_FOLDER)
+import expand_journal_v100 as expjnl
+import calculate_genericAttributeSet_field_v112 as calgen
+import assign_landuseAttributes_v113 as asgluse
+import field_calculate_buildingName_v100 as bldname
+import assign_extendedAttributes_v113 as asgext
+
+MANIFEST_SUFFIX="_source_manifest.sqlite"
+STAGING_SUFFIX="_staging"
+
+#フィーチャと変換元のファイルの対応づけに使うフィールド名の末尾
+GML_ID_FIELD_SUFFIX="_gml_id"
+#CityGML ファイル内の gml:id
+GML_ID_PATTERN=re.compile(rb'gml:id="([^"]+)"')
+
+#ハッシュ値を計算するときに読み込むサイズ（バイト）
+HASH_READ_SIZE=16 * 1048576
+
+#where 句の IN に指定する gml_id の件数の上限
+WHERE_IN_MAX_IDS=1000
+
+#フィーチャを追加、削除した場合に再実行が必要な後処理のツール（ツール名, 対象のフィーチャクラス）
+POST_PROCESS_TOOLS=[
+    ("calculate_genericAttributeSet_field_v112", calgen.FCNAMES),
+    ("assign_landuseAttributes_v113", asgluse.FCNAMES),
+    ("field_calculate_buildingName_v100", bldname.FCNAMES),
+]
+#変換済みのFGDBにないフィーチャクラスをコピーした場合に、再実行が必要な後処理のツール（対象のフィーチャクラスが None の場合はすべて）
+SCHEMA_POST_PROCESS_TOOLS=[
+    ("assign_extendedAttributes_v113", asgext.FCNAMES),
+    (u"鉛直座標系更新ツール\\Update_VCS_Spref", None),
+]
+
+def getManifestPath(gdb):
+    '''
+    変換済みのFGDBのパスから、マニフェストのパスを作成
+    '''
+    return "{0}{1}".format(os.path.splitext(os.path.normpath(gdb))[0], MANIFEST_SUFFIX)
+
+def getStagingPath(gdb):
+    base, ext = os.path.splitext(os.path.normpath(gdb))
+    return "{0}{1}{2}".format(base, STAGING_SUFFIX, ext)
+
+def getFileKey(path):
+    return os.path.normcase(os.path.abspath(path))
+
+def getFileHash(path):
+    sha1 = hashlib.sha1()
+    with open(path, "rb") as f:
+        while True:
+            data = f.read(HASH_READ_SIZE)
+            if not data:
+                break
+            sha1.update(data)
+    return sha1.hexdigest()
+
+def readGmlIds(path):
+    '''
+    CityGML ファイル内の gml:id の一覧を返却
+    ファイルは HASH_READ_SIZE ごとに読み込み、チャンクの末尾の終わっていない gml:id="..." は次のチャンクとつなげて検索する
+    '''
+    ids = set()
+    prefix = b'gml:id="'
+    with open(path, "rb") as f:
+        carry = b""
+        while True:
+            data = f.read(HASH_READ_SIZE)
+            if not data:
+                break
+            buf = carry + data
+            end = 0
+            for m in GML_ID_PATTERN.finditer(buf):
+                ids.add(m.group(1).decode("utf-8"))
+                end = m.end()
+            # 最後の gml:id の後から始まる、終わっていない gml:id="（またはその先頭部分）を次のチャンクに持ち越す
+            start = buf.rfind(prefix, end)
+            if start < 0:
+                start = max(end, len(buf) - len(prefix) + 1)
+            carry = buf[start:]
+    return ids
+
+class SourceManifest(object):
+    '''
+    変換元のファイルの一覧と、ファイルごとに出力したフィーチャの gml_id を記録するクラス
+    '''
+    def __init__(self, path):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("CREATE TABLE IF NOT EXISTS files (path TEXT PRIMARY KEY, size INTEGER, mtime REAL, hash TEXT)")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS features (path TEXT, fc TEXT, gml_id TEXT)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS features_path ON features (path)")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS pending_deletes (fc TEXT, oid INTEGER)")
+
+    def commit(self):
+        self.conn.commit()
+
+    def close(self, commit=True):
+        if commit:
+            self.conn.commit()
+        else:
+            self.conn.rollback()
+        self.conn.close()
+
+    def isEmpty(self):
+        return self.conn.execute("SELECT COUNT(*) FROM files").fetchone()[0] == 0
+
+    def diff(self, files):
+        '''
+        現在のファイルの一覧と比較して、(追加, 変更, 削除) を返却
+        追加と変更は {パス: (サイズ, 更新日時, ハッシュ値)}、削除はパスの一覧
+        '''
+        recorded = dict((r[0], r[1:]) for r in self.conn.execute("SELECT path, size, mtime, hash FROM files"))
+        added = {}
+        changed = {}
+        current = set()
+        for f in files:
+            key = getFileKey(f)
+            current.add(key)
+            st = os.stat(f)
+            rec = recorded.get(key)
+            if rec is not None and rec[0] == st.st_size and rec[1] == st.st_mtime:
+                continue
+            digest = getFileHash(f)
+            if rec is None:
+                added[key] = (st.st_size, st.st_mtime, digest)
+            elif rec[2] != digest:
+                changed[key] = (st.st_size, st.st_mtime, digest)
+            else:
+                # 更新日時だけが変わった場合は記録を更新
+                self.conn.execute("UPDATE files SET size = ?, mtime = ? WHERE path = ?", (st.st_size, st.st_mtime, key))
+        removed = [key for key in recorded if key not in current]
+        return added, changed, removed
+
+    def putFiles(self, stats):
+        self.conn.executemany("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?)", [(key,) + stats[key] for key in stats])
+
+    def removeFiles(self, keys):
+        for key in keys:
+            self.conn.execute("DELETE FROM files WHERE path = ?", (key,))
+            self.conn.execute("DELETE FROM features WHERE path = ?", (key,))
+
+    def putFeatures(self, rows):
+        self.conn.executemany("INSERT INTO features VALUES (?, ?, ?)", rows)
+
+    def getFeatures(self, keys):
+        '''
+        ファイルから出力したフィーチャの gml_id を、フィーチャクラスごとに返却
+        '''
+        result = {}
+        for key in keys:
+            for fc, gml_id in self.conn.execute("SELECT fc, gml_id FROM features WHERE path = ?", (key,)):
+                result.setdefault(fc, set()).add(gml_id)
+        return result
+
+    def putPendingDeletes(self, oids):
+        '''
+        削除するフィーチャの {フィーチャクラス: [OBJECTID]} を記録
+        '''
+        for fc in oids:
+            self.conn.executemany("INSERT INTO pending_deletes VALUES (?, ?)", [(fc, oid) for oid in oids[fc]])
+
+    def getPendingDeletes(self):
+        result = {}
+        for fc, oid in self.conn.execute("SELECT fc, oid FROM pending_deletes"):
+            result.setdefault(fc, []).append(oid)
+        return result
+
+    def clearPendingDeletes(self):
+        self.conn.execute("DELETE FROM pending_deletes")
+
+    def getFeatureClasses(self, key):
+        '''
+        ファイルから出力したフィーチャクラスと件数
+        '''
+        return dict(self.conn.execute("SELECT fc, COUNT(*) FROM features WHERE path = ? GROUP BY fc", (key,)).fetchall())
+
+def getIdField(fc):
+    '''
+    フィーチャと変換元のファイルを対応づける *_gml_id フィールド（複数ある場合は最後のフィールド）を返却
+    '''
+    names = [f.name for f in arcpy.ListFields(fc) if f.name.lower().endswith(GML_ID_FIELD_SUFFIX)]
+    return names[-1] if len(names) > 0 else None
+
+def readFeatureIds(gdb):
+    '''
+    FGDB のフィーチャクラスごとの gml_id から、{gml_id: [フィーチャクラス, ...]} を作成
+    '''
+    arcpy.env.workspace = gdb
+    ids = {}
+    for fc in arcpy.ListFeatureClasses() or []:
+        field = getIdField(os.path.join(gdb, fc))
+        if field is None:
+            arcpy.AddWarning(u"{0} には gml_id のフィールドがないため、変換元のファイルとの対応づけの対象外です".format(fc))
+            continue
+        with arcpy.da.SearchCursor(os.path.join(gdb, fc), [field]) as cur:
+            for r in cur:
+                if r[0] is not None:
+                    fcs = ids.setdefault(r[0], [])
+                    if fc not in fcs:
+                        fcs.append(fc)
+    return ids
+
+def recordFeatures(manifest, gdb, files):
+    '''
+    FGDB のフィーチャの gml_id と、ファイル内の gml:id を照合して、ファイルごとに出力したフィーチャをマニフェストに記録
+    '''
+    ids = readFeatureIds(gdb)
+    cnt = 0
+    for f in files:
+        key = getFileKey(f)
+        rows = []
+        for gml_id in readGmlIds(f):
+            for fc in ids.get(gml_id, []):
+                rows.append((key, fc, gml_id))
+        manifest.putFeatures(rows)
+        cnt += len(rows)
+    return cnt
+
+def createInWhereClause(fc, field, ids):
+    values = ",".join(["'{0}'".format(i.replace("'", "''")) for i in ids])
+    return "{0} IN ({1})".format(arcpy.AddFieldDelimiters(fc, field), values)
+
+def createOidWhereClause(fc, oids):
+    oid_field = arcpy.Describe(fc).OIDFieldName
+    return "{0} IN ({1})".format(arcpy.AddFieldDelimiters(fc, oid_field), ",".join([str(oid) for oid in oids]))
+
+def getMaxOid(fc):
+    '''
+    フィーチャクラスの最大の OBJECTID を返却（レコードがない場合は 0）
+    '''
+    max_oid = 0
+    with arcpy.da.SearchCursor(fc, ["OID@"]) as cur:
+        for r in cur:
+            if r[0] > max_oid:
+                max_oid = r[0]
+    return max_oid
+
+def readFeatureOids(gdb, features):
+    '''
+    {フィーチャクラス: gml_id の集合} のフィーチャの OBJECTID を、{フィーチャクラス: [OBJECTID]} で返却
+    '''
+    oids = {}
+    for fc in sorted(features):
+        target_fc = os.path.join(gdb, fc)
+        if not arcpy.Exists(target_fc):
+            continue
+        field = getIdField(target_fc)
+        ids = sorted(features[fc])
+        fc_oids = []
+        for i in range(0, len(ids), WHERE_IN_MAX_IDS):
+            where_clause = createInWhereClause(target_fc, field, ids[i:i + WHERE_IN_MAX_IDS])
+            with arcpy.da.SearchCursor(target_fc, ["OID@"], where_clause) as cur:
+                for r in cur:
+                    fc_oids.append(r[0])
+        if len(fc_oids) > 0:
+            oids[fc] = fc_oids
+    return oids
+
+def deleteFeatures(gdb, oids):
+    '''
+    {フィーチャクラス: [OBJECTID]} のフィーチャを削除し、削除した件数を返却（削除済みの OBJECTID は対象外）
+    '''
+    deleted = 0
+    for fc in sorted(oids):
+        target_fc = os.path.join(gdb, fc)
+        if not arcpy.Exists(target_fc):
+            continue
+        fc_oids = sorted(oids[fc])
+        n = 0
+        for i in range(0, len(fc_oids), WHERE_IN_MAX_IDS):
+            where_clause = createOidWhereClause(target_fc, fc_oids[i:i + WHERE_IN_MAX_IDS])
+            with arcpy.da.UpdateCursor(target_fc, ["OID@"], where_clause) as cur:
+                for r in cur:
+                    cur.deleteRow()
+                    n += 1
+        arcpy.AddMessage(u"{0}: {1} 件を削除しました".format(fc, n))
+        deleted += n
+    return deleted
+
+def deletePendingFeatures(manifest, gdb):
+    '''
+    マニフェストに記録した削除するフィーチャを削除し、記録を削除して確定
+    '''
+    deleted = deleteFeatures(gdb, manifest.getPendingDeletes())
+    manifest.clearPendingDeletes()
+    manifest.commit()
+    return deleted
+
+def rollbackAppend(target_gdb, appended):
+    '''
+    appendStaging で追加したフィーチャを削除（追加前の最大の OBJECTID が None のフィーチャクラスはコピーしたため削除）
+    '''
+    for fc, max_oid in appended:
+        target_fc = os.path.join(target_gdb, fc)
+        if not arcpy.Exists(target_fc):
+            continue
+        if max_oid is None:
+            arcpy.Delete_management(target_fc)
+            continue
+        oid_field = arcpy.Describe(target_fc).OIDFieldName
+        where_clause = "{0} > {1}".format(arcpy.AddFieldDelimiters(target_fc, oid_field), max_oid)
+        with arcpy.da.UpdateCursor(target_fc, ["OID@"], where_clause) as cur:
+            for r in cur:
+                cur.deleteRow()
+        arcpy.AddWarning(u"{0}: 追加したフィーチャを削除しました".format(fc))
+
+def appendStaging(staging_gdb, target_gdb):
+    '''
+    作業用のFGDBのフィーチャを変換済みのFGDBに追加（変換済みのFGDBにないフィーチャクラスはコピー）し、
+    追加した件数と [(フィーチャクラス, 追加前の最大の OBJECTID（コピーした場合は None))] を返却
+    失敗した場合は、追加したフィーチャを削除してから例外を送出
+    '''
+    arcpy.env.workspace = staging_gdb
+    appended = 0
+    appended_fcs = []
+    try:
+        for fc in arcpy.ListFeatureClasses() or []:
+            source_fc = os.path.join(staging_gdb, fc)
+            target_fc = os.path.join(target_gdb, fc)
+            n = int(arcpy.GetCount_management(source_fc).getOutput(0))
+            if n == 0:
+                continue
+            if arcpy.Exists(target_fc):
+                appended_fcs.append((fc, getMaxOid(target_fc)))
+                arcpy.Append_management(source_fc, target_fc, "NO_TEST")
+            else:
+                appended_fcs.append((fc, None))
+                arcpy.Copy_management(source_fc, target_fc)
+            arcpy.AddMessage(u"{0}: {1} 件を追加しました".format(fc, n))
+            appended += n
+    except Exception:
+        rollbackAppend(target_gdb, appended_fcs)
+        raise
+    return appended, appended_fcs
+
+def reportPostProcesses(target_gdb, fcs, copied_fcs):
+    '''
+    追加、削除したフィーチャクラスの汎用属性の展開の進捗の記録を削除し、再実行が必要な後処理のツールを表示
+    '''
+    removed = expjnl.openJournal(target_gdb).invalidate(sorted(fcs))
+    if len(removed) > 0:
+        arcpy.AddMessage(u"汎用属性の展開の進捗の記録を削除しました: {0}".format(", ".join(removed)))
+    for tool, tool_fcs in POST_PROCESS_TOOLS:
+        targets = [fc for fc in sorted(fcs) if fc in tool_fcs]
+        if len(targets) > 0:
+            arcpy.AddWarning(u"{0} を再実行してください（対象: {1}）".format(tool, ", ".join(targets)))
+    for tool, tool_fcs in SCHEMA_POST_PROCESS_TOOLS:
+        targets = [fc for fc in sorted(copied_fcs) if tool_fcs is None or fc in tool_fcs]
+        if len(targets) > 0:
+            arcpy.AddWarning(u"{0} を再実行してください（新しく追加したフィーチャクラス: {1}）".format(tool, ", ".join(targets)))
+
+def convertFiles(fmw_model, files, schema_xml, output_gdb, param_file, xsd_file, fme_exe):
+    '''
+    ファイルの一覧をパラメータファイルにしてFMEで変換し、成功した場合は True を返却
+    '''
+    params = cfp.createParameters(fmw_model, files, schema_xml, output_gdb, xsd_file)
+    with open(param_file, 'w', encoding='shift_jis') as f:
+        f.write(params)
+    arcpy.AddMessage(u"{0} ファイルを {1} に変換します: {2}".format(len(files), output_gdb, param_file))
+    returncode, elapsed = cfp.runParameterFile(fme_exe, param_file)
+    if returncode != 0:
+        arcpy.AddError(u"FMEの変換でエラーが発生しました（終了コード {0}, ログ: {1}）".format(returncode, param_file + cfp.LOG_FILE_EXT))
+        return False
+    arcpy.AddMessage(u"変換しました（処理時間 {0}）".format(cfp.formatSeconds(elapsed)))
+    return True
+
+def updateConversion(fmw_model, citygml_folders, schema_xml, target_gdb, param_file, xsd_file=None, fme_exe=None):
+    '''
+    マニフェストと比較して、追加、変更されたファイルだけを変換し、変換済みのFGDBのフィーチャをファイル単位で置き換える
+    '''
+    blResult = True
+    if fme_exe is None or fme_exe == "":
+        fme_exe = cfp.getFmeExePath()
+    files = cfp.listCityGmlFiles(citygml_folders)
+    manifest = SourceManifest(getManifestPath(target_gdb))
+    try:
+        if not arcpy.Exists(target_gdb):
+            # 変換済みのFGDBがない場合は、すべてのファイルを変換
+            if not convertFiles(fmw_model, files, schema_xml, target_gdb, param_file, xsd_file, fme_exe):
+                return False
+            manifest.removeFiles([r[0] for r in manifest.conn.execute("SELECT path FROM files").fetchall()])
+            manifest.putFiles(dict((getFileKey(f), (os.stat(f).st_size, os.stat(f).st_mtime, getFileHash(f))) for f in files))
+            cnt = recordFeatures(manifest, target_gdb, files)
+            arcpy.AddMessage(u"{0} ファイル、{1} 件のフィーチャをマニフェストに記録しました".format(len(files), cnt))
+            return True
+
+        if manifest.isEmpty():
+            # マニフェストがない場合は、変換済みのFGDBと現在のファイルから作成
+            manifest.putFiles(dict((getFileKey(f), (os.stat(f).st_size, os.stat(f).st_mtime, getFileHash(f))) for f in files))
+            cnt = recordFeatures(manifest, target_gdb, files)
+            arcpy.AddMessage(u"マニフェストがないため、{0} ファイル、{1} 件のフィーチャを記録しました（変換は行いません）".format(len(files), cnt))
+            return True
+
+        if len(manifest.getPendingDeletes()) > 0:
+            # 前回の実行で削除が中断された場合は、記録したフィーチャを削除
+            deleted = deletePendingFeatures(manifest, target_gdb)
+            arcpy.AddMessage(u"前回の実行で中断された {0} 件のフィーチャを削除しました".format(deleted))
+
+        added, changed, removed = manifest.diff(files)
+        arcpy.AddMessage(u"追加 {0} ファイル、変更 {1} ファイル、削除 {2} ファイル（全 {3} ファイル）".format(len(added), len(changed), len(removed), len(files)))
+        if len(added) + len(changed) + len(removed) == 0:
+            arcpy.AddMessage(u"変更されたファイルはありません")
+            return True
+        for key in sorted(changed) + sorted(removed):
+            fcs = manifest.getFeatureClasses(key)
+            arcpy.AddMessage(u"{0}: {1}".format(os.path.basename(key), ", ".join([u"{0} {1} 件".format(fc, fcs[fc]) for fc in sorted(fcs)])))
+
+        # 追加、変更されたファイルを作業用のFGDBに変換
+        staging_gdb = getStagingPath(target_gdb)
+        if arcpy.Exists(staging_gdb):
+            arcpy.Delete_management(staging_gdb)
+        convert_files = [f for f in files if getFileKey(f) in added or getFileKey(f) in changed]
+        if len(convert_files) > 0:
+            if not convertFiles(fmw_model, convert_files, schema_xml, staging_gdb, param_file, xsd_file, fme_exe):
+                return False # 変換済みのFGDBは変更しない
+
+        # 変更、削除されたファイルのフィーチャの OBJECTID を記録してから、作業用のFGDBのフィーチャを追加
+        # （追加に失敗した場合は、追加したフィーチャを削除して変換済みのFGDBを元に戻す）
+        delete_oids = readFeatureOids(target_gdb, manifest.getFeatures(list(changed) + removed))
+        appended = 0
+        appended_fcs = []
+        if len(convert_files) > 0:
+            appended, appended_fcs = appendStaging(staging_gdb, target_gdb)
+
+        # 追加が終わったらマニフェストを更新して、削除するフィーチャと合わせて確定
+        manifest.removeFiles(list(changed) + removed)
+        manifest.putFiles(added)
+        manifest.putFiles(changed)
+        if len(convert_files) > 0:
+            recordFeatures(manifest, staging_gdb, convert_files)
+        manifest.putPendingDeletes(delete_oids)
+        manifest.commit()
+
+        # 作業用のFGDBから追加したフィーチャには後処理が行われていないため、再実行が必要なツールを表示
+        reportPostProcesses(target_gdb, set(delete_oids) | set([fc for fc, max_oid in appended_fcs]),
+                            [fc for fc, max_oid in appended_fcs if max_oid is None])
+
+        # 変更、削除されたファイルのフィーチャを削除（中断された場合は次回の実行時に削除）
+        deleted = deletePendingFeatures(manifest, target_gdb)
+        if len(convert_files) > 0:
+            arcpy.Delete_management(staging_gdb)
+        arcpy.AddMessage(u"{0} 件のフィーチャを削除し、{1} 件のフィーチャを追加しました".format(deleted, appended))
+    except Exception as e:
+        arcpy.AddError(u"{0}".format(e))
+        blResult = False
+    finally:
+        manifest.close(blResult)
+    return blResult
+
+def main():
+    try:
+        arcpy.AddMessage(u"差分変換の処理開始：")
+
+        fmw_model = arcpy.GetParameterAsText(0)
+        schema_xml = arcpy.GetParameterAsText(1)
+        citygml_folders = arcpy.GetParameterAsText(2)
+        target_gdb = arcpy.GetParameterAsText(3)
+        param_file = arcpy.GetParameterAsText(4)
+        xsd_file = None
+        if arcpy.GetArgumentCount() >= 6 and arcpy.GetParameterAsText(5) != "":
+            xsd_file = arcpy.GetParameterAsText(5)
+        fme_exe = None
+        if arcpy.GetArgumentCount() >= 7 and arcpy.GetParameterAsText(6) != "":
+            fme_exe = arcpy.GetParameterAsText(6)
+
+        updateConversion(fmw_model, citygml_folders, schema_xml, target_gdb, param_file, xsd_file, fme_exe)
+
+        arcpy.AddMessage(u"処理終了：")
+    except arcpy.ExecuteError:
+        arcpy.AddError(arcpy.GetMessages(2))
+    except Exception as e:
+        arcpy.AddError(e.args[0])
+
+if __name__ == '__main__':
+    main()
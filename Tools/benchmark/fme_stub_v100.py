@@ -0,0 +1,112 @@
+# coding:utf-8
+"""
+Name        :fme_stub_v100.py
+Purpose     :fme.exe の代わりに使うスタブ。Data Interoperability がない環境で run_pipeline_v100 などの
+             「fme.exe PARAMETER_FILE <パラメータファイル>」を実行するツールの動作と処理時間を確認するために使用する。
+
+             パラメータファイルの FMW のモデル名の先頭（bldg_, luse_ など）から変換する地物を判定し、
+             --DestDataset_GEODATABASE_FILE の GDB（arcpy の代替モジュール standin/arcpy の SQLite のワークスペース）に、
+             generate_dataset_v100 と同じ合成データのフィーチャクラスを CityGML ファイル数 × STUB_ROWS_PER_FILE 件作成する。
+             ・環境変数 FME_STUB_SECONDS: 変換にかかる時間（秒）として待機する時間
+             ・環境変数 FME_STUB_FAIL: モデル名にこの文字列を含む場合は終了コード 1 で終了する（失敗時の動作確認用）
+             実行例: python fme_stub_v100.py PARAMETER_FILE C:\\temp\\out\\13100_bldg.par
+Author      :
+Copyright   :
+Created     :2026/10/18
+Last Updated:2026/10/18
+ArcGIS Version: ArcGIS Pro 2.6 以上（ベンチマーク用。ArcGIS Pro は不要）
+"""
+import os
+import re
+import sys
+import time
+import random
+
+import generate_dataset_v100 as gends
+import arcpy
+
+# CityGML 1ファイルあたりに作成するフィーチャ数
+STUB_ROWS_PER_FILE = 200
+
+DEST_DATASET_PATTERN = re.compile(r'--DestDataset_GEODATABASE_FILE\s+"([^"]+)"')
+MODEL_PATTERN = re.compile(r'^\s*"([^"]+)"')
+SOURCE_FILE_PATTERN = re.compile(r'\\"([^"\\]+?\.gml)\\"', re.IGNORECASE)
+
+def createXmlRows(prefix, attributes):
+    def createRows(rnd):
+        xmls = gends.createXmlValues(rnd, attributes)
+        while True:
+            yield [gends.createGmlId(rnd, prefix), next(xmls)]
+    return createRows
+
+def createIdRows(prefix):
+    def createRows(rnd):
+        while True:
+            yield [gends.createGmlId(rnd, prefix)]
+    return createRows
+
+def createDistrictRows(prefix, classes):
+    def createRows(rnd):
+        while True:
+            yield [gends.createGmlId(rnd, prefix), rnd.choice(classes)]
+    return createRows
+
+# モデル名の先頭 → [(フィーチャクラス名, [(フィールド名, 型, 長さ)], 行を作成するジェネレータ関数)]
+XML_FIELDS = [(gends.XMLFIELDNAME, "TEXT", 10000)]
+BUILDING_FIELDS = [("bldg_Building_gml_id", "TEXT", 255), (gends.XMLFIELDNAME, "TEXT", 10000), ("gml_name", "TEXT", 255)] + \
+                  [("uro_extendedAttribute_key{0}".format(key), "TEXT", 255) for key in gends.EXTATTR_KEYS]
+URF_FIELDS = [("urf_class", "TEXT", 255)]
+FEATURE_CLASSES = {
+    "bldg": [("lod0_Building", BUILDING_FIELDS, gends.createBuildingRows)],
+    "luse": [("lod1_LandUse", [("luse_LandUse_gml_id", "TEXT", 255)] + XML_FIELDS, gends.createLandUseRows)],
+    "urf": [("lod0_DistrictAndZones", [("urf_DistrictsAndZones_gml_id", "TEXT", 255)] + URF_FIELDS, gends.createDistrictRows),
+            ("lod0_AreaClassification", [("urf_AreaClassification_gml_id", "TEXT", 255)] + URF_FIELDS,
+             createDistrictRows("urf", ["22", "23", "24", "25", "31", "32"]))],
+    "tran": [("lod1_Road", [("tran_Road_gml_id", "TEXT", 255)], createIdRows("tran"))],
+    "dem": [("lod1_TinRelief", [("dem_ReliefFeature_gml_id", "TEXT", 255)], createIdRows("dem"))],
+    "lsld": [("lod0_GenericCityObject", [("gen_GenericCityObject_gml_id", "TEXT", 255)] + XML_FIELDS,
+              createXmlRows("gen", gends.GENERIC_ATTRIBUTES))],
+    "fld": [("lod1_WaterBody", [("wtr_WaterBody_gml_id", "TEXT", 255)] + XML_FIELDS, createXmlRows("wtr", gends.GENERIC_ATTRIBUTES))],
+}
+
+def readParameterFile(param_file):
+    '''
+    パラメータファイルから (FMW のモデル, 出力するGDB, CityGML ファイルの一覧) を取得
+    '''
+    with open(param_file, encoding="shift_jis") as f:
+        text = f.read()
+    model = MODEL_PATTERN.match(text)
+    dest = DEST_DATASET_PATTERN.search(text)
+    if model is None or dest is None:
+        raise ValueError(u"パラメータファイルの形式が正しくありません: {0}".format(param_file))
+    return model.group(1), dest.group(1), SOURCE_FILE_PATTERN.findall(text)
+
+def convert(model, gdb, files):
+    feature_type = os.path.basename(model).split("_")[0].lower()
+    folder, name = os.path.split(gdb)
+    if arcpy.Exists(gdb):
+        arcpy.Delete_management(gdb)
+    arcpy.CreateFileGDB_management(folder, name)
+    rnd = random.Random(len(files))
+    num = max(1, len(files)) * STUB_ROWS_PER_FILE
+    for fc_name, fields, createRows in FEATURE_CLASSES.get(feature_type, []):
+        fc = gends.createFeatureClass(gdb, fc_name, fields)
+        gends.insertRows(fc, [f[0] for f in fields], createRows(rnd), num)
+        print(u"{0}: {1} 件".format(fc_name, num))
+
+def main():
+    if len(sys.argv) < 3 or sys.argv[1] != "PARAMETER_FILE":
+        print(u"使用方法: fme_stub_v100.py PARAMETER_FILE <パラメータファイル>")
+        return 2
+    model, gdb, files = readParameterFile(sys.argv[2])
+    print(u"{0}: {1} ファイル → {2}".format(os.path.basename(model), len(files), gdb))
+    time.sleep(float(os.environ.get("FME_STUB_SECONDS", "0")))
+    fail = os.environ.get("FME_STUB_FAIL")
+    if fail and fail in os.path.basename(model):
+        print(u"変換に失敗しました（FME_STUB_FAIL）")
+        return 1
+    convert(model, gdb, files)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,295 @@
+# coding:utf-8
+"""
+Name        :generate_dataset_v100.py
+Purpose     :Tools/script のツールの処理時間を計測するための、3D都市モデルを模した合成データを作成するツール
+             ・<出力フォルダー>/<名前>.gdb（arcpy の代替モジュール standin/arcpy の SQLite のワークスペース）
+                 lod0_Building: bldg_Building_gml_id、xml_genericAttributeSet（同じ name の重複、gen_1/2500図郭 などを含む）、gml_name（コードの値と文字列）、
+                                uro_extendedAttribute_keyXX のフィールド
+                 lod1_LandUse : luse_LandUse_gml_id、gen_土地利用区分_XXXX を含む xml_genericAttributeSet
+                 lod0_DistrictAndZones: urf_DistrictsAndZones_gml_id、urf_class（config_地域地区_分類出力.txt の 0～41 と該当のない値）
+             ・<出力フォルダー>/codelists: extendedAttribute_key.xml, extendedAttribute_keyXX.xml, Building_name.xml, LandUse_genUsage.xml
+             ・<出力フォルダー>/udx/bldg: i-UR 1.4 のURLを含む CityGML（3次メッシュコードのファイル名）
+                 gml:name、汎用属性（gen:stringAttribute など、gen:genericAttributeSet）、bldg:usage、bldg:measuredHeight、
+                 uro:extendedAttribute、一部の建物は bldg:BuildingPart を含む
+
+             同じ乱数のシードを指定すると同じデータを作成する。
+             実行例: python generate_dataset_v100.py C:\\temp\\bench --rows 100000
+Author      :
+Copyright   :
+Created     :2026/10/18
+Last Updated:2026/10/18
+ArcGIS Version: ArcGIS Pro 2.6 以上（ベンチマーク用。ArcGIS Pro は不要）
+"""
+import os
+import sys
+import random
+import argparse
+from xml.sax.saxutils import escape
+
+# arcpy の代替モジュールを使用
+STANDIN_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "standin")
+if STANDIN_FOLDER not in sys.path:
+    sys.path.insert(0, STANDIN_FOLDER)
+import arcpy
+
+GDB_NAME = "bench.gdb"
+CODELIST_FOLDER = "codelists"
+CITYGML_FOLDER = os.path.join("udx", "bldg")
+
+XMLFIELDNAME = "xml_genericAttributeSet"
+
+# 拡張属性のキー（extendedAttribute_keyXX.xml を作成し、uro_extendedAttribute_keyXX フィールドを追加する）
+EXTATTR_KEYS = ["2", "3", "100", "101"]
+EXTATTR_CODES = 40
+
+BUILDING_NAME_CODES = 500
+LANDUSE_CODES = ["201", "202", "203", "204", "205", "211", "212", "213", "214", "215", "216", "219", "220", "221", "222",
+                 "223", "231", "232", "233", "251", "252", "260", "261", "262", "263", "281", "282", "283", "284", "285"]
+
+# 同じXMLが入っているレコードの割合（展開結果のキャッシュのヒット率の目安）
+DUPLICATE_RATIO = 0.3
+# LandUse の件数（Building の件数に対する割合）
+LANDUSE_RATIO = 0.2
+# lod0_Building に対する lod0_DistrictAndZones の件数の割合と urf_class の値（99 は設定ファイルに該当のない値）
+DISTRICT_RATIO = 0.1
+URF_CLASSES = [str(n) for n in range(42)] + ["99"]
+# CityGML 1ファイルあたりの建物数とファイル数の上限
+CITYGML_BUILDINGS_PER_FILE = 5000
+CITYGML_MAX_FILES = 200
+
+INSERT_BATCH_SIZE = 10000
+
+IUR14_NAMESPACE = "http://www.kantei.go.jp/jp/singi/tiiki/toshisaisei/itoshisaisei/iur/uro/1.4"
+IUR14_SCHEMA = "http://www.kantei.go.jp/jp/singi/tiiki/toshisaisei/itoshisaisei/iur/schemas/uro/1.4/urbanObject.xsd"
+
+# 汎用属性の (name, type, 値の作成関数)。同じ name が複数回出てくるもの、gen_1/2500図郭 のように置換が必要なものを含める
+GENERIC_ATTRIBUTES = [
+    ("gen_建物ID", "TEXT", lambda r: "13101-bldg-{0}".format(r.randint(1, 999999))),
+    ("gen_1/2500図郭", "TEXT", lambda r: "09LD{0:02d}".format(r.randint(1, 99))),
+    ("gen_地上階数", "LONG", lambda r: str(r.randint(1, 40))),
+    ("gen_延床面積", "DOUBLE", lambda r: "{0:.2f}".format(r.uniform(20, 20000))),
+    ("gen_調査年", "TEXT", lambda r: str(r.choice([2016, 2017, 2020, 2021]))),
+    ("gen_備考", "TEXT", lambda r: r.choice(["", "増築", "改築", "新築", "滅失"])),
+    ("gen_備考", "TEXT", lambda r: r.choice(["", "要確認", "現地調査"])),
+    ("gen_建物用途.詳細", "TEXT", lambda r: r.choice(["住宅", "共同住宅", "店舗等併用住宅", "業務施設", "商業施設"])),
+]
+LANDUSE_ATTRIBUTES = [
+    ("gen_土地利用区分_現況", "TEXT", lambda r: r.choice(LANDUSE_CODES)),
+    ("gen_土地利用区分_前回", "TEXT", lambda r: r.choice(LANDUSE_CODES)),
+    ("gen_調査年", "TEXT", lambda r: str(r.choice([2016, 2021]))),
+    ("gen_面積", "DOUBLE", lambda r: "{0:.2f}".format(r.uniform(10, 50000))),
+]
+
+def createGenericAttributeSet(rnd, attributes):
+    '''
+    xml_genericAttributeSet の値を作成（一部の属性は省略して name の並びを変える）
+    '''
+    items = []
+    for name, fieldType, func in attributes:
+        if rnd.random() < 0.1:
+            continue
+        items.append(u'<genericAttribute name="{0}" type="{1}">{2}</genericAttribute>'.format(escape(name, {'"': "&quot;"}), fieldType, escape(func(rnd))))
+    return u"<genericAttributeSet>{0}</genericAttributeSet>".format("".join(items))
+
+def createXmlValues(rnd, attributes):
+    '''
+    DUPLICATE_RATIO の割合で、同じXMLの値を繰り返すジェネレータ
+    '''
+    pool = [createGenericAttributeSet(rnd, attributes) for i in range(100)]
+    while True:
+        if rnd.random() < DUPLICATE_RATIO:
+            yield rnd.choice(pool)
+        else:
+            yield createGenericAttributeSet(rnd, attributes)
+
+def writeCodelist(path, name, codes):
+    '''
+    gml:Dictionary 形式のコードリストを作成
+    '''
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(u'<?xml version="1.0" encoding="UTF-8"?>\n')
+        f.write(u'<gml:Dictionary xmlns:gml="http://www.opengis.net/gml" xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" '
+                u'xsi:schemaLocation="http://www.opengis.net/gml http://schemas.opengis.net/gml/3.1.1/profiles/SimpleDictionary/1.0.0/gmlSimpleDictionaryProfile.xsd" '
+                u'gml:id="{0}">\n'.format(escape(name)))
+        f.write(u'\t<gml:name>{0}</gml:name>\n'.format(escape(name)))
+        for i, (code, desc) in enumerate(codes):
+            f.write(u'\t<gml:dictionaryEntry>\n\t\t<gml:Definition gml:id="id{0}">\n'.format(i + 1))
+            f.write(u'\t\t\t<gml:description>{0}</gml:description>\n'.format(escape(desc)))
+            f.write(u'\t\t\t<gml:name>{0}</gml:name>\n'.format(escape(code)))
+            f.write(u'\t\t</gml:Definition>\n\t</gml:dictionaryEntry>\n')
+        f.write(u'</gml:Dictionary>\n')
+
+def writeCodelists(folder):
+    '''
+    extendedAttribute_key.xml, extendedAttribute_keyXX.xml, Building_name.xml, LandUse_genUsage.xml を作成
+    '''
+    if not os.path.exists(folder):
+        os.makedirs(folder)
+    writeCodelist(os.path.join(folder, "extendedAttribute_key.xml"), "ExtendedAttribute_key",
+                  [(key, u"拡張属性{0}".format(key)) for key in EXTATTR_KEYS])
+    for key in EXTATTR_KEYS:
+        writeCodelist(os.path.join(folder, "extendedAttribute_key{0}.xml".format(key)), "ExtendedAttribute_key{0}".format(key),
+                      [(str(i), u"拡張属性{0}の区分{1}".format(key, i)) for i in range(1, EXTATTR_CODES + 1)])
+    writeCodelist(os.path.join(folder, "Building_name.xml"), "Building_name",
+                  [(str(i), u"建物名称{0}".format(i)) for i in range(1, BUILDING_NAME_CODES + 1)])
+    writeCodelist(os.path.join(folder, "LandUse_genUsage.xml"), "LandUse_genUsage",
+                  [(code, u"土地利用{0}".format(code)) for code in LANDUSE_CODES])
+
+def createFeatureClass(gdb, name, fields):
+    arcpy.CreateFeatureclass_management(gdb, name, "POLYGON")
+    fc = os.path.join(gdb, name)
+    for fieldName, fieldType, length in fields:
+        arcpy.AddField_management(fc, fieldName, fieldType, field_length=length)
+    return fc
+
+def insertRows(fc, fields, rows, num):
+    with arcpy.da.InsertCursor(fc, fields) as icur:
+        batch = []
+        for i in range(num):
+            batch.append(next(rows))
+            if len(batch) >= INSERT_BATCH_SIZE:
+                icur.insertRows(batch)
+                batch = []
+        if batch:
+            icur.insertRows(batch)
+
+def createGmlId(rnd, prefix):
+    return "{0}_{1:08x}-{2:04x}-{3:04x}".format(prefix, rnd.getrandbits(32), rnd.getrandbits(16), rnd.getrandbits(16))
+
+def createBuildingRows(rnd):
+    xmls = createXmlValues(rnd, GENERIC_ATTRIBUTES)
+    while True:
+        # gml_name はコードの値、文字列、空のいずれか
+        r = rnd.random()
+        if r < 0.3:
+            name = str(rnd.randint(1, BUILDING_NAME_CODES))
+        elif r < 0.4:
+            name = u"〇〇ビル{0}".format(rnd.randint(1, 999))
+        else:
+            name = None
+        yield [createGmlId(rnd, "bldg"), next(xmls), name] + [str(rnd.randint(1, EXTATTR_CODES)) if rnd.random() < 0.5 else None for key in EXTATTR_KEYS]
+
+def createLandUseRows(rnd):
+    xmls = createXmlValues(rnd, LANDUSE_ATTRIBUTES)
+    while True:
+        yield [createGmlId(rnd, "luse"), next(xmls)]
+
+def createDistrictRows(rnd):
+    while True:
+        yield [createGmlId(rnd, "urf"), rnd.choice(URF_CLASSES)]
+
+def writeGdb(folder, rows, rnd):
+    gdb = os.path.join(folder, GDB_NAME)
+    if arcpy.Exists(gdb):
+        arcpy.Delete_management(gdb)
+    arcpy.CreateFileGDB_management(folder, GDB_NAME)
+
+    ext_fields = ["uro_extendedAttribute_key{0}".format(key) for key in EXTATTR_KEYS]
+    fields = [("bldg_Building_gml_id", "TEXT", 255), (XMLFIELDNAME, "TEXT", 10000), ("gml_name", "TEXT", 255)] + [(f, "TEXT", 255) for f in ext_fields]
+    fc = createFeatureClass(gdb, "lod0_Building", fields)
+    insertRows(fc, [f[0] for f in fields], createBuildingRows(rnd), rows)
+
+    fields = [("luse_LandUse_gml_id", "TEXT", 255), (XMLFIELDNAME, "TEXT", 10000)]
+    fc = createFeatureClass(gdb, "lod1_LandUse", fields)
+    insertRows(fc, [f[0] for f in fields], createLandUseRows(rnd), max(1, int(rows * LANDUSE_RATIO)))
+
+    fields = [("urf_DistrictsAndZones_gml_id", "TEXT", 255), ("urf_class", "TEXT", 255)]
+    fc = createFeatureClass(gdb, "lod0_DistrictAndZones", fields)
+    insertRows(fc, [f[0] for f in fields], createDistrictRows(rnd), max(1, int(rows * DISTRICT_RATIO)))
+    return gdb
+
+def createMeshCodes(num):
+    '''
+    3次メッシュコード（533946XX など）を num 件作成
+    '''
+    codes = []
+    for second in ["533945", "533946", "533935", "533936"]:
+        for y in range(10):
+            for x in range(10):
+                codes.append("{0}{1}{2}".format(second, y, x))
+    return codes[:num]
+
+# CityGML の汎用属性の要素（GENERIC_ATTRIBUTES の type ごと）
+GENERIC_ELEMENTS = {"TEXT": "gen:stringAttribute", "LONG": "gen:intAttribute", "DOUBLE": "gen:doubleAttribute"}
+BUILDING_USAGES = ["401", "402", "403", "404", "411", "412", "413", "414", "415", "421", "422", "431", "441", "451", "452", "453", "454", "461"]
+
+def writeGenericAttributes(f, rnd, indent):
+    for name, fieldType, func in GENERIC_ATTRIBUTES:
+        if rnd.random() < 0.1:
+            continue
+        tag = GENERIC_ELEMENTS[fieldType]
+        # xml_genericAttributeSet の name は FME で gen_ を付けた名前のため、CityGML では gen_ を除く
+        f.write(u'{0}<{1} name="{2}">\n{0}\t<gen:value>{3}</gen:value>\n{0}</{1}>\n'.format(
+            indent, tag, escape(name[4:], {'"': "&quot;"}), escape(func(rnd))))
+
+def writeCityGml(path, rnd, buildings):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(u'<?xml version="1.0" encoding="UTF-8"?>\n')
+        f.write(u'<core:CityModel xmlns:core="http://www.opengis.net/citygml/2.0" xmlns:bldg="http://www.opengis.net/citygml/building/2.0" '
+                u'xmlns:gen="http://www.opengis.net/citygml/generics/2.0" '
+                u'xmlns:gml="http://www.opengis.net/gml" xmlns:uro="{0}" xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" '
+                u'xsi:schemaLocation="{0} {1} http://www.opengis.net/citygml/building/2.0 '
+                u'http://schemas.opengis.net/citygml/building/2.0/building.xsd">\n'.format(IUR14_NAMESPACE, IUR14_SCHEMA))
+        for i in range(buildings):
+            f.write(u'\t<core:cityObjectMember>\n\t\t<bldg:Building gml:id="bldg_{0:08x}">\n'.format(rnd.getrandbits(32)))
+            if rnd.random() < 0.3:
+                f.write(u'\t\t\t<gml:name>{0}</gml:name>\n'.format(rnd.randint(1, BUILDING_NAME_CODES)))
+            writeGenericAttributes(f, rnd, u'\t\t\t')
+            f.write(u'\t\t\t<gen:genericAttributeSet name="土砂災害警戒区域">\n')
+            f.write(u'\t\t\t\t<gen:stringAttribute name="区域区分">\n\t\t\t\t\t<gen:value>{0}</gen:value>\n\t\t\t\t</gen:stringAttribute>\n'.format(rnd.choice([u"警戒区域", u"特別警戒区域"])))
+            f.write(u'\t\t\t</gen:genericAttributeSet>\n')
+            f.write(u'\t\t\t<bldg:usage codeSpace="../../codelists/Building_usage.xml">{0}</bldg:usage>\n'.format(rnd.choice(BUILDING_USAGES)))
+            f.write(u'\t\t\t<bldg:measuredHeight uom="m">{0:.1f}</bldg:measuredHeight>\n'.format(rnd.uniform(3, 120)))
+            for key in EXTATTR_KEYS:
+                if rnd.random() < 0.5:
+                    f.write(u'\t\t\t<uro:extendedAttribute>\n\t\t\t\t<uro:KeyValuePair>\n')
+                    f.write(u'\t\t\t\t\t<uro:key codeSpace="../../codelists/extendedAttribute_key.xml">{0}</uro:key>\n'.format(key))
+                    f.write(u'\t\t\t\t\t<uro:codeValue codeSpace="../../codelists/extendedAttribute_key{0}.xml">{1}</uro:codeValue>\n'.format(key, rnd.randint(1, EXTATTR_CODES)))
+                    f.write(u'\t\t\t\t</uro:KeyValuePair>\n\t\t\t</uro:extendedAttribute>\n')
+            f.write(u'\t\t\t<uro:buildingDetails>\n\t\t\t\t<uro:BuildingDetails>\n')
+            f.write(u'\t\t\t\t\t<uro:totalFloorArea uom="m2">{0:.2f}</uro:totalFloorArea>\n'.format(rnd.uniform(20, 20000)))
+            f.write(u'\t\t\t\t</uro:BuildingDetails>\n\t\t\t</uro:buildingDetails>\n')
+            if rnd.random() < 0.1:
+                # 建物部分の属性は建物の属性には含めない
+                f.write(u'\t\t\t<bldg:consistsOfBuildingPart>\n\t\t\t\t<bldg:BuildingPart gml:id="bldg_part_{0:08x}">\n'.format(rnd.getrandbits(32)))
+                f.write(u'\t\t\t\t\t<bldg:usage codeSpace="../../codelists/Building_usage.xml">{0}</bldg:usage>\n'.format(rnd.choice(BUILDING_USAGES)))
+                f.write(u'\t\t\t\t</bldg:BuildingPart>\n\t\t\t</bldg:consistsOfBuildingPart>\n')
+            f.write(u'\t\t</bldg:Building>\n\t</core:cityObjectMember>\n')
+        f.write(u'</core:CityModel>\n')
+
+def writeCityGmls(folder, rows, rnd):
+    if not os.path.exists(folder):
+        os.makedirs(folder)
+    num = min(CITYGML_MAX_FILES, max(1, rows // CITYGML_BUILDINGS_PER_FILE))
+    for code in createMeshCodes(num):
+        writeCityGml(os.path.join(folder, "{0}_bldg_6697_op.gml".format(code)), rnd, min(rows, CITYGML_BUILDINGS_PER_FILE))
+    return num
+
+def generate(folder, rows, seed=0, citygml=True):
+    '''
+    合成データを作成して、(GDB, コードリストのフォルダー, CityGMLのフォルダー) を返却
+    '''
+    rnd = random.Random(seed)
+    if not os.path.exists(folder):
+        os.makedirs(folder)
+    codelists = os.path.join(folder, CODELIST_FOLDER)
+    writeCodelists(codelists)
+    gdb = writeGdb(folder, rows, rnd)
+    udx = os.path.join(folder, CITYGML_FOLDER)
+    if citygml:
+        writeCityGmls(udx, rows, rnd)
+    return gdb, codelists, udx
+
+def main():
+    parser = argparse.ArgumentParser(description=u"ベンチマーク用の合成データを作成")
+    parser.add_argument("folder", help=u"出力フォルダー")
+    parser.add_argument("--rows", type=int, default=10000, help=u"lod0_Building の件数")
+    parser.add_argument("--seed", type=int, default=0, help=u"乱数のシード")
+    parser.add_argument("--no-citygml", action="store_true", help=u"CityGML を作成しない")
+    args = parser.parse_args()
+
+    gdb, codelists, udx = generate(args.folder, args.rows, args.seed, not args.no_citygml)
+    print(u"作成しました: {0}, {1}, {2}".format(gdb, codelists, udx))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,161 @@
+# coding:utf-8
+"""
+Name        :run_benchmark_v100.py
+Purpose     :generate_dataset_v100 で作成した合成データに対して Tools/script のツールを実行し、
+             段階ごとの処理件数/秒とピークメモリを件数（規模）ごとに表示するツール
+
+             各ツールは別プロセスで実行し、standin フォルダーの arcpy の代替モジュールを使用する（ArcGIS Pro は不要）。
+             処理時間は各ツールが instrumentation_v100 で出力するJSONから取得し、
+             全体の結果を <作業フォルダー>/benchmark_<日時>.json に出力する。
+             実行例: python run_benchmark_v100.py C:\\temp\\bench --scales 10000 100000 1000000
+Author      :
+Copyright   :
+Created     :2026/10/18
+Last Updated:2026/10/18
+ArcGIS Version: ArcGIS Pro 2.6 以上（ベンチマーク用。ArcGIS Pro は不要）
+"""
+import os
+import sys
+import glob
+import json
+import time
+import argparse
+import importlib.util
+import datetime
+import subprocess
+
+import generate_dataset_v100 as gends
+
+BENCHMARK_FOLDER = os.path.dirname(os.path.abspath(__file__))
+SCRIPT_FOLDER = os.path.join(os.path.dirname(BENCHMARK_FOLDER), "script")
+
+DEFAULT_SCALES = [10000, 100000, 1000000]
+
+# (ツール名, スクリプト, 引数を作成する関数)。ツール名は instrumentation_v100 のJSONのファイル名に使われる名前
+# 引数を作成する関数には (GDB, コードリストのフォルダー, CityGMLのフォルダー) を渡す
+TOOLS = [
+    ("calculate_genericAttributeSet_field", "calculate_genericAttributeSet_field_v112.py",
+     lambda gdb, codelists, udx: [gdb, "", "", "true"]),
+    ("calculate_genericAttributeSet_field_long", "calculate_genericAttributeSet_field_v112.py",
+     lambda gdb, codelists, udx: [gdb, "", "", "", "", "LONG"]),
+    ("assign_extendedAttributes", "assign_extendedAttributes_v113.py",
+     lambda gdb, codelists, udx: [os.path.join(codelists, "extendedAttribute_key.xml"), gdb]),
+    ("field_calculate_buildingName", "field_calculate_buildingName_v100.py",
+     lambda gdb, codelists, udx: [os.path.join(codelists, "Building_name.xml"), gdb]),
+    ("assign_landuseAttributes", "assign_landuseAttributes_v113.py",
+     lambda gdb, codelists, udx: [os.path.join(codelists, "LandUse_genUsage.xml"), gdb]),
+    ("export_genericAttributeSet", "export_genericAttributeSet_v100.py",
+     lambda gdb, codelists, udx: [gdb, os.path.join(os.path.dirname(gdb), "export"), "GEOPACKAGE"]),
+    ("export_genericAttributeSet_parquet", "export_genericAttributeSet_v100.py",
+     lambda gdb, codelists, udx: [gdb, os.path.join(os.path.dirname(gdb), "export"), "PARQUET"]),
+    ("filter_export_DistrictAndZones", "filter_export_DistrictAndZones_v100.py",
+     lambda gdb, codelists, udx: [os.path.join(gdb, "lod0_DistrictAndZones"), gdb]),
+    ("extract_building_attributes", "extract_building_attributes_v100.py",
+     lambda gdb, codelists, udx: [udx, os.path.join(gdb, "building_attributes")]),
+    ("preflight_check", "preflight_check_v100.py",
+     lambda gdb, codelists, udx: [os.path.dirname(gdb)]),
+    ("replace_iurUrl", "replace_iurUrl_v100.py",
+     lambda gdb, codelists, udx: [udx, "false", "true"]),
+]
+
+# 実行に必要なモジュール（インストールされていない場合は計測をスキップ）
+REQUIRED_MODULES = {
+    "export_genericAttributeSet_parquet": "pyarrow",
+}
+
+def findReport(folder, tool, started):
+    '''
+    started 以降に出力された <名前>_<ツール名>_<日時>.json のうち、最も新しいものを取得
+    '''
+    reports = [f for f in glob.glob(os.path.join(folder, "*_{0}_*.json".format(tool))) if os.path.getmtime(f) >= started]
+    if len(reports) == 0:
+        return None
+    with open(max(reports, key=os.path.getmtime), encoding="utf-8") as f:
+        return json.load(f)
+
+def runTool(tool, script, args, workdir, report_folder):
+    '''
+    ツールを別プロセスで実行して、(リターンコード, 処理時間(秒), instrumentation のJSON, 出力) を返却
+    '''
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join([os.path.join(BENCHMARK_FOLDER, "standin"), SCRIPT_FOLDER])
+    # コードリストのキャッシュは作業フォルダーに作成（前回の計測結果のキャッシュを使わないように規模ごとに分ける）
+    env["LOCALAPPDATA"] = os.path.join(workdir, "cache")
+    env["PYTHONIOENCODING"] = "utf-8"
+    started = time.time()
+    proc = subprocess.run([sys.executable, os.path.join(SCRIPT_FOLDER, script)] + args, cwd=workdir, env=env,
+                          stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+    secs = time.time() - started
+    output = proc.stdout.decode("utf-8", "replace")
+    rc = proc.returncode
+    # ツールは例外を AddError で出力して終了するため、エラーのメッセージもエラーとして扱う
+    if rc == 0 and any(line.startswith("ERROR: ") for line in output.splitlines()):
+        rc = 1
+    return rc, secs, findReport(report_folder, tool, started - 1), output
+
+def runScale(folder, rows, tools, seed, verbose):
+    workdir = os.path.join(folder, "rows_{0}".format(rows))
+    print(u"=== {0} 件 ===".format(rows))
+    started = time.time()
+    # ピークメモリは子プロセスに引き継がれるため、データの作成も別プロセスで実行する
+    subprocess.run([sys.executable, os.path.join(BENCHMARK_FOLDER, "generate_dataset_v100.py"), workdir,
+                    "--rows", str(rows), "--seed", str(seed)], check=True, stdout=subprocess.DEVNULL)
+    gdb = os.path.join(workdir, gends.GDB_NAME)
+    codelists = os.path.join(workdir, gends.CODELIST_FOLDER)
+    udx = os.path.join(workdir, gends.CITYGML_FOLDER)
+    print(u"データ作成: {0:.1f} 秒".format(time.time() - started))
+
+    results = {}
+    for tool, script, createArgs in TOOLS:
+        if tools and tool not in tools:
+            continue
+        module = REQUIRED_MODULES.get(tool)
+        if module is not None and importlib.util.find_spec(module) is None:
+            print(u"{0} [SKIP] {1} がインストールされていないためスキップします".format(tool, module))
+            continue
+        report_folder = udx if tool == "replace_iurUrl" else workdir
+        rc, secs, report, output = runTool(tool, script, createArgs(gdb, codelists, udx), workdir, report_folder)
+        if verbose or rc != 0:
+            print(output)
+        result = {"returncode": rc, "elapsed_sec": round(secs, 3)}
+        if report is not None:
+            result["peak_memory_mb"] = report.get("peak_memory_mb")
+            result["phases"] = report.get("phases", {})
+            result["counters"] = report.get("counters", {})
+        results[tool] = result
+        printResult(tool, result)
+    return results
+
+def printResult(tool, result):
+    status = "OK" if result["returncode"] == 0 else "NG"
+    print(u"{0} [{1}] {2:.1f} 秒, ピークメモリ {3} MB".format(tool, status, result["elapsed_sec"], result.get("peak_memory_mb", "-")))
+    for name, p in result.get("phases", {}).items():
+        if p.get("rows_per_sec"):
+            print(u"  {0}: {1} 件 / {2:.2f} 秒 ({3:.0f} 件/秒)".format(name, p["rows"], p["seconds"], p["rows_per_sec"]))
+        else:
+            print(u"  {0}: {1:.2f} 秒".format(name, p["seconds"]))
+
+def main():
+    parser = argparse.ArgumentParser(description=u"合成データで Tools/script のツールの処理件数/秒とピークメモリを計測")
+    parser.add_argument("folder", help=u"作業フォルダー（合成データと結果を出力）")
+    parser.add_argument("--scales", type=int, nargs="+", default=DEFAULT_SCALES, help=u"lod0_Building の件数")
+    parser.add_argument("--tools", nargs="+", choices=[t[0] for t in TOOLS], help=u"実行するツール（省略時はすべて）")
+    parser.add_argument("--seed", type=int, default=0, help=u"乱数のシード")
+    parser.add_argument("--verbose", action="store_true", help=u"ツールのメッセージを表示")
+    args = parser.parse_args()
+
+    summary = {"python": sys.version.split()[0], "platform": sys.platform, "scales": {}}
+    failed = False
+    for rows in args.scales:
+        results = runScale(args.folder, rows, args.tools, args.seed, args.verbose)
+        summary["scales"][str(rows)] = results
+        failed = failed or any(r["returncode"] != 0 for r in results.values())
+
+    path = os.path.join(args.folder, "benchmark_{0}.json".format(datetime.datetime.now().strftime("%Y%m%d_%H%M%S")))
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(summary, f, ensure_ascii=False, indent=1)
+    print(u"結果を出力しました: {0}".format(path))
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,467 @@
+# coding:utf-8
+"""
+Name        :arcpy（ベンチマーク用の代替モジュール）
+Purpose     :ArcGIS Pro のライセンスがない環境で Tools/script のツールの処理時間を計測するための、arcpy の代替モジュール。
+             ファイル ジオデータベースの代わりに SQLite（_gdb.py）を使い、ツールが使用している次の関数のみを実装する。
+             ・メッセージ: AddMessage, AddWarning, AddError, GetMessages（メッセージは標準出力に出力）
+             ・パラメータ: GetParameterAsText, GetParameter, GetArgumentCount（スクリプトの引数 sys.argv から取得）
+             ・データ: Exists, Describe, ListFields, ListFeatureClasses, ListFiles, GetCount_management, AddField_management, AddFields_management,
+                       ValidateFieldName, ListIndexes, AddIndex_management,
+                       CreateFileGDB_management, CreateFeatureclass_management, CreateTable_management, Delete_management,
+                       Copy_management, Append_management, AlterField_management, AlterAliasName
+             ・ドメイン: CreateDomain_management, TableToDomain_management, AssignDomainToField_management, da.ListDomains
+             ・カーソル: da.SearchCursor, da.UpdateCursor, da.InsertCursor
+
+             Tools/benchmark/standin を PYTHONPATH の先頭に追加すると import arcpy でこのモジュールが読み込まれる。
+             ArcGIS Pro の arcpy と処理時間を比較するものではなく、ツールのPython側の処理（XML解析、キャッシュ、メモリ使用量など）の
+             改善を同じ条件で比較するために使用する。
+Author      :
+Copyright   :
+Created     :2026/10/18
+Last Updated:2026/10/18
+ArcGIS Version: ArcGIS Pro 2.6 以上（ベンチマーク用。ArcGIS Pro は不要）
+"""
+import os
+import sys
+import glob
+import types
+import fnmatch
+import shutil
+
+from arcpy import _gdb
+from arcpy._gdb import ExecuteError
+
+class _Env(object):
+    def __init__(self):
+        self.workspace = None
+        self.overwriteOutput = False
+        self.scratchWorkspace = None
+
+env = _Env()
+
+_messages = []
+
+def _addMessage(severity, message):
+    _messages.append((severity, message))
+    prefix = {0: "", 1: "WARNING: ", 2: "ERROR: "}[severity]
+    print(u"{0}{1}".format(prefix, message))
+    sys.stdout.flush()
+
+def AddMessage(message):
+    _addMessage(0, message)
+
+def AddWarning(message):
+    _addMessage(1, message)
+
+def AddError(message):
+    _addMessage(2, message)
+
+def GetMessages(severity=0):
+    return "\n".join([m for s, m in _messages if s >= severity])
+
+def GetArgumentCount():
+    return len(sys.argv) - 1
+
+def GetParameterAsText(index):
+    return sys.argv[index + 1] if index + 1 < len(sys.argv) else ""
+
+class ValueTable(object):
+    '''
+    値テーブル（行は ";"、列は空白区切り。空白を含む値は ' または " で囲む）
+    '''
+    def __init__(self, columns=0):
+        self.columnCount = columns
+        self.rows = []
+
+    @property
+    def rowCount(self):
+        return len(self.rows)
+
+    def addRow(self, value):
+        import shlex
+        self.rows.append(shlex.split(value, posix=True) if isinstance(value, str) else list(value))
+
+    def getValue(self, row, column):
+        return self.rows[row][column]
+
+    def loadFromString(self, text):
+        for row in text.split(";"):
+            if row.strip() != "":
+                self.addRow(row)
+
+    def exportToString(self):
+        return ";".join([" ".join(r) for r in self.rows])
+
+def GetParameter(index):
+    text = GetParameterAsText(index)
+    if ";" in text or " " in text.strip():
+        vt = ValueTable()
+        vt.loadFromString(text)
+        return vt
+    return text
+
+class Result(object):
+    def __init__(self, *outputs):
+        self.outputs = list(outputs)
+
+    def getOutput(self, index):
+        return self.outputs[index]
+
+    def __getitem__(self, index):
+        return self.outputs[index]
+
+class Field(object):
+    def __init__(self, name, field_type, length, alias, domain):
+        self.name = name
+        self.baseName = name
+        self.type = field_type
+        self.length = length if length is not None else (4 if field_type in ("OID", "Integer") else 8)
+        self.aliasName = alias or name
+        self.domain = domain or ""
+        self.precision = 0
+        self.scale = 0
+        self.isNullable = field_type not in ("OID",)
+        self.required = field_type in ("OID", "Geometry")
+        self.editable = field_type not in ("OID",)
+
+class _SpatialReference(object):
+    def __init__(self, factoryCode=6668, name="GCS_JGD_2011"):
+        self.factoryCode = factoryCode
+        self.name = name
+        self.VCS = None
+
+def SpatialReference(item=6668, vcs=None):
+    return _SpatialReference(item)
+
+def _resolve(path):
+    ws, name = _gdb.splitPath(path, env.workspace)
+    if ws is None:
+        return None, None, None
+    if name is None:
+        return ws, None, None
+    if ws != _gdb.MEMORY_WORKSPACE and not os.path.isdir(ws):
+        return ws, None, None
+    conn = _gdb.connect(ws)
+    return ws, conn, _gdb.findDataset(conn, name)
+
+def _requireDataset(path):
+    ws, conn, ds = _resolve(path)
+    if ds is None:
+        raise ExecuteError(u"ERROR 000732: {0} は存在しません".format(path))
+    return conn, ds
+
+def Exists(path):
+    if path is None or path == "":
+        return False
+    ws, name = _gdb.splitPath(path, env.workspace)
+    if ws is None:
+        return os.path.exists(path)
+    if name is None:
+        return ws == _gdb.MEMORY_WORKSPACE or os.path.isdir(ws)
+    ws, conn, ds = _resolve(path)
+    return ds is not None
+
+class _Describe(object):
+    pass
+
+def Describe(path):
+    d = _Describe()
+    ws, name = _gdb.splitPath(path, env.workspace)
+    d.catalogPath = str(path)
+    if ws is not None and name is None:
+        d.dataType = "Workspace"
+        d.workspaceType = "LocalDatabase"
+        d.name = os.path.basename(ws)
+        return d
+    if ws is None:
+        d.dataType = "Folder" if os.path.isdir(path) else "File"
+        d.name = os.path.basename(path)
+        return d
+    conn, ds = _requireDataset(path)
+    d.name = ds[0]
+    d.baseName = ds[0]
+    d.dataType = ds[1]
+    d.shapeType = ds[2]
+    d.aliasName = ds[3]
+    d.OIDFieldName = _gdb.OID_FIELD
+    d.hasOID = True
+    d.shapeFieldName = _gdb.SHAPE_FIELD if ds[1] == "FeatureClass" else ""
+    d.lengthFieldName = ""
+    d.areaFieldName = ""
+    d.spatialReference = _SpatialReference()
+    d.fields = ListFields(path)
+    return d
+
+def ListFields(dataset, wild_card=None, field_type=None):
+    conn, ds = _requireDataset(dataset)
+    fields = [Field(*f) for f in _gdb.listFields(conn, ds[0])]
+    if wild_card:
+        fields = [f for f in fields if fnmatch.fnmatch(f.name.lower(), wild_card.lower())]
+    return fields
+
+def _listDatasets(kind, wild_card=None):
+    if not env.workspace or not Exists(env.workspace):
+        return []
+    conn = _gdb.connect(env.workspace)
+    names = [r[0] for r in conn.execute("SELECT name FROM _datasets WHERE kind = ? ORDER BY rowid", (kind,)).fetchall()]
+    if wild_card:
+        names = [n for n in names if fnmatch.fnmatch(n.lower(), wild_card.lower())]
+    return names
+
+def ListFeatureClasses(wild_card=None, feature_type=None, feature_dataset=None):
+    return _listDatasets("FeatureClass", wild_card)
+
+def ListTables(wild_card=None, table_type=None):
+    return _listDatasets("Table", wild_card)
+
+def ListFiles(wild_card=None):
+    if not env.workspace:
+        return []
+    return sorted([os.path.basename(f) for f in glob.glob(os.path.join(env.workspace, wild_card or "*"))])
+
+def AddFieldDelimiters(datasource, field):
+    return _gdb.quote(field)
+
+def GetCount_management(in_rows):
+    conn, ds = _requireDataset(in_rows)
+    return Result(str(conn.execute("SELECT COUNT(*) FROM {0}".format(_gdb.quote(ds[0]))).fetchone()[0]))
+
+def _validateFieldName(name):
+    '''
+    ファイル ジオデータベースで使用できない文字を "_" に置換（ArcGIS Pro と同じく警告を出して名前を変更）
+    '''
+    new_name = "".join([c if (c.isalnum() or c == "_") else "_" for c in name])
+    if new_name[:1].isdigit():
+        new_name = "_" + new_name
+    return new_name[:64]
+
+def AddField_management(in_table, field_name, field_type, field_precision=None, field_scale=None, field_length=None,
+                        field_alias=None, field_is_nullable="NULLABLE", field_is_required="NON_REQUIRED", field_domain=None):
+    conn, ds = _requireDataset(in_table)
+    ftype = _gdb.FIELD_TYPES.get(str(field_type).upper())
+    if ftype is None:
+        raise ExecuteError(u"ERROR 000800: {0} は有効なフィールドタイプではありません".format(field_type))
+    name = _validateFieldName(field_name)
+    if name != field_name:
+        AddWarning(u"WARNING 000311: フィールド名 {0} を {1} に変更しました".format(field_name, name))
+    existing = [f[0].lower() for f in _gdb.listFields(conn, ds[0])]
+    if name.lower() in existing:
+        AddWarning(u"WARNING 000012: {0} はすでに存在します".format(name))
+        return Result(in_table)
+    _gdb.addField(conn, ds[0], name, ftype, field_length, field_alias, field_domain)
+    return Result(in_table)
+
+AddField = AddField_management
+
+def ValidateFieldName(name, workspace=None):
+    return _validateFieldName(name)
+
+def AddFields_management(in_table, field_description, template=None):
+    '''
+    field_description: [[フィールド名, 型, エイリアス, 長さ, 初期値, ドメイン], ...]
+    '''
+    for f in field_description:
+        f = list(f) + [None] * (6 - len(f))
+        AddField_management(in_table, f[0], f[1], field_length=f[3], field_alias=f[2] or None, field_domain=f[5] or None)
+    return Result(in_table)
+
+class Index(object):
+    def __init__(self, name, fields):
+        self.name = name
+        self.fields = fields
+        self.isAscending = True
+        self.isUnique = False
+
+def ListIndexes(dataset, wild_card=None):
+    conn, ds = _requireDataset(dataset)
+    indexes = [Index(name, [f for f in ListFields(dataset) if f.name.lower() in [c.lower() for c in columns]])
+               for name, columns in _gdb.listIndexes(conn, ds[0])]
+    if wild_card:
+        indexes = [i for i in indexes if fnmatch.fnmatch(i.name.lower(), wild_card.lower())]
+    return indexes
+
+def AddIndex_management(in_table, fields, index_name=None, unique=None, ascending=None):
+    conn, ds = _requireDataset(in_table)
+    if isinstance(fields, str):
+        fields = [f.strip() for f in fields.split(";")]
+    names = dict((f[0].lower(), f[0]) for f in _gdb.listFields(conn, ds[0]))
+    for f in fields:
+        if f.lower() not in names:
+            raise ExecuteError(u"ERROR 000728: フィールド {0} はテーブル内に存在しません".format(f))
+    _gdb.addIndex(conn, ds[0], index_name or "IDX_" + "_".join(fields), [names[f.lower()] for f in fields], unique == "UNIQUE")
+    return Result(in_table)
+
+def CreateFileGDB_management(out_folder_path, out_name, out_version=None):
+    name = out_name if out_name.lower().endswith(".gdb") else out_name + ".gdb"
+    path = os.path.join(out_folder_path, name)
+    _gdb.connect(path, create=True)
+    return Result(path)
+
+def CreateFeatureclass_management(out_path, out_name, geometry_type="POLYGON", template=None, has_m=None, has_z=None, spatial_reference=None):
+    conn = _gdb.connect(out_path)
+    _gdb.createDataset(conn, out_name, "FeatureClass", str(geometry_type).capitalize())
+    if template:
+        # テンプレートの属性フィールドを追加
+        src_conn, ds = _requireDataset(template)
+        for name, ftype, length, alias, domain in _gdb.listFields(src_conn, ds[0]):
+            if ftype not in ("OID", "Geometry"):
+                _gdb.addField(conn, out_name, name, ftype, length, alias, domain)
+                if domain:
+                    _copyDomain(src_conn, conn, domain)
+    return Result(os.path.join(out_path, out_name))
+
+def CreateTable_management(out_path, out_name, template=None, config_keyword=None):
+    conn = _gdb.connect(out_path)
+    _gdb.createDataset(conn, out_name, "Table")
+    return Result(os.path.join(out_path, out_name))
+
+def Delete_management(in_data, data_type=None):
+    ws, name = _gdb.splitPath(in_data, env.workspace)
+    if ws is None:
+        if os.path.isdir(in_data):
+            shutil.rmtree(in_data)
+        elif os.path.exists(in_data):
+            os.remove(in_data)
+        return Result(True)
+    if name is None:
+        _gdb.disconnect(ws)
+        if ws != _gdb.MEMORY_WORKSPACE and os.path.isdir(ws):
+            shutil.rmtree(ws)
+        return Result(True)
+    conn, ds = _requireDataset(in_data)
+    _gdb.dropDataset(conn, ds[0])
+    return Result(True)
+
+def _copyRows(src_conn, src_name, dst_conn, dst_name, where_clause=None):
+    src_fields = dict((f[0].lower(), f[0]) for f in _gdb.listFields(src_conn, src_name) if f[1] != "OID")
+    dst_fields = [f[0] for f in _gdb.listFields(dst_conn, dst_name) if f[1] != "OID" and f[0].lower() in src_fields]
+    select = "SELECT {0} FROM {1}".format(", ".join([_gdb.quote(src_fields[f.lower()]) for f in dst_fields]), _gdb.quote(src_name))
+    if where_clause:
+        select += " WHERE ({0})".format(where_clause)
+    insert = "INSERT INTO {0} ({1}) VALUES ({2})".format(_gdb.quote(dst_name), ", ".join([_gdb.quote(f) for f in dst_fields]), ", ".join(["?"] * len(dst_fields)))
+    cur = src_conn.execute(select)
+    cnt = 0
+    while True:
+        rows = cur.fetchmany(10000)
+        if not rows:
+            break
+        dst_conn.executemany(insert, rows)
+        cnt += len(rows)
+    dst_conn.commit()
+    return cnt
+
+def _copyDataset(in_data, out_ws, out_name, where_clause=None):
+    src_conn, ds = _requireDataset(in_data)
+    dst_conn = _gdb.connect(out_ws)
+    _gdb.createDataset(dst_conn, out_name, ds[1], ds[2])
+    for name, ftype, length, alias, domain in _gdb.listFields(src_conn, ds[0]):
+        if ftype not in ("OID", "Geometry"):
+            _gdb.addField(dst_conn, out_name, name, ftype, length, alias, domain)
+            if domain:
+                _copyDomain(src_conn, dst_conn, domain)
+    dst_conn.execute("UPDATE _datasets SET alias = ? WHERE name = ?", (ds[3], out_name))
+    return _copyRows(src_conn, ds[0], dst_conn, out_name, where_clause)
+
+def _copyDomain(src_conn, dst_conn, domain):
+    if dst_conn.execute("SELECT 1 FROM _domains WHERE name = ?", (domain,)).fetchone() is not None:
+        return
+    row = src_conn.execute("SELECT name, description, field_type, domain_type FROM _domains WHERE name = ?", (domain,)).fetchone()
+    if row is None:
+        return
+    dst_conn.execute("INSERT INTO _domains VALUES (?, ?, ?, ?)", row)
+    dst_conn.executemany("INSERT INTO _coded_values VALUES (?, ?, ?)",
+                         src_conn.execute("SELECT domain, code, description FROM _coded_values WHERE domain = ?", (domain,)).fetchall())
+    dst_conn.commit()
+
+def Copy_management(in_data, out_data, data_type=None):
+    ws, name = _gdb.splitPath(in_data, env.workspace)
+    if name is None:
+        _gdb.connect(ws).commit()
+        shutil.copytree(ws, str(out_data))
+        return Result(out_data)
+    out_ws, out_name = _gdb.splitPath(out_data, env.workspace)
+    _copyDataset(in_data, out_ws, out_name)
+    return Result(out_data)
+
+def FeatureClassToFeatureClass_conversion(in_features, out_path, out_name, where_clause=None, field_mapping=None, config_keyword=None):
+    _copyDataset(in_features, out_path, out_name, where_clause)
+    return Result(os.path.join(out_path, out_name))
+
+def Append_management(inputs, target, schema_type="TEST", field_mapping=None, subtype=None, expression=None):
+    if isinstance(inputs, str):
+        inputs = [i.strip("'") for i in inputs.split(";")]
+    dst_conn, dst = _requireDataset(target)
+    for in_data in inputs:
+        src_conn, src = _requireDataset(in_data)
+        if schema_type == "TEST":
+            src_fields = set([(f[0].lower(), f[1]) for f in _gdb.listFields(src_conn, src[0])])
+            dst_fields = set([(f[0].lower(), f[1]) for f in _gdb.listFields(dst_conn, dst[0])])
+            if src_fields != dst_fields:
+                raise ExecuteError(u"ERROR 000466: {0} のスキーマが {1} と一致しません".format(in_data, target))
+        _copyRows(src_conn, src[0], dst_conn, dst[0], expression)
+    return Result(target)
+
+def AlterField_management(in_table, field, new_field_name=None, new_field_alias=None, field_type=None, field_length=None,
+                          field_is_nullable=None, clear_field_alias=None):
+    conn, ds = _requireDataset(in_table)
+    row = conn.execute("SELECT name FROM _fields WHERE dataset = ? AND lower(name) = lower(?)", (ds[0], field)).fetchone()
+    if row is None:
+        raise ExecuteError(u"ERROR 000728: フィールド {0} は存在しません".format(field))
+    if new_field_alias:
+        conn.execute("UPDATE _fields SET alias = ? WHERE dataset = ? AND name = ?", (new_field_alias, ds[0], row[0]))
+    if new_field_name and new_field_name != row[0]:
+        conn.execute("ALTER TABLE {0} RENAME COLUMN {1} TO {2}".format(_gdb.quote(ds[0]), _gdb.quote(row[0]), _gdb.quote(new_field_name)))
+        conn.execute("UPDATE _fields SET name = ? WHERE dataset = ? AND name = ?", (new_field_name, ds[0], row[0]))
+    conn.commit()
+    return Result(in_table)
+
+def AlterAliasName(table, alias):
+    conn, ds = _requireDataset(table)
+    conn.execute("UPDATE _datasets SET alias = ? WHERE name = ?", (alias, ds[0]))
+    conn.commit()
+
+_DOMAIN_FIELD_TYPES = {"TEXT": "Text", "LONG": "Long", "SHORT": "Short", "DOUBLE": "Double", "FLOAT": "Float", "DATE": "Date"}
+
+def CreateDomain_management(in_workspace, domain_name, domain_description=None, field_type="TEXT", domain_type="CODED",
+                            split_policy=None, merge_policy=None):
+    conn = _gdb.connect(in_workspace)
+    if conn.execute("SELECT 1 FROM _domains WHERE name = ?", (domain_name,)).fetchone() is not None:
+        raise ExecuteError(u"ERROR 000192: ドメイン {0} はすでに存在します".format(domain_name))
+    conn.execute("INSERT INTO _domains VALUES (?, ?, ?, ?)", (domain_name, domain_description,
+                 _DOMAIN_FIELD_TYPES.get(str(field_type).upper(), "Text"), "CodedValue" if str(domain_type).upper() == "CODED" else "Range"))
+    conn.commit()
+    return Result(in_workspace)
+
+def TableToDomain_management(in_table, code_field, description_field, in_workspace, domain_name, domain_description=None, update_option="APPEND"):
+    conn = _gdb.connect(in_workspace)
+    src_conn, ds = _requireDataset(in_table)
+    if conn.execute("SELECT 1 FROM _domains WHERE name = ?", (domain_name,)).fetchone() is None:
+        # ドメインの型はコードのフィールドの型
+        code_type = [f[1] for f in _gdb.listFields(src_conn, ds[0]) if f[0].lower() == code_field.lower()][0]
+        field_type = dict((v, k) for k, v in _gdb.FIELD_TYPES.items()).get(code_type, "TEXT")
+        CreateDomain_management(in_workspace, domain_name, domain_description, field_type, "CODED")
+    elif update_option == "REPLACE":
+        conn.execute("DELETE FROM _coded_values WHERE domain = ?", (domain_name,))
+    rows = src_conn.execute("SELECT {0}, {1} FROM {2}".format(_gdb.quote(code_field), _gdb.quote(description_field), _gdb.quote(ds[0]))).fetchall()
+    conn.executemany("INSERT OR REPLACE INTO _coded_values VALUES (?, ?, ?)", [(domain_name, c, d) for c, d in rows])
+    conn.commit()
+    return Result(in_workspace)
+
+def AssignDomainToField_management(in_table, field_name, domain_name, subtype_code=None):
+    conn, ds = _requireDataset(in_table)
+    if conn.execute("SELECT 1 FROM _domains WHERE name = ?", (domain_name,)).fetchone() is None:
+        raise ExecuteError(u"ERROR 000800: ドメイン {0} は存在しません".format(domain_name))
+    conn.execute("UPDATE _fields SET domain = ? WHERE dataset = ? AND lower(name) = lower(?)", (domain_name, ds[0], field_name))
+    conn.commit()
+    return Result(in_table)
+
+# arcpy.management.XXX の形式での呼び出し用
+management = types.SimpleNamespace(
+    AddField=AddField_management, AddFields=AddFields_management, AlterField=AlterField_management, Append=Append_management,
+    AssignDomainToField=AssignDomainToField_management, Copy=Copy_management, CreateDomain=CreateDomain_management,
+    CreateFeatureclass=CreateFeatureclass_management, CreateFileGDB=CreateFileGDB_management,
+    AddIndex=AddIndex_management, CreateTable=CreateTable_management, Delete=Delete_management, GetCount=GetCount_management,
+    TableToDomain=TableToDomain_management)
+conversion = types.SimpleNamespace(FeatureClassToFeatureClass=FeatureClassToFeatureClass_conversion)
+
+from arcpy import da
@@ -0,0 +1,141 @@
+# coding:utf-8
+"""
+Name        :_gdb.py
+Purpose     :ベンチマーク用の arcpy の代替モジュールで、ファイル ジオデータベースの代わりに使う SQLite のワークスペース。
+
+             <名前>.gdb のフォルダー内の gdb.sqlite に、フィーチャクラス（テーブル）ごとに1つのテーブルを作成し、
+             フィールドの型、エイリアス、ドメインなどの定義は _fields, _datasets, _domains, _coded_values の各テーブルに保持する。
+             "memory" ワークスペースはプロセス内のメモリ上の SQLite に作成する。
+Author      :
+Copyright   :
+Created     :2026/10/18
+Last Updated:2026/10/18
+ArcGIS Version: ArcGIS Pro 2.6 以上（ベンチマーク用。ArcGIS Pro は不要）
+"""
+import os
+import re
+import sqlite3
+
+DB_FILENAME = "gdb.sqlite"
+MEMORY_WORKSPACE = "memory"
+OID_FIELD = "OBJECTID"
+SHAPE_FIELD = "Shape"
+
+# AddField の型 → ListFields の型
+FIELD_TYPES = {"TEXT": "String", "LONG": "Integer", "SHORT": "SmallInteger", "BIGINTEGER": "BigInteger",
+               "DOUBLE": "Double", "FLOAT": "Single", "DATE": "Date", "GUID": "GUID", "BLOB": "Blob"}
+# ListFields の型 → SQLite の型
+SQLITE_TYPES = {"OID": "INTEGER PRIMARY KEY", "Geometry": "BLOB", "String": "TEXT", "Integer": "INTEGER",
+                "SmallInteger": "INTEGER", "BigInteger": "INTEGER", "Double": "REAL", "Single": "REAL",
+                "Date": "TEXT", "GUID": "TEXT", "Blob": "BLOB"}
+
+DEFAULT_TEXT_LENGTH = 255
+INDEX_SEPARATOR = "__"
+
+_connections = {}
+
+class ExecuteError(Exception):
+    pass
+
+def quote(name):
+    return '"{0}"'.format(name.replace('"', '""'))
+
+def isWorkspacePath(path):
+    return path == MEMORY_WORKSPACE or path.lower().endswith(".gdb")
+
+def splitPath(path, workspace):
+    '''
+    パスを (ワークスペース, 名前) に分割。ワークスペースでないパス（フォルダー内のファイルなど）は (None, パス)
+    名前だけの場合は env.workspace のワークスペース
+    '''
+    path = str(path)
+    parts = path.replace("\\", "/").split("/")
+    for i in range(len(parts) - 1, -1, -1):
+        if isWorkspacePath(parts[i]):
+            ws = "/".join(parts[:i + 1])
+            name = parts[-1] if i + 1 < len(parts) else None
+            return ws, name
+    if len(parts) == 1 and workspace and isWorkspacePath(os.path.basename(str(workspace).replace("\\", "/"))):
+        return workspace, path
+    return None, path
+
+def connect(ws, create=False):
+    key = ws if ws == MEMORY_WORKSPACE else os.path.normcase(os.path.abspath(ws))
+    conn = _connections.get(key)
+    if conn is not None:
+        return conn
+    if ws == MEMORY_WORKSPACE:
+        conn = sqlite3.connect(":memory:")
+    else:
+        if not os.path.isdir(ws):
+            if not create:
+                raise ExecuteError(u"ERROR 000732: {0} は存在しません".format(ws))
+            os.makedirs(ws)
+        conn = sqlite3.connect(os.path.join(ws, DB_FILENAME))
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("CREATE TABLE IF NOT EXISTS _datasets (name TEXT PRIMARY KEY, kind TEXT, shape_type TEXT, alias TEXT)")
+    conn.execute("CREATE TABLE IF NOT EXISTS _fields (dataset TEXT, name TEXT, type TEXT, length INTEGER, alias TEXT, domain TEXT, position INTEGER)")
+    conn.execute("CREATE TABLE IF NOT EXISTS _domains (name TEXT PRIMARY KEY, description TEXT, field_type TEXT, domain_type TEXT)")
+    conn.execute("CREATE TABLE IF NOT EXISTS _coded_values (domain TEXT, code, description TEXT, PRIMARY KEY (domain, code))")
+    conn.commit()
+    _connections[key] = conn
+    return conn
+
+def disconnect(ws):
+    key = ws if ws == MEMORY_WORKSPACE else os.path.normcase(os.path.abspath(ws))
+    conn = _connections.pop(key, None)
+    if conn is not None:
+        conn.close()
+
+def findDataset(conn, name):
+    '''
+    名前の大文字小文字を区別せずにデータセットを検索し、(名前, 種類, ジオメトリタイプ, エイリアス) を返却
+    '''
+    return conn.execute("SELECT name, kind, shape_type, alias FROM _datasets WHERE lower(name) = lower(?)", (name,)).fetchone()
+
+def listFields(conn, dataset):
+    return conn.execute("SELECT name, type, length, alias, domain FROM _fields WHERE dataset = ? ORDER BY position", (dataset,)).fetchall()
+
+def createDataset(conn, name, kind, shape_type=None):
+    if findDataset(conn, name) is not None:
+        raise ExecuteError(u"ERROR 000258: {0} はすでに存在します".format(name))
+    fields = [(OID_FIELD, "OID", None)]
+    if kind == "FeatureClass":
+        fields.append((SHAPE_FIELD, "Geometry", None))
+    conn.execute("INSERT INTO _datasets VALUES (?, ?, ?, ?)", (name, kind, shape_type, name))
+    for i, (fname, ftype, length) in enumerate(fields):
+        conn.execute("INSERT INTO _fields VALUES (?, ?, ?, ?, ?, ?, ?)", (name, fname, ftype, length, fname, None, i))
+    conn.execute("CREATE TABLE {0} ({1})".format(quote(name), ", ".join(["{0} {1}".format(quote(f), SQLITE_TYPES[t]) for f, t, l in fields])))
+    conn.commit()
+
+def addField(conn, dataset, name, ftype, length=None, alias=None, domain=None):
+    position = conn.execute("SELECT COUNT(*) FROM _fields WHERE dataset = ?", (dataset,)).fetchone()[0]
+    if ftype == "String" and not length:
+        length = DEFAULT_TEXT_LENGTH
+    conn.execute("INSERT INTO _fields VALUES (?, ?, ?, ?, ?, ?, ?)", (dataset, name, ftype, length, alias or name, domain, position))
+    conn.execute("ALTER TABLE {0} ADD COLUMN {1} {2}".format(quote(dataset), quote(name), SQLITE_TYPES[ftype]))
+    conn.commit()
+
+def addIndex(conn, dataset, index_name, columns, unique=False):
+    '''
+    インデックスは SQLite のインデックス "<データセット名>__<インデックス名>" として作成
+    '''
+    conn.execute("CREATE {0}INDEX {1} ON {2} ({3})".format("UNIQUE " if unique else "", quote(dataset + INDEX_SEPARATOR + index_name),
+                                                           quote(dataset), ", ".join([quote(c) for c in columns])))
+    conn.commit()
+
+def listIndexes(conn, dataset):
+    indexes = []
+    prefix = dataset + INDEX_SEPARATOR
+    for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL", (dataset,)).fetchall():
+        if name.startswith(prefix):
+            columns = [r[2] for r in conn.execute("PRAGMA index_info({0})".format(quote(name))).fetchall()]
+            indexes.append((name[len(prefix):], columns))
+    return indexes
+
+def dropDataset(conn, name):
+    conn.execute("DROP TABLE IF EXISTS {0}".format(quote(name)))
+    conn.execute("DELETE FROM _datasets WHERE name = ?", (name,))
+    conn.execute("DELETE FROM _fields WHERE dataset = ?", (name,))
+    conn.commit()
@@ -0,0 +1,191 @@
+# coding:utf-8
+"""
+Name        :da.py
+Purpose     :ベンチマーク用の arcpy.da の代替モジュール（SearchCursor, UpdateCursor, InsertCursor, ListDomains）。
+             UpdateCursor は OBJECTID 順に UPDATE_PAGE_SIZE 件ずつ読み込み、カーソルを閉じたときに確定する。
+Author      :
+Copyright   :
+Created     :2026/10/18
+Last Updated:2026/10/18
+ArcGIS Version: ArcGIS Pro 2.6 以上（ベンチマーク用。ArcGIS Pro は不要）
+"""
+import arcpy
+from arcpy import _gdb
+
+# UpdateCursor で1回に読み込む件数
+UPDATE_PAGE_SIZE = 5000
+
+def _openDataset(in_table):
+    ws, name = _gdb.splitPath(in_table, arcpy.env.workspace)
+    if ws is None or name is None:
+        raise _gdb.ExecuteError(u"ERROR 000732: {0} は存在しません".format(in_table))
+    conn = _gdb.connect(ws)
+    ds = _gdb.findDataset(conn, name)
+    if ds is None:
+        raise _gdb.ExecuteError(u"ERROR 000732: {0} は存在しません".format(in_table))
+    return conn, ds[0]
+
+def _resolveFields(conn, dataset, field_names):
+    '''
+    フィールド名（OID@, SHAPE@ を含む）をテーブルの列名に変換
+    '''
+    if isinstance(field_names, str):
+        field_names = [f.strip() for f in field_names.split(";")]
+    names = dict((f[0].lower(), f[0]) for f in _gdb.listFields(conn, dataset))
+    columns = []
+    for f in field_names:
+        if f.upper() == "OID@":
+            columns.append(_gdb.OID_FIELD)
+        elif f.upper().startswith("SHAPE@"):
+            columns.append(_gdb.SHAPE_FIELD)
+        elif f == "*":
+            columns.extend([n for n in names.values()])
+        elif f.lower() in names:
+            columns.append(names[f.lower()])
+        else:
+            raise RuntimeError(u"Cannot find field '{0}'".format(f))
+    return columns
+
+def _createSelect(dataset, columns, where_clause, postfix=None):
+    sql = "SELECT {0} FROM {1}".format(", ".join([_gdb.quote(c) for c in columns]), _gdb.quote(dataset))
+    if where_clause:
+        sql += " WHERE ({0})".format(where_clause)
+    if postfix:
+        sql += " " + postfix
+    return sql
+
+class SearchCursor(object):
+    def __init__(self, in_table, field_names, where_clause=None, spatial_reference=None, explode_to_points=False, sql_clause=(None, None)):
+        self.conn, self.dataset = _openDataset(in_table)
+        self.fields = _resolveFields(self.conn, self.dataset, field_names)
+        postfix = sql_clause[1] if sql_clause else None
+        self.cur = self.conn.execute(_createSelect(self.dataset, self.fields, where_clause, postfix))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.reset()
+        return False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self.cur is None:
+            raise StopIteration
+        r = self.cur.fetchone()
+        if r is None:
+            raise StopIteration
+        return r
+
+    next = __next__
+
+    def reset(self):
+        if self.cur is not None:
+            self.cur.close()
+            self.cur = None
+
+class UpdateCursor(object):
+    def __init__(self, in_table, field_names, where_clause=None, spatial_reference=None, explode_to_points=False, sql_clause=(None, None)):
+        self.conn, self.dataset = _openDataset(in_table)
+        self.fields = _resolveFields(self.conn, self.dataset, field_names)
+        self.where_clause = where_clause
+        self.page = []
+        self.last_oid = None
+        self.current_oid = None
+        self.done = False
+        self.update_sql = "UPDATE {0} SET {1} WHERE {2} = ?".format(_gdb.quote(self.dataset),
+            ", ".join(["{0} = ?".format(_gdb.quote(c)) for c in self.fields]), _gdb.OID_FIELD)
+        self.delete_sql = "DELETE FROM {0} WHERE {1} = ?".format(_gdb.quote(self.dataset), _gdb.OID_FIELD)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.conn.commit()
+        return False
+
+    def __iter__(self):
+        return self
+
+    def _readPage(self):
+        # 更新で where 句の条件が変わっても同じレコードを2回返さないように、OBJECTID 順にページ単位で読み込む
+        where = "{0} > {1}".format(_gdb.OID_FIELD, self.last_oid) if self.last_oid is not None else None
+        if self.where_clause:
+            where = "({0}) AND {1}".format(self.where_clause, where) if where else self.where_clause
+        sql = _createSelect(self.dataset, [_gdb.OID_FIELD] + self.fields, where, "ORDER BY {0} LIMIT {1}".format(_gdb.OID_FIELD, UPDATE_PAGE_SIZE))
+        self.page = self.conn.execute(sql).fetchall()
+        self.page.reverse()
+        if len(self.page) < UPDATE_PAGE_SIZE:
+            self.done = True
+
+    def __next__(self):
+        if len(self.page) == 0:
+            if self.done:
+                raise StopIteration
+            self._readPage()
+            if len(self.page) == 0:
+                raise StopIteration
+        r = self.page.pop()
+        self.current_oid = r[0]
+        self.last_oid = r[0]
+        return list(r[1:])
+
+    next = __next__
+
+    def updateRow(self, row):
+        self.conn.execute(self.update_sql, tuple(row) + (self.current_oid,))
+
+    def deleteRow(self):
+        self.conn.execute(self.delete_sql, (self.current_oid,))
+
+    def reset(self):
+        self.page = []
+        self.last_oid = None
+        self.done = False
+
+class InsertCursor(object):
+    def __init__(self, in_table, field_names):
+        self.conn, self.dataset = _openDataset(in_table)
+        self.fields = _resolveFields(self.conn, self.dataset, field_names)
+        self.sql = "INSERT INTO {0} ({1}) VALUES ({2})".format(_gdb.quote(self.dataset),
+            ", ".join([_gdb.quote(c) for c in self.fields]), ", ".join(["?"] * len(self.fields)))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.conn.commit()
+        return False
+
+    def insertRow(self, row):
+        return self.conn.execute(self.sql, tuple(row)).lastrowid
+
+    def insertRows(self, rows):
+        '''
+        ベンチマークのデータ作成用（arcpy にはない）
+        '''
+        self.conn.executemany(self.sql, rows)
+
+class Domain(object):
+    def __init__(self, name, description, field_type, domain_type, coded_values):
+        self.name = name
+        self.description = description
+        self.type = field_type
+        self.domainType = domain_type
+        self.codedValues = coded_values
+        self.range = None
+        self.owner = ""
+        self.mergePolicy = "DefaultValue"
+        self.splitPolicy = "DefaultValue"
+
+def ListDomains(in_workspace):
+    conn = _gdb.connect(in_workspace)
+    domains = []
+    for name, description, field_type, domain_type in conn.execute("SELECT name, description, field_type, domain_type FROM _domains ORDER BY name").fetchall():
+        coded = {}
+        if domain_type == "CodedValue":
+            coded = dict(conn.execute("SELECT code, description FROM _coded_values WHERE domain = ?", (name,)).fetchall())
+        domains.append(Domain(name, description, field_type, domain_type, coded))
+    return domains
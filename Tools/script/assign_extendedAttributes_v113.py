@@ -14,17 +14,31 @@ Purpose     :3D都市モデルで拡張属性の定義が標準対応、およ
              ・例外発生時のtraceback を追加            
             v112  → v113 の更新内容
              ・フィールド名のエイリアスに、ドメインの説明を適用する処理を追加
+            v113  → v114 の更新内容
+             ・コードリストの解析を codelist_index に変更（解析結果をキャッシュして、変更されたファイルのみ解析）
+             ・コード値ドメインのコードを一括で追加するように変更し、既存ドメインにはコードリストに追加されたコードのみを追加
+             ・段階ごとの処理時間を計測して GDB と同じフォルダーにJSONで出力
+             ・フィールドへのドメインとエイリアスの適用を、全てのコードリストの処理後にフィーチャクラスごとにまとめて実行するように変更
+               （フィーチャクラスの存在確認とフィールドの定義の取得はフィーチャクラスごとに1回にし、
+                 ドメインとエイリアスが適用済みのフィールドはスキップするため、処理済みの GDB への再実行ではスキーマを変更しない）
 Author      :
 Copyright   :
 Created     :2021/03/24
-Last Updated:2021/09/08
+Last Updated:2026/10/18
 ArcGIS Version: ArcGIS Pro 2.6 以上
 """
 import arcpy
 import os
-import xml.etree.ElementTree as et
+import sys
 import traceback #v112
 
+# v114: コードリストの解析結果を共有するインデックス
+import codelist_index_v100 as cdidx
+# v114: コード値ドメインを一括で作成、追加する処理
+import domain_builder_v100 as dombld
+# v114: 処理時間の計測
+import instrumentation_v100 as instr
+
 #拡張属性を定義しているファイル名
 EXTATTR_KEYFILE = "extendedAttribute_key.xml"
 
@@ -61,47 +75,50 @@ def createExtendedAttributeFiles(xmlfile):
     """
     extendedAttribute_key.xml から開くxmlファイル名とドメインの説明を作成
     v111:メモリ対策の見直し, 空の<gml:dictionaryEntry>要素への対応
+    v114:コードリストの解析は codelist_index で行う（変更がなければキャッシュから取得）
     """
     fileDict = dict()
-    tree = et.parse(xmlfile)
-    root = tree.getroot()
-    ns = {'gml':"http://www.opengis.net/gml"}
     # gml:Definition/gml:name はファイル名に利用
     # gml:Definition/gml:description はドメインの説明に利用
-    dicts = root.findall('gml:dictionaryEntry', ns)
-    for dic in dicts:
-        if (dic.find('gml:Definition/gml:description', ns) != None) and (dic.find('gml:Definition/gml:name', ns) != None):
-            desc = dic.find('gml:Definition/gml:description', ns).text
-            name = dic.find('gml:Definition/gml:name', ns).text
-            fileName = createFileName(os.path.basename(xmlfile), name)
-            fileDict[fileName] = desc
-        dic.clear()
-    dicts.clear()
-    root.clear()
+    domainName, domainDict = cdidx.getCodelist(xmlfile)
+    for name in domainDict:
+        fileName = createFileName(os.path.basename(xmlfile), name)
+        fileDict[fileName] = domainDict[name]
     return fileDict
 
 def createDomainValues(xmlfile):
     """
     extendedAttribute_keyXX.xml からコード値ドメインの定義に必要な情報を作成
     v111:メモリ対策の見直し, 空の<gml:dictionaryEntry>要素への対応   
+    v114:コードリストの解析は codelist_index で行う（変更がなければキャッシュから取得）
     """
-    domainDict = dict()
-    tree = et.parse(xmlfile)
-    root = tree.getroot()       
-    ns = {'gml':"http://www.opengis.net/gml"}
     # gml:name を ドメイン名として利用
-    domainName = root.find('gml:name', ns).text
     # gml:Definition/gml:name と gml:Definition/gml:description をコード値ドメインの値として利用
-    dicts = root.findall('gml:dictionaryEntry', ns)
-    for dic in dicts:
-        if (dic.find('gml:Definition/gml:description', ns) != None) and (dic.find('gml:Definition/gml:name', ns) != None):
-            desc = dic.find('gml:Definition/gml:description', ns).text
-            name = dic.find('gml:Definition/gml:name', ns).text
-            domainDict[name] = desc
-        dic.clear()
-    dicts.clear()
-    root.clear()    
-    return domainName, domainDict
+    return cdidx.getCodelist(xmlfile)
+
+def applyDomainPlan(plan):
+    """
+    v114: フィーチャクラスごとに、計画したドメインとエイリアスのうち適用されていないものだけを適用
+    """
+    unchanged = 0
+    for fc in plan.getFeatureClasses():
+        with instr.phase(u"フィールド比較"):
+            changes, missing = plan.diff(fc)
+        for fieldName in missing:
+            arcpy.AddWarning(u"{0} に{1} フィールドが定義されていないため、ドメインの適用をスキップします".format(fc, fieldName))
+        unchanged += len(plan.assignments[fc]) - len(changes) - len(missing)
+        if len(changes) == 0:
+            arcpy.AddMessage(u"{0} のドメインとエイリアスは適用済みのため、変更はありません".format(fc))
+            continue
+        for fieldName, domainName, alias in changes:
+            if domainName is not None:
+                arcpy.AddMessage(u"{0} の{1} フィールドに{2} ドメインを適用します".format(fc, fieldName, domainName))
+            else:
+                arcpy.AddMessage(u"{0} の{1} フィールドのエイリアスを {2} にします".format(fc, fieldName, alias))
+        with instr.phase(u"ドメイン適用") as p:
+            plan.apply(fc, changes)
+            p.rows += len(changes)
+    instr.count(u"適用済み", unchanged)
 
 def main():
     try:
@@ -119,17 +136,30 @@ def main():
             arcpy.AddError(u"{0} は3D都市モデルの変換先ファイル ジオデータベースを選択する必要があります".format(gdb))
             return
         
-        # extendedAttribute_key.xml の情報をもとに、拡張属性ファイル名とコード値ドメインの説明を作成
-        xmlfiles = createExtendedAttributeFiles(extendedAttribute_xml)
+        # v114: 処理時間の計測を開始
+        instr.start("assign_extendedAttributes", gdb)
+
+        with instr.phase(u"コードリスト解析"):
+            # v114: codelists フォルダーのコードリストをまとめて読み込み（変更されたファイルのみ解析）
+            cdidx.loadFolder(folder)
+
+            # extendedAttribute_key.xml の情報をもとに、拡張属性ファイル名とコード値ドメインの説明を作成
+            xmlfiles = createExtendedAttributeFiles(extendedAttribute_xml)
         # 既存ドメインを取得
-        domains = arcpy.Describe(gdb).domains
+        # v114: コード値ドメインはコード値も取得して、コードリストとの差分のみ追加する
+        with instr.phase(u"ドメイン作成"):
+            domains = dombld.listCodedValues(gdb)
         
         arcpy.env.workspace = gdb
+        # v114: ドメインを適用するフィーチャクラスの存在確認は1回のみ
+        fcs = [fc for fc in FCNAMES if arcpy.Exists(fc)]
+        plan = dombld.DomainAssignmentPlan()
         # extendedAttribute_keyXX.xml を開いてコード値ドメインを設定
         for xmlfile in xmlfiles:
             extendedAttribute_key_xml = os.path.join(folder, xmlfile)
             if os.path.exists(extendedAttribute_key_xml):
-                domainName, domainDict = createDomainValues(extendedAttribute_key_xml)
+                with instr.phase(u"コードリスト解析"):
+                    domainName, domainDict = createDomainValues(extendedAttribute_key_xml)
                 # v111: extendedAttribute_keyX.xml と、<gml:name>ExtendedAttribute_keyX</gml:name> の整合チェックを追加。
                 # （<gml:name>ExtendedAttribute_key</gml:name>  で番号が入っていないケースがあるため）
                 fname = os.path.splitext(xmlfile)[0]
@@ -137,34 +167,21 @@ def main():
                     arcpy.AddError(u"{0} ファイル内の <gml:name>{1}</gml:name>  の定義が正しくないため、このファイルで定義されている拡張属性のコード値ドメイン定義とフィールドへの適用は実行できません".format(xmlfile, domainName))
                 else:
                     domainDesc = xmlfiles[xmlfile]
-                    # ドメインの作成（既存ドメインが存在する場合は処理しない）
-                    if domainName not in domains:
-                        #print("Creating domain " + domainName)
-                        arcpy.AddMessage(u"{0}: ドメイン を作成します".format(domainName))
-                        arcpy.CreateDomain_management(gdb, domainName, domainDesc, "TEXT", "CODED")
-                        # 作成したドメインにコードと説明を追加
-                        for code in domainDict:
-                            codeDesc = domainDict[code]
-                            if (codeDesc != None): #v112: codeDesc  が空文字の場合への対応                            
-                                arcpy.AddMessage(u"{0}: ドメイン に{1} , {2} のコードを追加します".format(domainName,code,codeDesc))
-                                arcpy.AddCodedValueToDomain_management(gdb, domainName, code, codeDesc)
-                            else:
-                                arcpy.AddWarning(u"{0}: ドメイン に追加する{1} のコードの説明がないので処理をスキップします".format(domainName,code))
-                        #print("Add code " code)
-                    else:
-                        arcpy.AddWarning(u"{0}: ドメイン はすでに存在しているので、ドメイン 作成の処理はスキップします".format(domainName))
+                    # v114: ドメインの作成とコードの追加を一括で実行（既存ドメインが存在する場合は、ないコードのみを追加）
+                    with instr.phase(u"ドメイン作成") as p:
+                        p.rows += dombld.buildCodedValueDomain(gdb, domainName, domainDesc, domainDict, domains)
                     #ドメインを指定フィーチャクラスに適用
                     # lod0_Building, lod1_Building, lod2_Building, lod1_BuildingPart, lod2_BuildingPart
+                    # v114: 適用するドメインとエイリアスは計画にまとめ、全てのコードリストの処理後に適用
                     fieldName = createFieldNameFromFilename(xmlfile) #例) uro_extendedAttribute_key2
-                    for fc in FCNAMES:
-                        if arcpy.Exists(fc):
-                            fieldNames = [f.name for f in arcpy.ListFields(fc)]
-                            if fieldName in fieldNames:
-                                arcpy.AddMessage(u"{0} の{1} フィールドに{2} ドメインを適用します".format(fc, fieldName, domainName))
-                                arcpy.AssignDomainToField_management(fc, fieldName, domainName)
-                                arcpy.AlterField_management(fc, fieldName, new_field_alias=domainDesc) #v113: フィールドエイリアスをドメインの説明にする
-                            else:
-                                arcpy.AddWarning(u"{0} に{1} フィールドが定義されていないため、ドメインの適用をスキップします".format(fc, fieldName))
+                    for fc in fcs:
+                        plan.add(fc, fieldName, domainName, domainDesc) #v113: フィールドエイリアスをドメインの説明にする
+
+        # v114: フィーチャクラスごとにフィールドの定義と比較して、変更が必要なフィールドのみに適用
+        applyDomainPlan(plan)
+
+        # v114: 段階ごとの処理時間を GDB と同じフォルダーに出力
+        instr.finish()
 
         arcpy.AddMessage(u"処理終了：")
     except arcpy.ExecuteError:
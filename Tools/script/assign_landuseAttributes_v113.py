@@ -20,21 +20,28 @@ Purpose     :3D都市モデルで土地利用（luse）は、自治体拡張が
              ・コード値に対応する説明がない不正なデータはスキップするよう処理を追加             
             v112 → v113 の更新内容
              ・コード値ドメインの適用を"土地利用区分" の文字を含むフィールドに限定
+            v113 → v114 の更新内容
+             ・xml_genericAttributeSet の展開処理を calgen の展開処理の呼び出しに変更（DataFrame を使わない展開処理で高速化）
+             ・コード値ドメインのコードを一括で追加するように変更し、既存ドメインにはコードリストに追加されたコードのみを追加
+             ・段階ごとの処理時間を計測して GDB と同じフォルダーにJSONで出力
+             ・コード値ドメインは、展開処理で決めたフィールド名（予約語、重複する名前は付番）のフィールドに適用
 Author      :
 Copyright   :
 Created     :2021/03/25
-Last Updated:2021/12/17
+Last Updated:2026/10/18
 ArcGIS Version: ArcGIS Pro 2.6 以上
 """
 import arcpy
 import os
 import xml.etree.ElementTree as et
-import pandas as pd
+import sys
 import traceback #v112
 
 # 使いまわし可能な関数がそれぞれをimport 
 import calculate_genericAttributeSet_field_v112 as calgen
 import assign_extendedAttributes_v113 as exattr
+import domain_builder_v100 as dombld
+import instrumentation_v100 as instr
 
 #ワークベンチで処理した結果を格納してあるフィールド名
 XMLFIELDNAME = "xml_genericAttributeSet"
@@ -51,83 +58,10 @@ def convertXmlfieldToFields(fc):
     指定フィーチャクラス の xml_genericAttributeSet をフラットに展開する処理
     (calculate_genericAttributeSet_field_v10x.py からコピーしてきてdataframe も返却するようにした）
     v111:進捗表示のメッセージを追加
+    v114:展開処理は calgen.expandXmlfield を呼び出し、dataframe の代わりに展開した 'name:type' のキーの一覧と
+         値を展開したフィールド名の一覧を返却
     '''
-    blResult = True
-    try:
-        arcpy.AddMessage(u"{0} の xml_genericAttributeSet  展開処理を開始します".format(fc))
-        
-        # v111: 進捗表示のメッセージ用に追加
-        cnt = 0
-        num = int(arcpy.GetCount_management(fc).getOutput(0))
-        
-        # v111: 全レコードの xml_genericAttributeSet  を展開したものをDataFrame に格納(メモリ対策を見直し)
-        rows = []
-        with arcpy.da.SearchCursor(fc, XMLFIELDNAME) as scur:
-            for r in scur:
-                cnt += 1
-                if (cnt == 1) or (cnt == num) or (cnt % 10000 == 1):
-                    s = u"{0}/{1}の xml_genericAttributeSet  読込処理中・・・".format(cnt, num)
-                    arcpy.AddMessage(s)                
-                xmlvalue = r[0]
-                row = calgen.createRowFromXmlfield(xmlvalue)
-                rows.append(row)
-        df = pd.DataFrame(data=rows)
-        # 後始末
-        del rows
-        
-        # フィールドの追加
-        lstFields = arcpy.ListFields(fc)
-        field_names = [f.name for f in lstFields]
-        for column in  df.columns:
-            fieldName, fieldType = column.split(":")
-            #fieldType も DATE型 などの場合はstring で扱いたいので分岐を追加する必要があります。
-            if fieldName not in field_names:
-                arcpy.AddMessage(u"{0}: フィールド を追加します".format(fieldName))
-                arcpy.AddField_management(fc, fieldName, fieldType)
-            else:
-                arcpy.AddWarning(u"{0}: フィールド はすでに存在しているので、フィールド追加の処理はスキップします".format(fieldName))
-        
-        # UpdateCursor を使って、フィールドを更新
-        update_fields = [c.split(":")[0] for c in df.columns]
-        #v112:（AddField_management  ではWarningでフィールド名をリネームして処理が継続されるため）フィールド名が変更されたものがないかの確認
-        new_lstFields = arcpy.ListFields(fc)
-        new_field_names = [f.name for f in new_lstFields]
-        blFieldsCheck = calgen.check_added_field_names(new_field_names, update_fields)
-        if blFieldsCheck:
-            if len(update_fields) > 0:           
-                arcpy.AddMessage(u"{0}: のフィールドに値を展開します".format(update_fields))
-                i = 0
-                cnt = 0
-                with arcpy.da.UpdateCursor(fc, update_fields) as cur:
-                    for r in cur:
-                        cnt += 1
-                        if (cnt == 1) or (cnt == num) or (cnt % 10000 == 1):
-                            s = u"{0}/{1}の xml_genericAttributeSet  展開処理中・・・".format(cnt, num)
-                            arcpy.AddMessage(s)
-                        r = df.values[i] # 1行を取得
-                        cur.updateRow(r) # update_fieldsに指定したものが DataFrame のカラムの並び順なのでそのまま渡す
-                        i += 1
-            else:
-                arcpy.AddWarning(u"対象フィールド が存在しないため、xml_genericAttributeSet  展開処理はスキップしました") 
-
-            # 後始末-不要になったので削除                
-        else:
-            arcpy.AddWarning(u"AddField_management の処理でフィールド名が変更されたものがあるため、xml_genericAttributeSet の展開処理はスキップしました")
-
-
-        arcpy.AddMessage(u"xml_genericAttributeSet  展開処理を終了しました")
-    except arcpy.ExecuteError:
-        arcpy.AddError(arcpy.GetMessages(2))
-        blResult = False
-    except Exception as e:
-        err = e.args[0]
-        tb = sys.exc_info()[2]
-        tbinfo = traceback.format_tb(tb)[0]
-        pymsg = "PYTHON ERRORS:\nTraceback info:\n" + tbinfo + "\nError Info:\n" + str(err)
-        arcpy.AddError(pymsg)        
-        blResult = False
-    
-    return blResult, df
+    return calgen.expandXmlfield(fc)
 
 
 def main():
@@ -149,57 +83,50 @@ def main():
 
         arcpy.env.workspace = gdb
 
+        # v114: 処理時間の計測を開始
+        instr.start("assign_landuseAttributes", gdb)
+
         # 1) LandUse_genUsage.xml をもとに、コード値ドメインと説明を作成する
-        domainName, domainDict = exattr.createDomainValues(landUse_genUsage_xml) #createDomainValues(landUse_genUsage_xml)
-        
-        # 既存のドメイン
-        domains = arcpy.Describe(gdb).domains
+        with instr.phase(u"コードリスト解析"):
+            domainName, domainDict = exattr.createDomainValues(landUse_genUsage_xml) #createDomainValues(landUse_genUsage_xml)
         
         # ドメインの説明は固定
         domainDesc = r"土地利用区分" 
-        # ドメインの作成（既存ドメインが存在する場合は処理しない）
-        if domainName not in domains:
-            #print("Creating domain " + domainName)
-            arcpy.AddMessage(u"{0}: ドメイン を作成します".format(domainName))
-            arcpy.CreateDomain_management(gdb, domainName, domainDesc, "TEXT", "CODED")
-            # 作成したドメインにコードと説明を追加
-            for code in domainDict:
-                codeDesc = domainDict[code]
-                if len(codeDesc.strip()) > 0: #v112: codeDesc  が空文字の場合への対応                
-                    arcpy.AddMessage(u"{0}: ドメイン に{1} , {2} のコードを追加します".format(domainName,code,codeDesc))
-                    arcpy.AddCodedValueToDomain_management(gdb, domainName, code, codeDesc)
-                else:
-                    arcpy.AddWarning(u"{0}: ドメイン に追加する{1} , にコード値の説明がないので処理をスキップします".format(domainNamecode,code))               
-                #print("Add code " code)
-        else:
-            arcpy.AddWarning(u"{0}: ドメイン はすでに存在しているので、ドメイン 作成の処理はスキップします".format(domainName))
+        # v114: ドメインの作成とコードの追加を一括で実行（既存ドメインが存在する場合は、ないコードのみを追加）
+        with instr.phase(u"ドメイン作成") as p:
+            p.rows += dombld.buildCodedValueDomain(gdb, domainName, domainDesc, domainDict)
 
         # 2) フィールドの展開
         for fc in FCNAMES:
             if arcpy.Exists(fc):
                 # 1) xml_genericAttributeSet をフィールドに展開する
                 if int(arcpy.GetCount_management(fc)[0]) > 0:
-                    bl, df = convertXmlfieldToFields(fc)
+                    bl, columns, update_fields = convertXmlfieldToFields(fc)
                     
                     # 3) ドメインを lod0_LandUse フィーチャクラスのフィールドに適用（上記で追加したフィールド）
+                    # v114: キーの name ではなく、展開処理で決めたフィールド名を使用
                     fieldNames = [f.name for f in arcpy.ListFields(fc)]
-                    for column in df.columns:
-                        fieldName, fieldType = column.split(":")
+                    for fieldName in update_fields:
                         if fieldName in fieldNames:
                             # v113:フィールド名に"土地利用区分" を含む "gen_土地利用区分_XXXX" などのフィールドのみに土地利用のコード値ドメインを適用
                             if domainDesc in fieldName:
                                 arcpy.AddMessage(u"{0} の{1} フィールドに{2} ドメインを適用します".format(fc, fieldName, domainName))
-                                arcpy.AssignDomainToField_management(fc, fieldName, domainName)
+                                with instr.phase(u"ドメイン適用") as p:
+                                    arcpy.AssignDomainToField_management(fc, fieldName, domainName)
+                                    p.rows += 1
                             else:
                                 arcpy.AddWarning(u"{0} の{1} フィールドは土地利用区分ではないため、{2} ドメインの適用をスキップします".format(fc, fieldName, domainName))
                         else:
                             arcpy.AddWarning(u"{0} に{1} フィールドが定義されていないため、ドメインの適用をスキップします".format(fc, fieldName))
                     
                     # 後始末
-                    del df
+                    del columns, update_fields
                 else:
                     arcpy.AddWarning(u"{0} の レコードがないため処理をスキップします".format(fc))
 
+        # v114: 段階ごとの処理時間を GDB と同じフォルダーに出力
+        instr.finish()
+
         arcpy.AddMessage(u"処理終了：")
     except arcpy.ExecuteError:
         arcpy.AddError(arcpy.GetMessages(2))
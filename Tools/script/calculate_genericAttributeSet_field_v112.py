@@ -13,25 +13,94 @@ Purpose     :ワークベンチを使って、3D都市モデルの汎用属性(g
              ・展開するxml_genericAttributeSet に、gen_1/2500図郭 などがある場合の対応を追加
              ・例外発生時のtraceback を追加
              ・xml_genericAttributeSet の展開前に、AddField_management で追加したフィールド名の変更されていないか確認処理を追加
+            v112 → v113 の更新内容
+             ・展開処理で DataFrame を使わず、OBJECTID に対応付けたカラムごとのリストに値を保持して書き込むように変更（大量レコード時の高速化）
+             ・読込、展開の処理件数/秒を表示
+             ・メモリ上限を指定して、上限を超えた展開結果をディスク(SQLite)に書き出す2パスの省メモリモードを追加
+             ・XMLの展開をプロセスプールで並列処理するパイプラインを追加（段階ごとの処理件数/秒を表示）
+             ・同じXML、同じ name の並びの展開結果を再利用するキャッシュを追加（ヒット率を表示）
+             ・展開処理の進捗をGDBと同じフォルダーに記録し、中断した処理の再開と完了したフィーチャクラスのスキップに対応（4番目のパラメータで最初からやり直し）
+               （件数、最大の OBJECTID、先頭のレコードの値、追加したフィールドが記録と一致しない場合は記録を破棄して最初から処理）
+             ・段階ごとの処理時間、件数、ピークメモリを計測して GDB と同じフォルダーにJSONで出力（進捗表示に件数/秒と残り時間を追加）
+             ・追加するフィールド名を schema_planner で事前に確定し（予約語、重複する名前の付番）、フィーチャクラスごとに AddFields_management の1回の呼び出しで追加
+               （AddField_management によるフィールド名の変更が起こらないため、追加後の確認処理 check_added_field_names を削除）
+             ・展開する値を集計して、値が収まる最小の型（SHORT, LONG）、文字列の長さでフィールドを追加し、値の種類が少ない文字列は
+               コード値ドメインにしてコードを格納するモードを追加（5番目のパラメータで指定。集計結果はGDBと同じフォルダーにJSONで出力）
+             ・フィールドを追加せずに、展開した値を1つの縦持ちのテーブル（フィーチャクラス名, OBJECTID, gml_id, 属性名, 型, 値）に
+               格納するモードを追加（6番目のパラメータで LONG を指定。generic_attribute_table で属性を指定して横持ちに変換できる）
 Author      :
 Copyright   :
 Created     :2021/03/24
-Last Updated:2021/06/30
+Last Updated:2026/10/18
 ArcGIS Version: ArcGIS Pro 2.6 以上
 """
 
 import os
+import sys
+import time
+import json
+import sqlite3
+import tempfile
+import hashlib
+import itertools
+import collections
+import multiprocessing
+import concurrent.futures
 import arcpy
 import xml.etree.ElementTree as et
-import pandas as pd
 import traceback #v112
 
+# v113: 展開処理の進捗の記録
+import expand_journal_v100 as expjnl
+# v113: 処理時間の計測
+import instrumentation_v100 as instr
+# v113: 追加するフィールドの計画と一括追加
+import schema_planner_v100 as schplan
+# v113: 展開する値の集計とフィールドの型の最適化
+import column_profiler_v100 as colprof
+# v113: 縦持ちのテーブルへの格納
+import generic_attribute_table_v100 as gattbl
+
 XMLFIELDNAME = "xml_genericAttributeSet"
 
 #適用するフィーチャークラス名 の一覧を定義
 #FGDB内での対象フィーチャクラスを追加する場合、ここにフィーチャクラス名を追加すると処理対象になります。
 FCNAMES = ["lod0_Building", "lod1_Building", "lod2_Building", "lod0_LandUse", "lod0_GenericCityObject", "lod1_WaterBody"] #"lod0_WaterBody", 
 
+# v113: 進捗表示のメッセージを出力する間隔（件数）
+PROGRESS_INTERVAL = 10000
+
+# v113: 省メモリモードで展開した値をメモリ上に保持する上限(MB)。0 の場合は全件をメモリ上に保持する
+#       ツールの2番目のパラメータで指定することもできます。
+MEMORY_BUDGET_MB = 0
+# v113: 省メモリモードでの1行あたりのオーバーヘッドの推定値(バイト)と、ディスクへ書き出す単位（件数）
+SPILL_ROW_OVERHEAD = 256
+SPILL_BATCH_SIZE = 5000
+
+# v113: XMLの展開を並列処理するワーカープロセス数。1 以下の場合は並列処理しない
+#       ツールの3番目のパラメータで指定することもできます。
+PARSE_WORKERS = 0
+# v113: 並列処理でワーカーに渡す1バッチの件数と、処理中のバッチ数の上限
+PIPELINE_BATCH_SIZE = 2000
+PIPELINE_QUEUE_SIZE = 8
+
+# v113: 展開結果のキャッシュの件数上限（XMLごと、name の並びごと）。0 の場合はキャッシュしない
+PARSE_CACHE_ROWS = 10000
+PARSE_CACHE_SHAPES = 1000
+
+# v113: 展開する値を集計して、フィールドの型、長さを値が収まる最小のものにし、値の種類が少ない文字列をコード値ドメインにする場合は True
+#       ツールの5番目のパラメータで指定することもできます。（GDBごとにスキーマが変わるため、GDBのマージをする場合は使用しないこと）
+NARROW_FIELD_TYPES = False
+
+# v113: 展開した値の格納方法。WIDE: フィールドを追加して格納、LONG: 縦持ちのテーブル（generic_attribute_table）に格納
+#       ツールの6番目のパラメータで指定することもできます。
+STORAGE_WIDE = "WIDE"
+STORAGE_LONG = "LONG"
+STORAGE_MODE = STORAGE_WIDE
+
+# v113: 進捗を記録する間隔（件数）。この件数ごとにカーソルを閉じて書き込みを確定する
+CHECKPOINT_INTERVAL = 50000
+
 def fieldChecker(names):
     '''
     同じname がある場合に2つ目以降は "name_x" のフィールドにして重複しない形式で返却（x=2から付番されます） 
@@ -55,110 +124,527 @@ def sanitize_field_name(field_name):
     new_field_name = field_name.replace("/", "_").replace(":", "_").replace(".", "_").replace("-", "_")
     return new_field_name
 
+def createKeysFromShape(shape):
+    '''
+    v113: (name, type) の並びから、重複を除いて使用できる文字に置換した 'name:type' のキーのリストを作成
+          仕様上入ってこないはずの gen_FID は None にする
+    '''
+    names = [name for name, fieldType in shape]
+    new_names = fieldChecker(names)
+    keys = []
+    for new_name, (name, fieldType) in zip(new_names, shape):
+        if new_name != "gen_FID":
+            keys.append(sanitize_field_name(new_name) + ":{0}".format(fieldType)) # v112:gen_1/2500図郭などへの対応
+        else:
+            keys.append(None)
+    return keys
+
+class ParseCache(object):
+    '''
+    v113: xml_genericAttributeSet の展開結果のキャッシュ（件数上限を超えた場合は最も古く使われたものから削除）
+          1段目: XMLのハッシュ値 → 展開したディクショナリ
+          2段目: (name, type) の並び → 'name:type' のキーのリスト
+    '''
+    def __init__(self, max_rows, max_shapes):
+        self.max_rows = max_rows
+        self.max_shapes = max_shapes
+        self.rows = collections.OrderedDict()
+        self.shapes = collections.OrderedDict()
+        self.resetStats()
+
+    def resetStats(self):
+        self.row_hits = 0
+        self.row_misses = 0
+        self.shape_hits = 0
+        self.shape_misses = 0
+
+    def getStats(self):
+        return (self.row_hits, self.row_misses, self.shape_hits, self.shape_misses)
+
+    def getKeys(self, shape):
+        keys = self.shapes.get(shape)
+        if keys is not None:
+            self.shapes.move_to_end(shape)
+            self.shape_hits += 1
+            return keys
+        self.shape_misses += 1
+        keys = createKeysFromShape(shape)
+        if self.max_shapes > 0:
+            self.shapes[shape] = keys
+            if len(self.shapes) > self.max_shapes:
+                self.shapes.popitem(last=False)
+        return keys
+
+    def getRow(self, field_value):
+        digest = None
+        if self.max_rows > 0:
+            digest = hashlib.blake2b(field_value.encode("utf-8"), digest_size=16).digest()
+            row = self.rows.get(digest)
+            if row is not None:
+                self.rows.move_to_end(digest)
+                self.row_hits += 1
+                return row
+            self.row_misses += 1
+        root = et.fromstring(field_value)
+        shape = tuple((c.attrib['name'], c.attrib["type"]) for c in root)
+        keys = self.getKeys(shape)
+        row = {}
+        for key, c in zip(keys, root):
+            if key is not None:
+                row[key] = c.text
+        root.clear()
+        if digest is not None:
+            self.rows[digest] = row
+            if len(self.rows) > self.max_rows:
+                self.rows.popitem(last=False)
+        return row
+
+# v113: 展開結果のキャッシュ（並列処理の場合はワーカープロセスごとに保持）
+parse_cache = ParseCache(PARSE_CACHE_ROWS, PARSE_CACHE_SHAPES)
+
 def createRowFromXmlfield(field_value):
     '''
     xml_genericAttributeSet に格納されたXMLから'name:type' をキーにしたディクショナリを作成
     v111:メモリ対策の見直し
         :仕様上入ってこないはず展開を除外するフィールド["gen_FID:TEXT"]
+    v113:同じXML、同じ name の並びの展開結果は parse_cache から取得（返却するディクショナリは変更しないこと）
     '''
-    root = et.fromstring(field_value)
-    names = [c.attrib['name'] for c in root]
-    new_names = fieldChecker(names)
-    row_dict = {}
+    return parse_cache.getRow(field_value)
+
+def iterParsedRows(fc, num, where_clause=None):
+    '''
+    v113: SearchCursor で xml_genericAttributeSet を読み込み、(OBJECTID, 展開したディクショナリ) を順に返却
+          カーソル読込、XML解析の処理時間はそれぞれの段階に加算
+    '''
+    read_phase = instr.phase(u"カーソル読込")
+    parse_phase = instr.phase(u"XML解析")
+    cnt = 0
+    with arcpy.da.SearchCursor(fc, ["OID@", XMLFIELDNAME], where_clause) as scur:
+        it = iter(scur)
+        while True:
+            start = time.time()
+            r = next(it, None)
+            read_end = time.time()
+            if r is None:
+                break
+            read_phase.add(read_end - start, 1)
+            cnt += 1
+            instr.progress(u"xml_genericAttributeSet  読込", cnt, num)
+            row = createRowFromXmlfield(r[1])
+            parse_phase.add(time.time() - read_end, 1)
+            yield r[0], row
+
+def parseXmlBatch(batch):
+    '''
+    v113: 並列処理のワーカープロセスで実行する処理。(OBJECTID, XML) のリストを展開して、展開結果と処理時間、キャッシュのヒット数を返却
+    '''
+    start = time.time()
+    parse_cache.resetStats()
+    rows = [(oid, createRowFromXmlfield(xmlvalue)) for oid, xmlvalue in batch]
+    return rows, time.time() - start, parse_cache.getStats()
+
+def setMultiprocessingExecutable():
+    '''
+    v113: ArcGIS Pro から実行する場合は sys.executable が ArcGISPro.exe になるので、ワーカープロセスは python.exe で起動する
+    '''
+    exe = os.path.join(sys.exec_prefix, "python.exe")
+    if os.path.exists(exe):
+        multiprocessing.set_executable(exe)
+
+def iterParsedRowsParallel(fc, num, workers, stats, where_clause=None):
+    '''
+    v113: 読込 → 展開（プロセスプール） → 格納 のパイプラインで、(OBJECTID, 展開したディクショナリ) を読込順に返却
+          読込は PIPELINE_BATCH_SIZE 件ずつのバッチにしてワーカーに渡し、処理中のバッチ数は PIPELINE_QUEUE_SIZE までに制限する
+          stats には各段階の処理時間(秒)を加算する
+    '''
+    setMultiprocessingExecutable()
+    pending = collections.deque()
+    cnt = 0
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        with arcpy.da.SearchCursor(fc, ["OID@", XMLFIELDNAME], where_clause) as scur:
+            it = iter(scur)
+            while True:
+                start = time.time()
+                batch = [(r[0], r[1]) for r in itertools.islice(it, PIPELINE_BATCH_SIZE)]
+                stats["read"] += time.time() - start
+                if len(batch) > 0:
+                    pending.append(executor.submit(parseXmlBatch, batch))
+                    prev = cnt
+                    cnt += len(batch)
+                    force = (prev == 0) or (cnt >= num) or (cnt // PROGRESS_INTERVAL != prev // PROGRESS_INTERVAL)
+                    instr.progress(u"xml_genericAttributeSet  読込", cnt, num, force)
+                # キューが一杯、または読込が終わった場合は、読込順に展開結果を受け取る
+                while len(pending) > 0 and (len(pending) >= PIPELINE_QUEUE_SIZE or len(batch) == 0):
+                    start = time.time()
+                    rows, parse_time, cache_stats = pending.popleft().result()
+                    stats["wait"] += time.time() - start
+                    stats["parse"] += parse_time
+                    stats["cache"] = [a + b for a, b in zip(stats["cache"], cache_stats)]
+                    for row in rows:
+                        yield row
+                if len(batch) == 0:
+                    break
+
+def collectRowsToColumns(parsed_rows, num):
+    '''
+    v113: 展開した値を、'name:type' をキーにしたカラムごとのリストに格納する
+          リストの位置は oid_index で OBJECTID と対応付けるので、書き込み時に1行分の値を O(1) で取り出せる
+    '''
+    oid_index = {}
+    columns = {}
+    size = max(num, 1)
     i = 0
-    for c in root:
-        #key = new_names[i] + ":{0}".format(c.attrib["type"]) # key を name:type の形式にする
-        key = sanitize_field_name(new_names[i]) + ":{0}".format(c.attrib["type"]) # v112:gen_1/2500図郭などへの対応
-        if new_names[i] != "gen_FID" :
-            row_dict[key] = c.text
+    for oid, row in parsed_rows:
+        # GetCount 以降にレコードが増えていた場合はカラムのリストを拡張
+        if i >= size:
+            grow = size
+            size += grow
+            for col in columns.values():
+                col.extend([None] * grow)
+        oid_index[oid] = i
+        for key in row:
+            col = columns.get(key)
+            if col is None:
+                col = [None] * size
+                columns[key] = col # 初めて出現した順にカラムを並べる（DataFrame のカラム順と同じ）
+            col[i] = row[key]
         i += 1
-        c.clear()
-    root.clear()
-    del names, new_names
-    return row_dict
+    return oid_index, columns
 
-def check_added_field_names(new_field_names, update_field_names):
+def addFieldsFromColumns(fc, column_keys, schema_plan=None, profiler=None):
     '''
-    v112: DataFrameのcolumns と、arcpy.AddField　で追加されたフィールド名が全て一致しているかをチェック
-    （arcpy.AddField_management ではWarningでフィールド名をリネームして処理が継続されるため）
+    v113: 'name:type' のキーからフィールドを追加し、値を展開するフィールド名の一覧（キーと同じ順）を返却
+          フィールド名は schema_planner で追加前に確定し（予約語、重複する名前は付番）、AddFields_management の1回の呼び出しで追加する
+          schema_plan を指定した場合は、他のフィーチャクラスと同じキーを同じフィールド名にする
+          profiler（column_profiler の ColumnProfiler）を指定した場合は、集計結果からフィールドの型、長さ、コード値ドメインを決める
     '''
-    blResult = True
-    for update_field_name in update_field_names:
-        if update_field_name not in new_field_names:
-            blResult = False
+    if profiler is None:
+        return schplan.planAndAddFields(fc, column_keys, schema_plan)
+    if schema_plan is None:
+        schema_plan = schplan.SchemaPlan([fc], arcpy.env.workspace)
+    specs = profiler.createFieldSpecs(column_keys)
+    update_fields, new_fields = schema_plan.planFields(fc, column_keys)
+    specs = colprof.buildDomains(schema_plan.workspace or arcpy.env.workspace, update_fields, new_fields, column_keys, specs)
+    schema_plan.applyFields(fc, new_fields)
+    profiler.report(fc, column_keys, specs, update_fields)
+    colprof.profile_results[fc] = profiler.toDict(column_keys, specs, update_fields)
+    return update_fields
+
+def createColumnsGetter(oid_index, columns, column_keys):
+    '''
+    v113: カラムごとのリストから、OBJECTID に対応する1行分の値のリストを返却する関数を作成
+    '''
+    if all(key in columns for key in column_keys):
+        cols = [columns[key] for key in column_keys]
+        def getRow(oid):
+            i = oid_index.get(oid)
+            if i is None:
+                return None
+            return [col[i] for col in cols]
+    else:
+        # 再開時は、記録したキーのうち残りのレコードに値がないものは None にする
+        cols = [columns.get(key) for key in column_keys]
+        def getRow(oid):
+            i = oid_index.get(oid)
+            if i is None:
+                return None
+            return [col[i] if col is not None else None for col in cols]
+    return getRow
+
+class SpillStore(object):
+    '''
+    v113: 展開した1行分のディクショナリを OBJECTID をキーに保持するストア
+          メモリ上の推定サイズが memory_budget(バイト) を超えた分は、一時フォルダの SQLite ファイルに書き出す
+    '''
+    def __init__(self, memory_budget):
+        self.memory_budget = memory_budget
+        self.used = 0
+        self.rows = {}
+        self.pending = []
+        self.spilled = 0
+        self.conn = None
+        self.path = None
+
+    def put(self, oid, row):
+        if self.conn is None:
+            size = SPILL_ROW_OVERHEAD
+            for key in row:
+                value = row[key]
+                size += len(key) + (len(value) if value else 0)
+            if self.used + size <= self.memory_budget:
+                self.rows[oid] = row
+                self.used += size
+                return
+            self.open()
+        self.pending.append((oid, json.dumps(row, ensure_ascii=False)))
+        self.spilled += 1
+        if len(self.pending) >= SPILL_BATCH_SIZE:
+            self.flush()
+
+    def open(self):
+        fd, self.path = tempfile.mkstemp(prefix="genericAttributeSet_", suffix=".sqlite")
+        os.close(fd)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute("PRAGMA journal_mode=OFF")
+        self.conn.execute("PRAGMA synchronous=OFF")
+        self.conn.execute("CREATE TABLE rows (oid INTEGER PRIMARY KEY, data TEXT)")
+
+    def flush(self):
+        if self.conn is not None and len(self.pending) > 0:
+            self.conn.executemany("INSERT OR REPLACE INTO rows VALUES (?, ?)", self.pending)
+            self.conn.commit()
+            self.pending = []
+
+    def get(self, oid):
+        row = self.rows.get(oid)
+        if row is None and self.conn is not None:
+            r = self.conn.execute("SELECT data FROM rows WHERE oid = ?", (oid,)).fetchone()
+            if r is not None:
+                row = json.loads(r[0])
+        return row
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+        if self.path is not None and os.path.exists(self.path):
+            os.remove(self.path)
+        self.path = None
+        self.rows = {}
+
+def collectRowsToStore(parsed_rows, store):
+    '''
+    v113: 1パス目。展開した値から 'name:type' のキーの和集合（スキーマ）を求め、
+          展開した値は SpillStore に格納する（メモリ上限を超えた分はディスクに書き出す）
+    '''
+    column_keys = {}
+    cnt = 0
+    for oid, row in parsed_rows:
+        cnt += 1
+        for key in row:
+            if key not in column_keys:
+                column_keys[key] = None # 初めて出現した順にカラムを並べる
+        store.put(oid, row)
+    store.flush()
+    return list(column_keys.keys()), cnt
+
+def createStoreGetter(store, column_keys):
+    '''
+    v113: SpillStore から、OBJECTID に対応する1行分の値のリストを返却する関数を作成
+    '''
+    def getRow(oid):
+        row = store.get(oid)
+        if row is None:
+            return None
+        return [row.get(key) for key in column_keys]
+    return getRow
+
+def createOidWhereClause(fc, last_oid):
+    '''
+    v113: 指定した OBJECTID より後のレコードを対象にする where 句を作成（last_oid が None の場合は None）
+    '''
+    if last_oid is None:
+        return None
+    oid_field = arcpy.Describe(fc).OIDFieldName
+    return "{0} > {1}".format(arcpy.AddFieldDelimiters(fc, oid_field), last_oid)
+
+def writeRowsToFields(fc, update_fields, getRow, num, journal=None, flush=None):
+    '''
+    v113: getRow で OBJECTID に対応する1行分の値を取り出して UpdateCursor で書き込む
+          journal を指定した場合は、OBJECTID 順に CHECKPOINT_INTERVAL 件ごとにカーソルを閉じて、最後の OBJECTID を記録する
+          （flush を指定した場合は、記録する前に呼び出す）
+    '''
+    cnt = 0
+    if journal is None:
+        with arcpy.da.UpdateCursor(fc, ["OID@"] + update_fields) as cur:
+            for r in cur:
+                values = getRow(r[0])
+                if values is None: # 読込後に追加されたレコードは対象外
+                    continue
+                cnt += 1
+                instr.progress(u"xml_genericAttributeSet  展開", cnt, num)
+                cur.updateRow([r[0]] + values)
+        return cnt
+
+    oid_field = arcpy.Describe(fc).OIDFieldName
+    sql_clause = (None, "ORDER BY {0}".format(oid_field))
+    last_oid = journal.getLastOid(fc)
+    while True:
+        visited = 0
+        where_clause = createOidWhereClause(fc, last_oid)
+        with arcpy.da.UpdateCursor(fc, ["OID@"] + update_fields, where_clause, sql_clause=sql_clause) as cur:
+            for r in cur:
+                visited += 1
+                last_oid = r[0]
+                values = getRow(r[0])
+                if values is not None: # 読込後に追加されたレコードは対象外
+                    cnt += 1
+                    instr.progress(u"xml_genericAttributeSet  展開", cnt, num)
+                    cur.updateRow([r[0]] + values)
+                if visited >= CHECKPOINT_INTERVAL:
+                    break
+        # カーソルを閉じて書き込みを確定してから記録
+        if visited > 0:
+            if flush is not None:
+                flush()
+            journal.commit(fc, last_oid)
+        if visited < CHECKPOINT_INTERVAL:
             break
-    return blResult
+    return cnt
 
-def convertXmlfieldToFields(fc):
+def expandXmlfield(fc, memory_budget_mb=None, workers=None, journal=None, schema_plan=None, narrow=None):
     '''
-    指定フィーチャクラス の xml_genericAttributeSet をフラットに展開する処理
-    v111:メモリ対策の見直し、進捗表示のメッセージを追加
+    指定フィーチャクラス の xml_genericAttributeSet をフラットに展開し、処理結果と展開した 'name:type' のキーの一覧、
+    値を展開したフィールド名の一覧（キーと同じ順）を返却
+    v113: DataFrame を使わず、カラムごとのリストに値を保持して1行ずつ書き込むように変更（df.values[i] の都度の配列作成を廃止）
+          読込、書込それぞれの件数/秒を表示
+          memory_budget_mb(MB) を指定した場合は、メモリ上限を超えた分をディスクに書き出す2パスの省メモリモードで処理
+          workers を指定した場合は、XMLの展開をワーカープロセスで並列に処理（結果は1プロセスでの処理と同じ）
+          journal を指定した場合は、進捗を記録して、中断された処理は記録した OBJECTID の次から再開
+          schema_plan（schema_planner の SchemaPlan）を指定した場合は、その計画でフィールド名を確定して追加
+          narrow が True の場合は、展開する値を集計してフィールドの型、長さを最小にし、値の種類が少ない文字列はコード値ドメインにする
     '''
     blResult = True
+    column_keys = []
+    update_fields = []
+    store = None
+    if memory_budget_mb is None:
+        memory_budget_mb = MEMORY_BUDGET_MB
+    if workers is None:
+        workers = PARSE_WORKERS
+    if narrow is None:
+        narrow = NARROW_FIELD_TYPES
     try:
         arcpy.AddMessage(u"{0} の xml_genericAttributeSet  展開処理を開始します".format(fc))
-        
+
         # v111: 進捗表示のメッセージ用に追加
-        cnt = 0
         num = int(arcpy.GetCount_management(fc).getOutput(0))
-        
-        # v111: 全レコードの xml_genericAttributeSet　を展開したものをDataFrame に格納(メモリ対策を見直し)
-        rows = []
-        with arcpy.da.SearchCursor(fc, XMLFIELDNAME) as scur:
-            for r in scur:
-                cnt += 1
-                if (cnt == 1) or (cnt == num) or (cnt % 10000 == 1):
-                    s = u"{0}/{1}の xml_genericAttributeSet  読込処理中・・・".format(cnt, num)
-                    arcpy.AddMessage(s)                
-                xmlvalue = r[0]
-                row = createRowFromXmlfield(xmlvalue)
-                rows.append(row)
-        df = pd.DataFrame(data=rows)
-        # 後始末
-        del rows
-        
+
+        # v113: 中断された処理の再開時は、記録したフィールドを使い、書き込みが完了していないレコードのみ読み込む
+        plan_keys = None
+        where_clause = None
+        if journal is not None:
+            plan_keys = journal.getColumns(fc)
+            if plan_keys is not None:
+                last_oid = journal.getLastOid(fc)
+                where_clause = createOidWhereClause(fc, last_oid)
+                arcpy.AddMessage(u"{0} の前回中断した処理を再開します（OBJECTID: {1} の次から）".format(fc, last_oid))
+
+        start = time.time()
+        stats = {"read": 0.0, "parse": 0.0, "wait": 0.0, "cache": [0, 0, 0, 0]}
+        parse_cache.resetStats()
+        if workers > 1:
+            parsed_rows = iterParsedRowsParallel(fc, num, workers, stats, where_clause)
+        else:
+            parsed_rows = iterParsedRows(fc, num, where_clause)
+        # v113: 展開する値を読込と同時に集計
+        profiler = None
+        if narrow:
+            profiler = colprof.ColumnProfiler()
+            parsed_rows = profiler.wrap(parsed_rows)
+        if memory_budget_mb > 0:
+            # v113: 省メモリモード。1パス目でスキーマを求め、展開した値はメモリ上限まではメモリ、超えた分はディスクに格納
+            store = SpillStore(memory_budget_mb * 1024 * 1024)
+            column_keys, cnt = collectRowsToStore(parsed_rows, store)
+            column_keys = mergeColumnKeys(plan_keys, column_keys)
+            getRow = createStoreGetter(store, column_keys)
+            if store.spilled > 0:
+                arcpy.AddMessage(u"メモリ上限 {0} MB を超えた {1} 件をディスクに書き出しました".format(memory_budget_mb, store.spilled))
+        else:
+            # v113: 全レコードの xml_genericAttributeSet を展開したものをカラムごとのリストに格納
+            oid_index, columns = collectRowsToColumns(parsed_rows, num)
+            column_keys = mergeColumnKeys(plan_keys, list(columns.keys()))
+            getRow = createColumnsGetter(oid_index, columns, column_keys)
+            cnt = len(oid_index)
+        elapsed = time.time() - start
+        reportThroughput(u"xml_genericAttributeSet  読込", cnt, elapsed)
+        if workers > 1:
+            # v113: 並列処理の場合は段階ごとの処理件数/秒を表示（XML解析はワーカー数で割った時間で計算）
+            instr.phase(u"カーソル読込").add(stats["read"], cnt)
+            instr.phase(u"XML解析").add(stats["parse"] / workers, cnt)
+            reportThroughput(u"  読込(SearchCursor)", cnt, stats["read"])
+            reportThroughput(u"  XML解析(ワーカー {0} プロセス)".format(workers), cnt, stats["parse"] / workers)
+            reportThroughput(u"  格納", cnt, elapsed - stats["read"] - stats["wait"])
+            arcpy.AddMessage(u"  展開結果の待ち時間: {0:.1f} 秒".format(stats["wait"]))
+            reportCacheStats(stats["cache"])
+        else:
+            reportCacheStats(parse_cache.getStats())
+
         # フィールドの追加
-        lstFields = arcpy.ListFields(fc)
-        field_names = [f.name for f in lstFields]
-        for column in  df.columns:
-            fieldName, fieldType = column.split(":")
-            #fieldType も DATE型 などの場合はstring で扱いたいので分岐を追加する必要があります。
-            if fieldName not in field_names:
-                arcpy.AddMessage(u"{0}: フィールド を追加します".format(fieldName))
-                arcpy.AddField_management(fc, fieldName, fieldType)
-            else:
-                arcpy.AddWarning(u"{0}: フィールド はすでに存在しているので、フィールド追加の処理はスキップします".format(fieldName))
-        
-        # UpdateCursor を使って、フィールドを更新
-        update_fields = [c.split(":")[0] for c in df.columns]
-        #v112:（AddField_management　ではWarningでフィールド名をリネームして処理が継続されるため）フィールド名が変更されたものがないかの確認
-        new_lstFields = arcpy.ListFields(fc)
-        new_field_names = [f.name for f in new_lstFields]
-        blFieldsCheck = check_added_field_names(new_field_names, update_fields)
-        if blFieldsCheck:
-            if len(update_fields) > 0:
-                arcpy.AddMessage(u"{0}: のフィールドに値を展開します".format(update_fields))
-                i = 0
-                cnt = 0
-                with arcpy.da.UpdateCursor(fc, update_fields) as cur:
-                    for r in cur:
-                        cnt += 1
-                        if (cnt == 1) or (cnt == num) or (cnt % 10000 == 1):
-                            s = u"{0}/{1}の xml_genericAttributeSet  展開処理中・・・".format(cnt, num)
-                            arcpy.AddMessage(s)
-                        r = df.values[i] # 1行を取得
-                        cur.updateRow(r) # update_fieldsに指定したものが DataFrame のカラムの並び順なのでそのまま渡す
-                        i += 1
-            else:
-                arcpy.AddWarning(u"対象フィールド が存在しないため、xml_genericAttributeSet  展開処理はスキップしました")        
+        with instr.phase(u"AddField"):
+            update_fields = addFieldsFromColumns(fc, column_keys, schema_plan, profiler)
+            # v113: コード値ドメインにしたフィールドは、値をコードに変換して書き込む（ドメインにない値はコードを追加）
+            encoder = colprof.DomainEncoder(arcpy.env.workspace, fc, update_fields)
+            getRow = encoder.wrap(getRow)
+        if len(update_fields) > 0:
+            arcpy.AddMessage(u"{0}: のフィールドに値を展開します".format(update_fields))
+            start = time.time()
+            if journal is not None:
+                journal.start(fc, column_keys, update_fields, expjnl.getFingerprint(fc, XMLFIELDNAME))
+            with instr.phase(u"カーソル書込") as p:
+                cnt = writeRowsToFields(fc, update_fields, getRow, num, journal, encoder.flush)
+                p.rows += cnt
+            encoder.flush()
+            encoder.report(fc)
+            reportThroughput(u"xml_genericAttributeSet  展開", cnt, time.time() - start)
+            if journal is not None:
+                journal.complete(fc)
         else:
-            arcpy.AddWarning(u"AddField_management の処理でフィールド名が変更されたものがあるため、xml_genericAttributeSet の展開処理はスキップしました")
+            arcpy.AddWarning(u"対象フィールド が存在しないため、xml_genericAttributeSet  展開処理はスキップしました")
 
-        
+        arcpy.AddMessage(u"xml_genericAttributeSet  展開処理を終了しました")
+    except arcpy.ExecuteError:
+        arcpy.AddError(arcpy.GetMessages(2))
+        blResult = False
+    except Exception as e:
+        err = e.args[0]
+        tb = sys.exc_info()[2]
+        tbinfo = traceback.format_tb(tb)[0]
+        pymsg = "PYTHON ERRORS:\nTraceback info:\n" + tbinfo + "\nError Info:\n" + str(err)
+        arcpy.AddError(pymsg)
+        blResult = False
+    finally:
         # 後始末
-        del df
+        if store is not None:
+            store.close()
 
-        arcpy.AddMessage(u"xml_genericAttributeSet  展開処理を終了しました")
+    return blResult, column_keys, update_fields
+
+def expandXmlfieldToTable(fc, writer, workers=None):
+    '''
+    v113: 指定フィーチャクラス の xml_genericAttributeSet を展開し、値がある属性を writer（generic_attribute_table の LongTableWriter）の
+          縦持ちのテーブルに格納して処理結果を返却。フィールドは追加せず、フィーチャクラスの既存の行は置き換える
+    '''
+    blResult = True
+    if workers is None:
+        workers = PARSE_WORKERS
+    try:
+        arcpy.AddMessage(u"{0} の xml_genericAttributeSet を {1} テーブルに展開します".format(fc, os.path.basename(writer.table)))
+        num = int(arcpy.GetCount_management(fc).getOutput(0))
+        id_field = gattbl.getIdField(fc)
+        if id_field is None:
+            arcpy.AddWarning(u"{0} に *{1} フィールドがないため、gml_id は空で格納します".format(fc, gattbl.GML_ID_FIELD_SUFFIX))
+        with instr.phase(u"gml_id 読込") as p:
+            gml_ids = gattbl.readGmlIds(fc, id_field)
+            p.rows += len(gml_ids)
+
+        start = time.time()
+        stats = {"read": 0.0, "parse": 0.0, "wait": 0.0, "cache": [0, 0, 0, 0]}
+        parse_cache.resetStats()
+        if workers > 1:
+            parsed_rows = iterParsedRowsParallel(fc, num, workers, stats)
+        else:
+            parsed_rows = iterParsedRows(fc, num)
+        records = ((oid, gml_ids.get(oid), row) for oid, row in parsed_rows)
+        features, values = writer.writeFeatureClass(fc, records)
+        reportThroughput(u"xml_genericAttributeSet  展開", features, time.time() - start)
+        if workers > 1:
+            instr.phase(u"カーソル読込").add(stats["read"], features)
+            instr.phase(u"XML解析").add(stats["parse"] / workers, features)
+            reportCacheStats(stats["cache"])
+        else:
+            reportCacheStats(parse_cache.getStats())
+        arcpy.AddMessage(u"{0}: {1} 件のフィーチャの {2} 件の値を格納しました".format(fc, features, values))
     except arcpy.ExecuteError:
         arcpy.AddError(arcpy.GetMessages(2))
         blResult = False
@@ -169,7 +655,43 @@ def convertXmlfieldToFields(fc):
         pymsg = "PYTHON ERRORS:\nTraceback info:\n" + tbinfo + "\nError Info:\n" + str(err)
         arcpy.AddError(pymsg)
         blResult = False
-    
+
+    return blResult
+
+def mergeColumnKeys(plan_keys, column_keys):
+    '''
+    v113: 再開時は記録した 'name:type' のキーの並びを使い、記録にないキーは後ろに追加
+    '''
+    if plan_keys is None:
+        return column_keys
+    return list(plan_keys) + [key for key in column_keys if key not in plan_keys]
+
+def reportThroughput(label, cnt, elapsed):
+    '''
+    v113: 処理件数と経過時間から 件/秒 を表示
+    '''
+    rate = cnt / elapsed if elapsed > 0 else 0.0
+    arcpy.AddMessage(u"{0}: {1} 件 / {2:.1f} 秒 ({3:.0f} 件/秒)".format(label, cnt, elapsed, rate))
+
+def reportCacheStats(cache_stats):
+    '''
+    v113: 展開結果のキャッシュのヒット率を表示
+    '''
+    row_hits, row_misses, shape_hits, shape_misses = cache_stats
+    row_total = row_hits + row_misses
+    shape_total = shape_hits + shape_misses
+    if row_total > 0:
+        arcpy.AddMessage(u"  キャッシュ(XML): {0}/{1} 件ヒット ({2:.1f}%)".format(row_hits, row_total, 100.0 * row_hits / row_total))
+    if shape_total > 0:
+        arcpy.AddMessage(u"  キャッシュ(name の並び): {0}/{1} 件ヒット ({2:.1f}%)".format(shape_hits, shape_total, 100.0 * shape_hits / shape_total))
+
+def convertXmlfieldToFields(fc, memory_budget_mb=None, workers=None, journal=None, schema_plan=None, narrow=None):
+    '''
+    指定フィーチャクラス の xml_genericAttributeSet をフラットに展開する処理
+    v111:メモリ対策の見直し、進捗表示のメッセージを追加
+    v113:展開処理は expandXmlfield で行う
+    '''
+    blResult, column_keys, update_fields = expandXmlfield(fc, memory_budget_mb, workers, journal, schema_plan, narrow)
     return blResult
 
 
@@ -184,16 +706,74 @@ def main():
             arcpy.AddError(u"{0} は3D都市モデルの変換先ファイル ジオデータベースを選択する必要があります".format(input_gdb))
             return 
  
+        # v113: 展開した値の格納方法を指定（LONG の場合は縦持ちのテーブルに格納）
+        storage = STORAGE_MODE
+        if arcpy.GetArgumentCount() >= 6 and arcpy.GetParameterAsText(5) != "":
+            storage = arcpy.GetParameterAsText(5).upper()
+        if storage not in (STORAGE_WIDE, STORAGE_LONG):
+            arcpy.AddError(u"格納方法は {0} または {1} を指定してください".format(STORAGE_WIDE, STORAGE_LONG))
+            return
+
+        # v113: 処理時間の計測を開始（格納方法ごとに比較できるように、縦持ちのテーブルの場合は _long を付ける）
+        instr.start("calculate_genericAttributeSet_field" + ("_long" if storage == STORAGE_LONG else ""), input_gdb)
+
+        # v113: 省メモリモードのメモリ上限(MB)を指定
+        memory_budget_mb = MEMORY_BUDGET_MB
+        if arcpy.GetArgumentCount() >= 2 and arcpy.GetParameterAsText(1) != "":
+            memory_budget_mb = int(arcpy.GetParameterAsText(1))
+        # v113: XMLの展開を並列処理するワーカープロセス数を指定
+        workers = PARSE_WORKERS
+        if arcpy.GetArgumentCount() >= 3 and arcpy.GetParameterAsText(2) != "":
+            workers = int(arcpy.GetParameterAsText(2))
+        # v113: 進捗の記録を削除して最初から処理する場合は true を指定
+        force = False
+        if arcpy.GetArgumentCount() >= 4:
+            force = arcpy.GetParameterAsText(3).lower() == "true"
+        # v113: フィールドの型、長さを展開する値が収まる最小のものにする場合は true を指定
+        narrow = NARROW_FIELD_TYPES
+        if arcpy.GetArgumentCount() >= 5 and arcpy.GetParameterAsText(4) != "":
+            narrow = arcpy.GetParameterAsText(4).lower() == "true"
         arcpy.env.overwriteOutput = True
         
         arcpy.env.workspace = input_gdb
+        if storage == STORAGE_LONG:
+            # v113: 縦持ちのテーブルはフィーチャクラスごとに置き換えるため、進捗の記録、フィールドの型の最適化は使用しない
+            if narrow:
+                arcpy.AddWarning(u"縦持ちのテーブルに格納する場合は、フィールドの型の最適化は行いません")
+            writer = gattbl.LongTableWriter(input_gdb)
+            for fc in FCNAMES:
+                if arcpy.Exists(fc):
+                    if int(arcpy.GetCount_management(fc)[0]) > 0:
+                        bl = expandXmlfieldToTable(fc, writer, workers)
+                    else:
+                        arcpy.AddWarning(u"{0} の レコードがないため処理をスキップします".format(fc))
+            writer.close()
+            instr.finish()
+            arcpy.AddMessage(u"処理終了：")
+            return
+
+        journal = expjnl.openJournal(input_gdb, force)
+        # v113: 対象のフィーチャクラスの既存のフィールドをまとめて取得し、フィールド名を全てのフィーチャクラスで共通の計画で確定する
+        schema_plan = schplan.SchemaPlan([fc for fc in FCNAMES if arcpy.Exists(fc)], input_gdb)
         for fc in FCNAMES:
             if arcpy.Exists(fc):
-                if int(arcpy.GetCount_management(fc)[0]) > 0:
-                    bl = convertXmlfieldToFields(fc)
+                # v113: 件数、値、追加したフィールドが記録と一致しない場合（GDB を作り直した場合など）は記録を破棄して最初から処理
+                if not journal.verify(fc, XMLFIELDNAME):
+                    arcpy.AddWarning(u"{0} は前回の実行の記録と一致しないため、記録を破棄して最初から処理します".format(fc))
+                if journal.isComplete(fc):
+                    arcpy.AddWarning(u"{0} は前回の実行で展開処理が完了しているため処理をスキップします".format(fc))
+                elif int(arcpy.GetCount_management(fc)[0]) > 0:
+                    bl = convertXmlfieldToFields(fc, memory_budget_mb, workers, journal, schema_plan, narrow)
                 else:
                     arcpy.AddWarning(u"{0} の レコードがないため処理をスキップします".format(fc))
 
+        # v113: 展開する値の集計結果を GDB と同じフォルダーに出力
+        if narrow and len(colprof.profile_results) > 0:
+            colprof.writeProfileReport(input_gdb, colprof.profile_results)
+
+        # v113: 段階ごとの処理時間を GDB と同じフォルダーに出力
+        instr.finish()
+
         arcpy.AddMessage(u"処理終了：")
     except arcpy.ExecuteError:
         arcpy.AddError(arcpy.GetMessages(2))
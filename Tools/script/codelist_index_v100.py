@@ -0,0 +1,206 @@
+# coding:utf-8
+"""
+Name        :codelist_index_v100.py
+Purpose     :3D都市モデルの [codelists] フォルダーのコードリスト（extendedAttribute_key.xml, extendedAttribute_keyXX.xml,
+             Building_name.xml, LandUse_genUsage.xml など）を読み込み、コード値と説明のディクショナリを返却する共通処理。
+
+             各ツールが実行のたびにコードリストを解析し直さないように、解析結果はローカルのキャッシュファイル(SQLite)に
+             ファイルパス、更新日時、サイズ、ハッシュ値とともに保存し、変更されたファイルだけを解析し直す。
+             フォルダー単位で読み込む場合は、多数の小さいファイルをスレッドで並列に解析する。
+
+             例）
+               import codelist_index_v100 as cdidx
+               cdidx.loadFolder(folder) # フォルダー内の *.xml をまとめて解析（変更されたファイルのみ）
+               domainName, domainDict = cdidx.getCodelist(os.path.join(folder, "extendedAttribute_key2.xml"))
+Author      :
+Copyright   :
+Created     :2026/10/18
+Last Updated:2026/10/18
+ArcGIS Version: ArcGIS Pro 2.6 以上
+"""
+import os
+import glob
+import json
+import hashlib
+import sqlite3
+import tempfile
+import threading
+import concurrent.futures
+import xml.etree.ElementTree as et
+
+# キャッシュファイルを保存するフォルダー名とファイル名（%LOCALAPPDATA% の下に作成）
+CACHE_FOLDER_NAME = "3DCityModel_ConversionTools"
+CACHE_FILENAME = "codelist_index.sqlite"
+
+# フォルダー単位で読み込む場合の解析スレッド数
+PARSE_THREADS = 8
+
+NS = {'gml':"http://www.opengis.net/gml"}
+
+def getDefaultCacheFile():
+    '''
+    キャッシュファイルの保存先のパスを取得
+    '''
+    folder = os.environ.get("LOCALAPPDATA") or tempfile.gettempdir()
+    return os.path.join(folder, CACHE_FOLDER_NAME, CACHE_FILENAME)
+
+def parseCodelist(data):
+    '''
+    コードリストのXML(バイト列)から、gml:name のドメイン名と、gml:Definition/gml:name をキーに
+    gml:Definition/gml:description を値にしたディクショナリを作成
+    （gml:name, gml:description のどちらかがない <gml:dictionaryEntry> は対象外）
+    '''
+    domainDict = dict()
+    root = et.fromstring(data)
+    domainName = None
+    name_elem = root.find('gml:name', NS)
+    if name_elem is not None:
+        domainName = name_elem.text
+    for dic in root.iterfind('gml:dictionaryEntry', NS):
+        definition = dic.find('gml:Definition', NS)
+        if definition is not None:
+            name = definition.find('gml:name', NS)
+            desc = definition.find('gml:description', NS)
+            if (name is not None) and (desc is not None):
+                domainDict[name.text] = desc.text
+        dic.clear()
+    root.clear()
+    return domainName, domainDict
+
+class CodelistIndex(object):
+    '''
+    コードリストの解析結果をキャッシュファイルと、プロセス内のディクショナリで保持するクラス
+    キャッシュはファイルパスをキーに、更新日時とサイズが変わった場合はハッシュ値を比較して、内容が変わっていれば解析し直す
+    '''
+    def __init__(self, cache_file=None):
+        self.cache_file = cache_file if cache_file is not None else getDefaultCacheFile()
+        self.conn = None
+        self.memo = {}
+        self.lock = threading.Lock()
+        self.parsed = 0
+        self.cached = 0
+
+    def connect(self):
+        '''
+        キャッシュファイルを開く（開けない場合はキャッシュファイルを使わずに処理を継続）
+        '''
+        if self.conn is None and self.cache_file:
+            try:
+                folder = os.path.dirname(self.cache_file)
+                if folder and not os.path.exists(folder):
+                    os.makedirs(folder)
+                self.conn = sqlite3.connect(self.cache_file)
+                self.conn.execute("CREATE TABLE IF NOT EXISTS codelists (path TEXT PRIMARY KEY, mtime REAL, size INTEGER, hash TEXT, domain_name TEXT, entries TEXT)")
+            except (OSError, sqlite3.Error):
+                self.conn = None
+                self.cache_file = None
+        return self.conn
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    def readCache(self, path):
+        conn = self.connect()
+        if conn is None:
+            return None
+        return conn.execute("SELECT mtime, size, hash, domain_name, entries FROM codelists WHERE path = ?", (path,)).fetchone()
+
+    def writeCache(self, path, mtime, size, digest, domainName, domainDict):
+        conn = self.connect()
+        if conn is None:
+            return
+        entries = json.dumps(list(domainDict.items()), ensure_ascii=False, separators=(",", ":"))
+        conn.execute("INSERT OR REPLACE INTO codelists VALUES (?, ?, ?, ?, ?, ?)", (path, mtime, size, digest, domainName, entries))
+
+    def resolve(self, xmlfile):
+        '''
+        (パス, キャッシュの解析結果, 解析に必要な値) を返却
+        キャッシュが有効な場合は解析結果を、無効な場合は 解析に必要な値 (mtime, size, digest, data) を設定する
+        '''
+        path = os.path.normcase(os.path.abspath(xmlfile))
+        st = os.stat(path)
+        cached = self.readCache(path)
+        if cached is not None and cached[0] == st.st_mtime and cached[1] == st.st_size:
+            return path, (cached[3], dict(json.loads(cached[4]))), None
+        with open(path, "rb") as f:
+            data = f.read()
+        digest = hashlib.sha1(data).hexdigest()
+        if cached is not None and cached[2] == digest:
+            # 更新日時だけが変わった場合は解析せずにキャッシュを更新
+            conn = self.connect()
+            conn.execute("UPDATE codelists SET mtime = ?, size = ? WHERE path = ?", (st.st_mtime, st.st_size, path))
+            return path, (cached[3], dict(json.loads(cached[4]))), None
+        return path, None, (st.st_mtime, st.st_size, digest, data)
+
+    def getCodelist(self, xmlfile):
+        '''
+        コードリストのドメイン名と、コード値と説明のディクショナリを返却
+        '''
+        path = os.path.normcase(os.path.abspath(xmlfile))
+        with self.lock:
+            result = self.memo.get(path)
+            if result is not None:
+                return result
+            path, result, pending = self.resolve(xmlfile)
+            if result is None:
+                mtime, size, digest, data = pending
+                result = parseCodelist(data)
+                self.writeCache(path, mtime, size, digest, result[0], result[1])
+                self.parsed += 1
+            else:
+                self.cached += 1
+            if self.conn is not None:
+                self.conn.commit()
+            self.memo[path] = result
+        return result
+
+    def loadFolder(self, folder, pattern="*.xml", threads=None):
+        '''
+        フォルダー内のコードリストをまとめて読み込む。変更されたファイルだけをスレッドで並列に解析し、
+        ファイルパスをキーに (ドメイン名, ディクショナリ) を返却
+        '''
+        if threads is None:
+            threads = PARSE_THREADS
+        results = {}
+        pending = []
+        with self.lock:
+            for xmlfile in sorted(glob.glob(os.path.join(folder, pattern))):
+                path = os.path.normcase(os.path.abspath(xmlfile))
+                if path in self.memo:
+                    results[path] = self.memo[path]
+                    continue
+                path, result, parse_args = self.resolve(xmlfile)
+                if result is not None:
+                    results[path] = result
+                    self.memo[path] = result
+                    self.cached += 1
+                else:
+                    pending.append((path, parse_args))
+            if len(pending) > 0:
+                with concurrent.futures.ThreadPoolExecutor(max_workers=threads) as executor:
+                    parsed = executor.map(lambda p: parseCodelist(p[1][3]), pending)
+                    for (path, (mtime, size, digest, data)), result in zip(pending, parsed):
+                        self.writeCache(path, mtime, size, digest, result[0], result[1])
+                        self.memo[path] = result
+                        results[path] = result
+                        self.parsed += 1
+            if self.conn is not None:
+                self.conn.commit()
+        return results
+
+# 各ツールで共有するインデックス
+default_index = CodelistIndex()
+
+def getCodelist(xmlfile):
+    '''
+    共有インデックスから、コードリストのドメイン名と、コード値と説明のディクショナリを返却
+    '''
+    return default_index.getCodelist(xmlfile)
+
+def loadFolder(folder, pattern="*.xml", threads=None):
+    '''
+    共有インデックスに、フォルダー内のコードリストをまとめて読み込む
+    '''
+    return default_index.loadFolder(folder, pattern, threads)
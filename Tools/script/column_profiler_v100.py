@@ -0,0 +1,313 @@
+# coding:utf-8
+"""
+Name        :column_profiler_v100.py
+Purpose     :xml_genericAttributeSet を展開した値を 'name:type' のキーごとに集計し、値が収まる最小のフィールドの型と長さ、
+             値の種類が少ない文字列のフィールドのコード値ドメインを決める共通処理（calculate_genericAttributeSet_field の型の最適化）。
+
+             ・LONG, DOUBLE のキーで全ての値が整数の場合は、値の範囲から SHORT または LONG にする（LONG の範囲を超える場合は DOUBLE にする）
+             ・TEXT のキーは、最大文字数が収まる TEXT_LENGTH_STEPS の長さにする（数値のような値でも TEXT のまま。先頭の 0 などを変えないため）
+             ・TEXT のキーで、値が DOMAIN_MIN_ROWS 件以上、値の種類が DOMAIN_MAX_CODES 以下の場合は、
+               値を説明にした SHORT 型のコード値ドメイン（genericAttribute_<フィールド名>）を作成し、フィールドにはコードを格納する
+               （コードは既存のドメインのコードを引き継ぎ、新しい値は値の順に付番する。展開時にドメインにない値は、コードを付番してドメインに追加する）
+             ・値がないキーは、XMLの type のまま、TEXT は長さ 255 で追加する
+             ・集計した値（件数、種類、最大文字数、最小値、最大値）と決めた型は、メッセージと GDB と同じフォルダーのJSONに出力する
+
+             ファイル ジオデータベースごとにフィールドの型が変わるため、同じスキーマであることが必要な処理（GDBのマージなど）で
+             使用する GDB では使用しないこと。
+Author      :
+Copyright   :
+Created     :2026/10/18
+Last Updated:2026/10/18
+ArcGIS Version: ArcGIS Pro 2.6 以上
+"""
+import arcpy
+import os
+import re
+import json
+import datetime
+import collections
+
+import domain_builder_v100 as dombld
+
+# 文字列のフィールドの長さ（最大文字数が収まる最小の長さを使用。超える場合は TEXT_LENGTH_ROUND 単位に切り上げ）
+TEXT_LENGTH_STEPS = [8, 16, 32, 64, 128, 255]
+TEXT_LENGTH_ROUND = 256
+DEFAULT_TEXT_LENGTH = 255
+
+# コード値ドメインにする条件（値の件数の下限、値の種類の上限）
+DOMAIN_MIN_ROWS = 100
+DOMAIN_MAX_CODES = 64
+DOMAIN_PREFIX = "genericAttribute_"
+
+SHORT_RANGE = (-32768, 32767)
+LONG_RANGE = (-2147483648, 2147483647)
+
+INTEGER_PATTERN = re.compile(r"\s*[-+]?\d+\s*\Z")
+
+PROFILE_SUFFIX = "_column_profile.json"
+
+# フィーチャクラスごとの集計結果（writeProfileReport で出力）
+profile_results = collections.OrderedDict()
+
+class ColumnProfile(object):
+    '''
+    1つの 'name:type' のキーの値の集計
+    '''
+    __slots__ = ("field_type", "count", "max_length", "all_integer", "min_value", "max_value", "values")
+
+    def __init__(self, field_type):
+        self.field_type = field_type
+        self.count = 0
+        self.max_length = 0
+        self.all_integer = field_type != "TEXT"
+        self.min_value = None
+        self.max_value = None
+        # 値の種類（DOMAIN_MAX_CODES を超えた場合は None）
+        self.values = set() if field_type == "TEXT" else None
+
+    def add(self, value):
+        self.count += 1
+        n = len(value)
+        if n > self.max_length:
+            self.max_length = n
+        if self.all_integer:
+            if INTEGER_PATTERN.match(value):
+                v = int(value)
+                if self.min_value is None or v < self.min_value:
+                    self.min_value = v
+                if self.max_value is None or v > self.max_value:
+                    self.max_value = v
+            else:
+                self.all_integer = False
+        if self.values is not None:
+            self.values.add(value)
+            if len(self.values) > DOMAIN_MAX_CODES:
+                self.values = None
+
+class FieldSpec(object):
+    '''
+    集計結果から決めたフィールドの型、長さ、コード値ドメインの値（ドメインにしない場合は None）
+    '''
+    def __init__(self, field_type, length=None, domain_values=None):
+        self.field_type = field_type
+        self.length = length
+        self.domain_values = domain_values
+
+def getTextLength(max_length):
+    for step in TEXT_LENGTH_STEPS:
+        if max_length <= step:
+            return step
+    return ((max_length + TEXT_LENGTH_ROUND - 1) // TEXT_LENGTH_ROUND) * TEXT_LENGTH_ROUND
+
+def getIntegerType(min_value, max_value):
+    if SHORT_RANGE[0] <= min_value and max_value <= SHORT_RANGE[1]:
+        return "SHORT"
+    if LONG_RANGE[0] <= min_value and max_value <= LONG_RANGE[1]:
+        return "LONG"
+    return None
+
+class ColumnProfiler(object):
+    '''
+    展開した値をキーごとに集計するクラス
+    '''
+    def __init__(self):
+        self.profiles = {}
+
+    def addRow(self, row):
+        for key in row:
+            value = row[key]
+            if value is None:
+                continue
+            p = self.profiles.get(key)
+            if p is None:
+                p = ColumnProfile(key.split(":")[1].upper())
+                self.profiles[key] = p
+            p.add(value)
+
+    def wrap(self, parsed_rows):
+        '''
+        (OBJECTID, 展開したディクショナリ) を集計しながらそのまま返却
+        '''
+        for oid, row in parsed_rows:
+            self.addRow(row)
+            yield oid, row
+
+    def createFieldSpec(self, key):
+        p = self.profiles.get(key)
+        fieldType = key.split(":")[1].upper()
+        if p is None or p.count == 0:
+            return FieldSpec(fieldType, DEFAULT_TEXT_LENGTH if fieldType == "TEXT" else None)
+        if fieldType == "TEXT":
+            if p.count >= DOMAIN_MIN_ROWS and p.values is not None and all(v.strip() != "" for v in p.values):
+                return FieldSpec("SHORT", None, sorted(p.values))
+            return FieldSpec("TEXT", getTextLength(p.max_length))
+        if p.all_integer and fieldType in ("SHORT", "LONG", "DOUBLE", "FLOAT"):
+            narrowed = getIntegerType(p.min_value, p.max_value)
+            if narrowed is not None:
+                return FieldSpec(narrowed)
+            # LONG の範囲を超える整数は SHORT, LONG のフィールドに格納できないため DOUBLE にする
+            return FieldSpec("DOUBLE")
+        return FieldSpec(fieldType)
+
+    def createFieldSpecs(self, column_keys):
+        return dict((key, self.createFieldSpec(key)) for key in column_keys)
+
+    def toDict(self, column_keys, specs, update_fields):
+        columns = []
+        for key, name in zip(column_keys, update_fields):
+            p = self.profiles.get(key)
+            spec = specs[key]
+            columns.append({
+                "key": key, "field": name, "field_type": spec.field_type, "length": spec.length,
+                "domain": getDomainName(name) if spec.domain_values is not None else None,
+                "count": p.count if p else 0, "max_length": p.max_length if p else 0,
+                "distinct": (len(p.values) if p.values is not None else None) if p else 0,
+                "min": p.min_value if p else None, "max": p.max_value if p else None})
+        return columns
+
+    def report(self, fc, column_keys, specs, update_fields):
+        '''
+        キーごとの集計結果と決めた型をメッセージに出力
+        '''
+        arcpy.AddMessage(u"{0} の展開する値の集計結果:".format(fc))
+        for c in self.toDict(column_keys, specs, update_fields):
+            if c["field_type"] is None:
+                detail = u"（既存のフィールドに展開）"
+            elif c["domain"] is not None:
+                detail = u"{0} 種類 → ドメイン {1}".format(c["distinct"], c["domain"])
+            elif c["field_type"] == "TEXT":
+                detail = u"最大 {0} 文字 → 長さ {1}".format(c["max_length"], c["length"])
+            elif c["min"] is not None:
+                detail = u"{0} ～ {1}".format(c["min"], c["max"])
+            else:
+                detail = u""
+            arcpy.AddMessage(u"  {0}: {1} 件, {2} → {3} {4}".format(c["field"], c["count"], c["key"].split(":")[1], c["field_type"] or "", detail))
+
+def getDomainName(field_name):
+    return DOMAIN_PREFIX + field_name
+
+def buildDomains(gdb, update_fields, new_fields, column_keys, specs):
+    '''
+    追加するフィールドのうちコード値ドメインにするものは、ドメインを作成して new_fields（AddFields の定義）に型、長さ、ドメインを設定
+    既存のフィールドに展開するキーは型を None にした specs を返却
+    '''
+    added = dict((f[0], f) for f in new_fields)
+    existing = None
+    result = {}
+    for key, name in zip(column_keys, update_fields):
+        f = added.get(name)
+        if f is None:
+            result[key] = FieldSpec(None)
+            continue
+        result[key] = specs[key]
+        spec = specs[key]
+        f[1] = spec.field_type
+        f[3] = spec.length
+        if spec.domain_values is not None:
+            if existing is None:
+                existing = dombld.listCodedValues(gdb)
+            domainName = getDomainName(name)
+            current = existing.get(domainName) or {}
+            codes = createCodes(current, spec.domain_values)
+            dombld.buildCodedValueDomain(gdb, domainName, u"{0} の値".format(name), codes, existing, "SHORT")
+            f[5] = domainName
+    return result
+
+def createCodes(current, values):
+    '''
+    既存のドメインのコードを引き継ぎ、ないものは値の順に付番した {コード: 値} を返却
+    '''
+    codes = dict((int(code), desc) for code, desc in current.items())
+    known = set(codes.values())
+    n = max(codes.keys()) if len(codes) > 0 else 0
+    for value in sorted(values):
+        if value not in known:
+            n += 1
+            codes[n] = value
+    return codes
+
+class DomainEncoder(object):
+    '''
+    コード値ドメイン（DOMAIN_PREFIX）を適用したフィールドの値をコードに変換するクラス（前回中断した処理の再開時など、既存のフィールドも対象）
+    ドメインにない値（データが変わった後の再実行など）は新しいコードを付番して書き込み、flush でドメインに追加する
+    '''
+    def __init__(self, gdb, fc, update_fields):
+        self.gdb = gdb
+        # {フィールドの位置: (フィールド名, ドメイン名, {値: コード})}
+        self.encoders = {}
+        # ドメインに追加していないコード {ドメイン名: {コード: 値}}
+        self.pending = {}
+        # コードを付番できずに格納しなかった値の件数 {フィールドの位置: 件数}
+        self.dropped = collections.Counter()
+        domains = dict((f.name, f.domain) for f in arcpy.ListFields(fc) if f.domain and f.domain.startswith(DOMAIN_PREFIX))
+        if len(domains) == 0:
+            return
+        existing = dombld.listCodedValues(gdb)
+        for i, name in enumerate(update_fields):
+            domainName = domains.get(name)
+            if domainName is not None and existing.get(domainName) is not None:
+                codes = dict((desc, int(code)) for code, desc in existing[domainName].items())
+                self.encoders[i] = (name, domainName, codes)
+
+    def encode(self, i, value):
+        name, domainName, codes = self.encoders[i]
+        code = codes.get(value)
+        if code is not None:
+            return code
+        code = max(codes.values()) + 1 if len(codes) > 0 else 1
+        if code > SHORT_RANGE[1] or value.strip() == "":
+            self.dropped[i] += 1
+            return None
+        codes[value] = code
+        self.pending.setdefault(domainName, {})[code] = value
+        return code
+
+    def wrap(self, getRow):
+        '''
+        getRow の値のうち、コード値ドメインのフィールドの値をコードに変換する関数を作成
+        '''
+        if len(self.encoders) == 0:
+            return getRow
+        positions = list(self.encoders.keys())
+        def getEncodedRow(oid):
+            values = getRow(oid)
+            if values is None:
+                return None
+            for i in positions:
+                if values[i] is not None:
+                    values[i] = self.encode(i, values[i])
+            return values
+        return getEncodedRow
+
+    def flush(self):
+        '''
+        付番したコードをドメインに追加（書き込みを確定する前に呼び出す）
+        '''
+        if len(self.pending) == 0:
+            return
+        existing = dombld.listCodedValues(self.gdb)
+        for domainName in sorted(self.pending):
+            codes = self.pending[domainName]
+            dombld.buildCodedValueDomain(self.gdb, domainName, u"{0} の値".format(domainName[len(DOMAIN_PREFIX):]), codes, existing, "SHORT")
+            arcpy.AddMessage(u"{0}: ドメインにない {1} 種類の値のコードを追加しました".format(domainName, len(codes)))
+        self.pending = {}
+
+    def report(self, fc):
+        '''
+        コードを付番できずに格納しなかった値の件数を警告に出力
+        '''
+        for i in sorted(self.dropped):
+            arcpy.AddWarning(u"{0}.{1}: ドメイン {2} にコードを追加できない値が {3} 件あるため、値を格納しませんでした".format(
+                fc, self.encoders[i][0], self.encoders[i][1], self.dropped[i]))
+
+def writeProfileReport(gdb, results):
+    '''
+    フィーチャクラスごとの集計結果を <GDBのフォルダー>/<GDB名>_column_profile.json に出力
+    '''
+    gdb = os.path.normpath(gdb)
+    path = os.path.join(os.path.dirname(gdb), os.path.splitext(os.path.basename(gdb))[0] + PROFILE_SUFFIX)
+    data = {"gdb": gdb, "created": datetime.datetime.now().isoformat(), "feature_classes": results}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=1)
+    arcpy.AddMessage(u"展開する値の集計結果を出力しました: {0}".format(path))
+    return path
@@ -0,0 +1,139 @@
+# coding:utf-8
+"""
+Name        :domain_builder_v100.py
+Purpose     :コードリストから作成したコード値と説明のディクショナリをもとに、ファイル ジオデータベースのコード値ドメインを作成、追加する共通処理。
+
+             AddCodedValueToDomain_management でコードを1件ずつ追加すると、コードの件数分ジオプロセシングツールの呼び出しが必要になるため、
+             追加するコードをメモリ上のテーブルにまとめて、TableToDomain_management で1回で作成、追加する。
+             既存のドメインがある場合は、ドメインのコード値と比較して、コードリストに追加されたコードのみを追加する。
+             フィールドへのドメインとエイリアスの適用は DomainAssignmentPlan にまとめ、フィーチャクラスごとに1回取得したフィールドの定義と比較して、
+             変更が必要なフィールドにのみ AssignDomainToField_management, AlterField_management を実行する。
+Author      :
+Copyright   :
+Created     :2026/10/18
+Last Updated:2026/10/18
+ArcGIS Version: ArcGIS Pro 2.6 以上
+"""
+import arcpy
+import collections
+
+# コードをまとめる一時テーブル
+CODE_TABLE = r"memory\domain_codes"
+CODE_FIELD = "code"
+DESC_FIELD = "description"
+
+def listCodedValues(gdb):
+    '''
+    ドメイン名をキーに、既存のコード値ドメインのコード値と説明のディクショナリを返却
+    '''
+    codedValues = {}
+    for domain in arcpy.da.ListDomains(gdb):
+        if domain.domainType == "CodedValue":
+            codedValues[domain.name] = dict(domain.codedValues)
+        else:
+            codedValues[domain.name] = None
+    return codedValues
+
+def createCodeTable(codes, field_type="TEXT"):
+    '''
+    コード値と説明のリストからメモリ上のテーブルを作成（コードのフィールドの型は field_type）
+    '''
+    if arcpy.Exists(CODE_TABLE):
+        arcpy.Delete_management(CODE_TABLE)
+    workspace, name = CODE_TABLE.split("\\")
+    arcpy.CreateTable_management(workspace, name)
+    arcpy.AddField_management(CODE_TABLE, CODE_FIELD, field_type)
+    arcpy.AddField_management(CODE_TABLE, DESC_FIELD, "TEXT")
+    with arcpy.da.InsertCursor(CODE_TABLE, [CODE_FIELD, DESC_FIELD]) as cur:
+        for code, codeDesc in codes:
+            cur.insertRow((code, codeDesc))
+    return CODE_TABLE
+
+def buildCodedValueDomain(gdb, domainName, domainDesc, domainDict, existing=None, field_type="TEXT"):
+    '''
+    domainDict のコード値と説明で、field_type（省略時は TEXT）型のコード値ドメインを作成する。既存のドメインがある場合は、ないコードのみを追加する
+    existing には listCodedValues の結果を渡すと、ドメインごとに ListDomains を呼び出さずに処理する（追加したコードは existing にも反映）
+    追加したコードの件数を返却
+    '''
+    if existing is None:
+        existing = listCodedValues(gdb)
+
+    if domainName in existing and existing[domainName] is None:
+        arcpy.AddWarning(u"{0}: ドメイン はコード値ドメインではないため、コードの追加をスキップします".format(domainName))
+        return 0
+    current = existing.get(domainName) or {}
+
+    codes = []
+    skipped = []
+    for code in domainDict:
+        codeDesc = domainDict[code]
+        if code in current:
+            continue
+        if (codeDesc is None) or (len(codeDesc.strip()) == 0): # コード値に対応する説明がない不正なデータはスキップ
+            skipped.append(code)
+            continue
+        codes.append((code, codeDesc))
+
+    if len(codes) > 0:
+        table = createCodeTable(codes, field_type)
+        try:
+            arcpy.TableToDomain_management(table, CODE_FIELD, DESC_FIELD, gdb, domainName, domainDesc, "APPEND")
+        finally:
+            arcpy.Delete_management(table)
+        current.update(codes)
+        existing[domainName] = current
+    elif domainName not in existing:
+        # 追加できるコードがない場合も、フィールドへの適用ができるようにドメインは作成する
+        arcpy.CreateDomain_management(gdb, domainName, domainDesc, field_type, "CODED")
+        existing[domainName] = current
+
+    arcpy.AddMessage(u"{0}: ドメイン に {1} 件のコードを追加しました（既存 {2} 件）".format(domainName, len(codes), len(current) - len(codes)))
+    if len(skipped) > 0:
+        arcpy.AddWarning(u"{0}: ドメイン に追加するコードの説明がないため {1} 件をスキップしました（{2}）".format(domainName, len(skipped), ", ".join([str(c) for c in skipped])))
+    return len(codes)
+
+class DomainAssignmentPlan(object):
+    '''
+    フィールドに適用するドメインとエイリアスの計画 {フィーチャクラス: {フィールド名: (ドメイン名, エイリアス)}}
+    適用済みのフィールド（ドメインとエイリアスが同じ）はスキップするため、同じ GDB に繰り返し実行しても変更しない
+    '''
+    def __init__(self):
+        self.assignments = collections.OrderedDict()
+
+    def add(self, fc, field, domainName, alias=None):
+        '''
+        適用するドメインとエイリアスを追加（alias が None の場合はエイリアスを変更しない）
+        '''
+        self.assignments.setdefault(fc, collections.OrderedDict())[field] = (domainName, alias)
+
+    def getFeatureClasses(self):
+        return list(self.assignments.keys())
+
+    def diff(self, fc):
+        '''
+        フィールドの定義を1回取得して計画と比較し、(変更が必要な [(フィールド名, ドメイン名, エイリアス)], フィールドがない [フィールド名]) を返却
+        ドメイン名、エイリアスは変更しない場合は None
+        '''
+        fields = dict((f.name.upper(), f) for f in arcpy.ListFields(fc))
+        changes = []
+        missing = []
+        for name, (domainName, alias) in self.assignments[fc].items():
+            f = fields.get(name.upper())
+            if f is None:
+                missing.append(name)
+                continue
+            newDomain = domainName if (f.domain or "") != domainName else None
+            newAlias = alias if alias is not None and f.aliasName != alias else None
+            if newDomain is not None or newAlias is not None:
+                changes.append((f.name, newDomain, newAlias))
+        return changes, missing
+
+    def apply(self, fc, changes):
+        '''
+        diff で作成した変更のみを適用
+        '''
+        for name, domainName, alias in changes:
+            if domainName is not None:
+                arcpy.AssignDomainToField_management(fc, name, domainName)
+            if alias is not None:
+                arcpy.AlterField_management(fc, name, new_field_alias=alias)
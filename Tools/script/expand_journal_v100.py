@@ -0,0 +1,147 @@
+# coding:utf-8
+"""
+Name        :expand_journal_v100.py
+Purpose     :xml_genericAttributeSet の展開処理の進捗を、ファイル ジオデータベースと同じフォルダーのJSONファイルに記録する共通処理。
+
+             フィーチャクラスごとに、展開するフィールド（'name:type' のキーの一覧）と、書き込みが完了した最後の OBJECTID、
+             完了したかどうかを記録する。処理が中断された場合は、再実行時に記録した OBJECTID の次から再開し、
+             完了したフィーチャクラスはスキップする。
+             同じパスに GDB を作り直した場合などに前回の記録を使わないように、フィーチャクラスの件数、最大の OBJECTID、
+             OBJECTID 順で先頭の xml_genericAttributeSet の値のハッシュと、追加したフィールドを記録し、
+             現在のフィーチャクラスと一致しない記録は破棄する。
+
+             例）<フォルダー>\\11100_saitama-shi_bldg.gdb に対して <フォルダー>\\11100_saitama-shi_bldg_genericAttributeSet_journal.json
+Author      :
+Copyright   :
+Created     :2026/10/18
+Last Updated:2026/10/18
+ArcGIS Version: ArcGIS Pro 2.6 以上
+"""
+import os
+import json
+import hashlib
+import arcpy
+
+JOURNAL_SUFFIX = "_genericAttributeSet_journal.json"
+JOURNAL_VERSION = 2
+
+# 記録と現在のフィーチャクラスを照合するときに、ハッシュを求める先頭のレコード数
+FINGERPRINT_SAMPLE_ROWS = 100
+
+def getJournalPath(gdb):
+    '''
+    ファイル ジオデータベースのパスから、進捗を記録するファイルのパスを作成
+    '''
+    return "{0}{1}".format(os.path.splitext(os.path.normpath(gdb))[0], JOURNAL_SUFFIX)
+
+def getFingerprint(fc, sample_field):
+    '''
+    フィーチャクラスの件数、最大の OBJECTID、OBJECTID 順で先頭の FINGERPRINT_SAMPLE_ROWS 件の sample_field の値のハッシュを返却
+    '''
+    rows = 0
+    max_oid = None
+    with arcpy.da.SearchCursor(fc, ["OID@"]) as cur:
+        for r in cur:
+            rows += 1
+            if max_oid is None or r[0] > max_oid:
+                max_oid = r[0]
+    md5 = hashlib.md5()
+    oid_field = arcpy.Describe(fc).OIDFieldName
+    with arcpy.da.SearchCursor(fc, ["OID@", sample_field], sql_clause=(None, "ORDER BY {0}".format(oid_field))) as cur:
+        for i, r in enumerate(cur):
+            if i >= FINGERPRINT_SAMPLE_ROWS:
+                break
+            md5.update(u"{0}\t{1}\n".format(r[0], r[1] or "").encode("utf-8"))
+    return {"rows": rows, "max_oid": max_oid, "sample": md5.hexdigest()}
+
+class ExpandJournal(object):
+    '''
+    展開処理の進捗を記録するクラス（記録を更新するたびにファイルに保存）
+    '''
+    def __init__(self, path):
+        self.path = path
+        self.featureclasses = {}
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") == JOURNAL_VERSION:
+                self.featureclasses = data.get("featureclasses", {})
+
+    def save(self):
+        data = {"version": JOURNAL_VERSION, "featureclasses": self.featureclasses}
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=1)
+        os.replace(tmp, self.path) # 書き込み途中で中断されても記録が壊れないように置き換える
+
+    def reset(self):
+        '''
+        記録をすべて削除して、最初から処理するようにする
+        '''
+        self.featureclasses = {}
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def verify(self, fc, sample_field):
+        '''
+        記録したフィーチャクラスの件数、最大の OBJECTID、先頭のレコードの値のハッシュ、追加したフィールドが
+        現在のフィーチャクラスと一致するか確認し、一致しない場合は記録を破棄して False を返却（記録がない場合は True）
+        '''
+        entry = self.featureclasses.get(fc)
+        if entry is None:
+            return True
+        names = set([f.name.upper() for f in arcpy.ListFields(fc)])
+        if entry.get("fingerprint") == getFingerprint(fc, sample_field) and \
+           all([field.upper() in names for field in entry.get("fields", [])]):
+            return True
+        self.invalidate([fc])
+        return False
+
+    def invalidate(self, fcs):
+        '''
+        指定したフィーチャクラスの記録を削除（次回の実行時は最初から処理する）
+        '''
+        removed = [fc for fc in fcs if self.featureclasses.pop(fc, None) is not None]
+        if len(removed) > 0:
+            self.save()
+        return removed
+
+    def isComplete(self, fc):
+        return self.featureclasses.get(fc, {}).get("complete", False)
+
+    def getColumns(self, fc):
+        '''
+        記録されている 'name:type' のキーの一覧を返却（記録がない場合は None）
+        '''
+        return self.featureclasses.get(fc, {}).get("columns")
+
+    def getLastOid(self, fc):
+        '''
+        書き込みが完了した最後の OBJECTID を返却（書き込みを開始していない場合は None）
+        '''
+        return self.featureclasses.get(fc, {}).get("last_oid")
+
+    def start(self, fc, columns, fields, fingerprint):
+        '''
+        フィールドの追加後、書き込みを開始する前に 'name:type' のキーの一覧、追加したフィールド、フィーチャクラスの照合用の値を記録
+        '''
+        self.featureclasses[fc] = {"columns": list(columns), "fields": list(fields), "fingerprint": fingerprint,
+                                   "last_oid": self.getLastOid(fc), "complete": False}
+        self.save()
+
+    def commit(self, fc, last_oid):
+        self.featureclasses[fc]["last_oid"] = last_oid
+        self.save()
+
+    def complete(self, fc):
+        self.featureclasses[fc]["complete"] = True
+        self.save()
+
+def openJournal(gdb, force=False):
+    '''
+    ファイル ジオデータベースの進捗の記録を開く（force の場合は記録を削除して最初から）
+    '''
+    journal = ExpandJournal(getJournalPath(gdb))
+    if force:
+        journal.reset()
+    return journal
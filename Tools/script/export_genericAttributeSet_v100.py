@@ -0,0 +1,460 @@
+# coding:utf-8
+"""
+Name        :export_genericAttributeSet_v100.py
+Purpose     :xml_genericAttributeSet フィールドのXMLを展開した汎用属性を、ファイル ジオデータベースにフィールドを追加せずに
+             Parquet ファイル、または GeoPackage のテーブルに出力するツール（calculate_genericAttributeSet_field の出力モード）
+
+             ・calculate_genericAttributeSet_field と同じ展開処理（同じ name の _2 付番、gen_1/2500図郭 などの文字の置換、キャッシュ）で、
+               'name:type' のキーを型付きのカラム（TEXT: 文字列、LONG: 整数、DOUBLE: 浮動小数点数）にする
+             ・各行には OBJECTID と gml_id（*_gml_id フィールドの値）を出力し、フィーチャクラスとの結合に使用する
+             ・大文字小文字のみが異なる name（gen_Foo, gen_foo など）は、schema_planner と同じく2つ目以降を "名前_x" のカラムにする
+             ・ROW_GROUP_SIZE 件ずつの行グループ単位で書き出すため、全件の展開結果をメモリに保持しない
+             ・Parquet は書き込みの開始後にカラムを追加できないため、先に xml_genericAttributeSet の name, type だけを読み込んでカラムを確定し、
+               一時ファイルを使わずに1つのファイルに直接書き出す
+             ・ファイル ジオデータベースのスキーマ、値は変更しない
+
+             出力先
+               PARQUET   : <出力フォルダー>/<フィーチャクラス名>.parquet（pyarrow が必要。圧縮は PARQUET_COMPRESSION）
+               GEOPACKAGE: <出力フォルダー>/<GDB名>_genericAttributeSet.gpkg のフィーチャクラス名のテーブル（属性テーブル）
+
+             パラメータ
+               0: 3D都市モデルの変換先ファイル ジオデータベース
+               1: 出力フォルダー
+               2: 出力形式 PARQUET または GEOPACKAGE（省略時は PARQUET）
+               3: XMLの展開を並列処理するワーカープロセス数（省略可）
+Author      :
+Copyright   :
+Created     :2026/10/18
+Last Updated:2026/10/18
+ArcGIS Version: ArcGIS Pro 2.6 以上
+"""
+import arcpy
+import os
+import sys
+import time
+import re
+import html
+import sqlite3
+import itertools
+import collections
+import concurrent.futures
+import traceback
+
+# Parquet の出力は pyarrow がある場合のみ（ArcGIS Pro 2.x の Python 環境には含まれていない場合がある）
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+# 展開処理は calculate_genericAttributeSet_field と共通
+import calculate_genericAttributeSet_field_v112 as calgen
+import instrumentation_v100 as instr
+# gml_id のフィールド、値の変換は縦持ちのテーブルと共通
+import generic_attribute_table_v100 as gattbl
+# 大文字小文字のみが異なるカラム名の付番は、フィールドに展開する場合と共通
+import schema_planner_v100 as schplan
+
+XMLFIELDNAME = calgen.XMLFIELDNAME
+FCNAMES = calgen.FCNAMES
+
+FORMAT_PARQUET = "PARQUET"
+FORMAT_GEOPACKAGE = "GEOPACKAGE"
+
+# 行グループの件数（この件数ごとにファイルに書き出す）
+ROW_GROUP_SIZE = 50000
+PARQUET_COMPRESSION = "zstd"
+
+GPKG_SUFFIX = "_genericAttributeSet.gpkg"
+GPKG_APPLICATION_ID = 0x47504B47 # "GPKG"
+GPKG_USER_VERSION = 10200
+
+OID_COLUMN = "OBJECTID"
+GML_ID_COLUMN = "gml_id"
+GML_ID_FIELD_SUFFIX = gattbl.GML_ID_FIELD_SUFFIX
+
+# 'name:type' の type ごとの値の変換関数は縦持ちのテーブルと共通
+CONVERTERS = gattbl.CONVERTERS
+# xml_genericAttributeSet の子要素の開始タグの name, type（カラムの事前収集用）
+ATTRIBUTE_PATTERN = re.compile(r'<[\w:]+\s+name="([^"]*)"\s+type="([^"]*)"')
+SQLITE_TYPES = {"LONG": "INTEGER", "SHORT": "INTEGER", "DOUBLE": "REAL", "FLOAT": "REAL"}
+
+class ColumnSchema(object):
+    '''
+    出現した 'name:type' のキーから、カラム名と型の一覧を作成
+    同じ name で型が異なるキーは、最初に出現した型のカラムに変換して格納する（フィールドに展開する場合と同じ）
+    大文字小文字のみが異なる name、OBJECTID, gml_id と重複する name は、2つ目以降を "名前_x" のカラムにする（x=2から付番）
+    '''
+    def __init__(self):
+        self.columns = collections.OrderedDict() # カラム名 → 型
+        self.keys = {} # 'name:type' → (カラム名, 変換関数)
+        self.names = {} # name → カラム名
+        self.folded = set([OID_COLUMN.upper(), GML_ID_COLUMN.upper()]) # 使用したカラム名（大文字）
+
+    def resolve(self, key):
+        '''
+        キーに対応する (カラム名, 変換関数) を返却。新しいカラムの場合は追加して True も返却
+        '''
+        resolved = self.keys.get(key)
+        if resolved is not None:
+            return resolved, False
+        name, fieldType = key.split(":")
+        column = self.names.get(name)
+        added = column is None
+        if added:
+            column = name
+            n = 1
+            while column.upper() in self.folded:
+                n += 1
+                column = schplan.createSuffixedName(name, n)
+            self.folded.add(column.upper())
+            self.names[name] = column
+            self.columns[column] = fieldType
+        resolved = (column, CONVERTERS.get(self.columns[column]))
+        self.keys[key] = resolved
+        return resolved, added
+
+class RowGroupBuffer(object):
+    '''
+    (OBJECTID, gml_id, 展開したディクショナリ) を行グループ単位にまとめるクラス
+    ROW_GROUP_SIZE 件ごとに write_group(カラム名の一覧, カラムごとの値のリスト, 件数) を呼び出し、
+    新しいカラムが出現した場合は add_column(カラム名, 型) を呼び出す（省略可）
+    '''
+    def __init__(self, write_group, add_column=None, row_group_size=ROW_GROUP_SIZE):
+        self.write_group = write_group
+        self.add_column = add_column
+        self.row_group_size = row_group_size
+        self.schema = ColumnSchema()
+        self.count = 0
+        self.resetGroup()
+
+    def resetGroup(self):
+        self.oids = []
+        self.ids = []
+        self.values = {}
+
+    def add(self, oid, gml_id, row):
+        i = len(self.oids)
+        self.oids.append(oid)
+        self.ids.append(gml_id)
+        for key in row:
+            (name, convert), added = self.schema.resolve(key)
+            if added and self.add_column is not None:
+                self.add_column(name, self.schema.columns[name])
+            col = self.values.get(name)
+            if col is None:
+                col = [None] * self.row_group_size
+                self.values[name] = col
+            value = row[key]
+            col[i] = convert(value) if (convert is not None and value is not None) else value
+        if len(self.oids) >= self.row_group_size:
+            self.flush()
+
+    def flush(self):
+        n = len(self.oids)
+        if n == 0:
+            return
+        names = list(self.schema.columns.keys())
+        columns = [self.oids, self.ids] + [self.values[name][:n] if name in self.values else [None] * n for name in names]
+        with instr.phase(u"ファイル書込") as p:
+            self.write_group([OID_COLUMN, GML_ID_COLUMN] + names, columns, n)
+            p.rows += n
+        self.count += n
+        self.resetGroup()
+
+class ParquetWriter(object):
+    '''
+    Parquet ファイルに出力
+    Parquet のスキーマは書き込みの開始後に変更できないため、collectColumnKeys で事前に集めたキーで全カラムのスキーマを作成し、
+    1つの pq.ParquetWriter に行グループを順に書き出す（行グループにないカラムは null で補完）
+    close する前に失敗した場合は、cleanup で途中まで出力したファイルを削除する
+    '''
+    def __init__(self, path, column_keys, row_group_size=ROW_GROUP_SIZE):
+        self.rows = RowGroupBuffer(self.writeGroup, self.addColumn, row_group_size)
+        self.schema = self.rows.schema
+        for key in column_keys:
+            self.schema.resolve(key)
+        self.path = path
+        self.closed = False
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        self.arrow_schema = self.getArrowSchema([OID_COLUMN, GML_ID_COLUMN] + list(self.schema.columns.keys()))
+        self.writer = pq.ParquetWriter(self.path, self.arrow_schema, compression=PARQUET_COMPRESSION)
+
+    @staticmethod
+    def getArrowType(fieldType):
+        if fieldType in ("LONG", "SHORT"):
+            return pa.int64()
+        if fieldType in ("DOUBLE", "FLOAT"):
+            return pa.float64()
+        return pa.string()
+
+    def getArrowSchema(self, names):
+        fields = [pa.field(OID_COLUMN, pa.int64(), nullable=False), pa.field(GML_ID_COLUMN, pa.string())]
+        fields += [pa.field(name, self.getArrowType(self.schema.columns[name])) for name in names[2:]]
+        return pa.schema(fields)
+
+    def addColumn(self, name, fieldType):
+        # 事前に集めたキーと展開結果のキーは同じになるはずのため、異なる場合はエラーにする
+        raise ValueError(u"事前に集めた汎用属性にないカラム {0} が出現したため、Parquet ファイルに出力できません".format(name))
+
+    def writeGroup(self, names, columns, n):
+        table = pa.Table.from_arrays([pa.array(col, type=f.type) for col, f in zip(columns, self.arrow_schema)], schema=self.arrow_schema)
+        self.writer.write_table(table, row_group_size=self.rows.row_group_size)
+
+    def close(self):
+        self.rows.flush()
+        self.writer.close()
+        self.closed = True
+
+    def cleanup(self):
+        if self.closed:
+            return
+        self.writer.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+class GeoPackageWriter(object):
+    '''
+    GeoPackage の属性テーブル（gpkg_contents の data_type が attributes）に出力
+    新しいカラムは ALTER TABLE で追加し（SQLite では既存の行を書き換えない）、行グループごとにコミットする
+    close する前に失敗した場合は、cleanup で途中まで出力したテーブルを削除する
+    '''
+    def __init__(self, conn, table, row_group_size=ROW_GROUP_SIZE):
+        self.rows = RowGroupBuffer(self.writeGroup, self.addColumn, row_group_size)
+        self.schema = self.rows.schema
+        self.closed = False
+        self.conn = conn
+        self.table = table
+        self.conn.execute("DROP TABLE IF EXISTS {0}".format(quoteName(table)))
+        self.conn.execute("DELETE FROM gpkg_contents WHERE table_name = ?", (table,))
+        self.conn.execute("CREATE TABLE {0} ({1} INTEGER PRIMARY KEY NOT NULL, {2} TEXT)".format(quoteName(table), quoteName(OID_COLUMN), quoteName(GML_ID_COLUMN)))
+        self.conn.execute("INSERT INTO gpkg_contents (table_name, data_type, identifier, description) VALUES (?, 'attributes', ?, ?)",
+                          (table, table, u"{0} の xml_genericAttributeSet".format(table)))
+        self.conn.commit()
+
+    def addColumn(self, name, fieldType):
+        self.conn.execute("ALTER TABLE {0} ADD COLUMN {1} {2}".format(quoteName(self.table), quoteName(name), SQLITE_TYPES.get(fieldType, "TEXT")))
+
+    def writeGroup(self, names, columns, n):
+        sql = "INSERT INTO {0} ({1}) VALUES ({2})".format(quoteName(self.table), ", ".join([quoteName(name) for name in names]), ", ".join(["?"] * len(names)))
+        self.conn.executemany(sql, zip(*columns))
+        self.conn.commit()
+
+    def close(self):
+        self.rows.flush()
+        with instr.phase(u"ファイル書込"):
+            self.conn.execute("CREATE INDEX {0} ON {1} ({2})".format(quoteName("idx_{0}_{1}".format(self.table, GML_ID_COLUMN)), quoteName(self.table), quoteName(GML_ID_COLUMN)))
+            self.conn.execute("UPDATE gpkg_contents SET last_change = strftime('%Y-%m-%dT%H:%M:%fZ', 'now') WHERE table_name = ?", (self.table,))
+            self.conn.commit()
+        self.closed = True
+
+    def cleanup(self):
+        if self.closed:
+            return
+        self.conn.rollback()
+        self.conn.execute("DROP TABLE IF EXISTS {0}".format(quoteName(self.table)))
+        self.conn.execute("DELETE FROM gpkg_contents WHERE table_name = ?", (self.table,))
+        self.conn.commit()
+
+def quoteName(name):
+    return '"{0}"'.format(name.replace('"', '""'))
+
+def openGeoPackage(path):
+    '''
+    GeoPackage を開く（存在しない場合は必須のテーブルを作成）
+    '''
+    conn = sqlite3.connect(path)
+    if conn.execute("SELECT COUNT(*) FROM sqlite_master WHERE name = 'gpkg_contents'").fetchone()[0] == 0:
+        conn.execute("PRAGMA application_id = {0}".format(GPKG_APPLICATION_ID))
+        conn.execute("PRAGMA user_version = {0}".format(GPKG_USER_VERSION))
+        conn.execute("CREATE TABLE gpkg_spatial_ref_sys (srs_name TEXT NOT NULL, srs_id INTEGER NOT NULL PRIMARY KEY, organization TEXT NOT NULL, "
+                     "organization_coordsys_id INTEGER NOT NULL, definition TEXT NOT NULL, description TEXT)")
+        conn.executemany("INSERT INTO gpkg_spatial_ref_sys VALUES (?, ?, ?, ?, ?, ?)", [
+            ("Undefined cartesian SRS", -1, "NONE", -1, "undefined", "undefined cartesian coordinate reference system"),
+            ("Undefined geographic SRS", 0, "NONE", 0, "undefined", "undefined geographic coordinate reference system"),
+            ("WGS 84 geodetic", 4326, "EPSG", 4326,
+             'GEOGCS["WGS 84",DATUM["WGS_1984",SPHEROID["WGS 84",6378137,298.257223563,AUTHORITY["EPSG","7030"]],AUTHORITY["EPSG","6326"]],'
+             'PRIMEM["Greenwich",0,AUTHORITY["EPSG","8901"]],UNIT["degree",0.0174532925199433,AUTHORITY["EPSG","9122"]],AUTHORITY["EPSG","4326"]]',
+             "longitude/latitude coordinates in decimal degrees on the WGS 84 spheroid")])
+        conn.execute("CREATE TABLE gpkg_contents (table_name TEXT NOT NULL PRIMARY KEY, data_type TEXT NOT NULL, identifier TEXT UNIQUE, "
+                     "description TEXT DEFAULT '', last_change DATETIME NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ','now')), "
+                     "min_x DOUBLE, min_y DOUBLE, max_x DOUBLE, max_y DOUBLE, srs_id INTEGER, "
+                     "CONSTRAINT fk_gc_r_srs_id FOREIGN KEY (srs_id) REFERENCES gpkg_spatial_ref_sys(srs_id))")
+        conn.execute("CREATE TABLE gpkg_geometry_columns (table_name TEXT NOT NULL, column_name TEXT NOT NULL, geometry_type_name TEXT NOT NULL, "
+                     "srs_id INTEGER NOT NULL, z TINYINT NOT NULL, m TINYINT NOT NULL, CONSTRAINT pk_geom_cols PRIMARY KEY (table_name, column_name))")
+        conn.commit()
+    return conn
+
+def collectColumnKeys(fc):
+    '''
+    xml_genericAttributeSet の子要素の開始タグの name, type だけを正規表現で取り出し、展開後の 'name:type' のキーを出現順に返却
+    （XMLは解析しない。キーは name の並びだけで決まるため、並びごとに calculate_genericAttributeSet_field と同じ規則でキーを作成）
+    '''
+    shapes = collections.OrderedDict()
+    with instr.phase(u"カラム収集") as p:
+        with arcpy.da.SearchCursor(fc, [XMLFIELDNAME]) as scur:
+            for r in scur:
+                p.rows += 1
+                if not r[0]:
+                    continue
+                shape = tuple((html.unescape(name), fieldType) for name, fieldType in ATTRIBUTE_PATTERN.findall(r[0]))
+                shapes[shape] = None
+        column_keys = collections.OrderedDict()
+        for shape in shapes:
+            for key in calgen.parse_cache.getKeys(shape):
+                if key is not None:
+                    column_keys[key] = None
+    return list(column_keys.keys())
+
+def iterParsedRecords(fc, id_field, num, workers):
+    '''
+    SearchCursor で (OBJECTID, gml_id, xml_genericAttributeSet) を読み込み、(OBJECTID, gml_id, 展開したディクショナリ) を読込順に返却
+    workers が 2 以上の場合は calculate_genericAttributeSet_field と同じくワーカープロセスで展開する
+    '''
+    fields = ["OID@", XMLFIELDNAME] + ([id_field] if id_field is not None else [])
+    read_phase = instr.phase(u"カーソル読込")
+    parse_phase = instr.phase(u"XML解析")
+    cnt = 0
+    if workers <= 1:
+        with arcpy.da.SearchCursor(fc, fields) as scur:
+            it = iter(scur)
+            while True:
+                start = time.time()
+                r = next(it, None)
+                read_end = time.time()
+                if r is None:
+                    break
+                read_phase.add(read_end - start, 1)
+                cnt += 1
+                instr.progress(u"xml_genericAttributeSet  読込", cnt, num)
+                row = calgen.createRowFromXmlfield(r[1]) if r[1] else {}
+                parse_phase.add(time.time() - read_end, 1)
+                yield r[0], (r[2] if id_field is not None else None), row
+        return
+
+    calgen.setMultiprocessingExecutable()
+    pending = collections.deque()
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        with arcpy.da.SearchCursor(fc, fields) as scur:
+            it = iter(scur)
+            while True:
+                start = time.time()
+                records = list(itertools.islice(it, calgen.PIPELINE_BATCH_SIZE))
+                read_phase.add(time.time() - start, len(records))
+                if len(records) > 0:
+                    ids = [r[2] if id_field is not None else None for r in records]
+                    future = executor.submit(calgen.parseXmlBatch, [(r[0], r[1]) for r in records if r[1]])
+                    pending.append((future, [r[0] for r in records], ids))
+                    cnt += len(records)
+                    instr.progress(u"xml_genericAttributeSet  読込", cnt, num)
+                # キューが一杯、または読込が終わった場合は、読込順に展開結果を受け取る
+                while len(pending) > 0 and (len(pending) >= calgen.PIPELINE_QUEUE_SIZE or len(records) == 0):
+                    future, oids, ids = pending.popleft()
+                    rows, parse_time, cache_stats = future.result()
+                    parse_phase.add(parse_time / workers, len(oids))
+                    parsed = dict(rows)
+                    for oid, gml_id in zip(oids, ids):
+                        yield oid, gml_id, parsed.get(oid, {})
+                if len(records) == 0:
+                    break
+
+def exportFeatureClass(fc, writer, workers):
+    '''
+    指定フィーチャクラスの xml_genericAttributeSet を展開して writer に出力し、出力した件数を返却
+    （失敗した場合も writer の一時ファイル、途中まで出力したテーブルは削除する）
+    '''
+    try:
+        num = int(arcpy.GetCount_management(fc).getOutput(0))
+        id_field = gattbl.getIdField(fc)
+        if id_field is None:
+            arcpy.AddWarning(u"{0} に *{1} フィールドがないため、gml_id は空で出力します".format(fc, GML_ID_FIELD_SUFFIX))
+        start = time.time()
+        calgen.parse_cache.resetStats()
+        for oid, gml_id, row in iterParsedRecords(fc, id_field, num, workers):
+            writer.rows.add(oid, gml_id, row)
+        writer.close()
+    finally:
+        writer.cleanup()
+    calgen.reportThroughput(u"{0} の出力".format(fc), writer.rows.count, time.time() - start)
+    if workers <= 1:
+        calgen.reportCacheStats(calgen.parse_cache.getStats())
+    arcpy.AddMessage(u"{0}: {1} カラムを出力しました".format(fc, len(writer.schema.columns)))
+    return writer.rows.count
+
+def exportGenericAttributeSet(gdb, out_folder, out_format=FORMAT_PARQUET, workers=None):
+    '''
+    GDB の FCNAMES のフィーチャクラスの xml_genericAttributeSet を展開して、out_folder に out_format の形式で出力
+    '''
+    if workers is None:
+        workers = calgen.PARSE_WORKERS
+    if not os.path.exists(out_folder):
+        os.makedirs(out_folder)
+    arcpy.env.workspace = gdb
+    fcs = [fc for fc in FCNAMES if arcpy.Exists(fc)]
+    conn = None
+    if out_format == FORMAT_GEOPACKAGE:
+        path = os.path.join(out_folder, os.path.splitext(os.path.basename(os.path.normpath(gdb)))[0] + GPKG_SUFFIX)
+        conn = openGeoPackage(path)
+    try:
+        for fc in fcs:
+            if XMLFIELDNAME not in [f.name for f in arcpy.ListFields(fc)]:
+                arcpy.AddWarning(u"{0} に {1} フィールドがないため処理をスキップします".format(fc, XMLFIELDNAME))
+                continue
+            if int(arcpy.GetCount_management(fc)[0]) == 0:
+                arcpy.AddWarning(u"{0} の レコードがないため処理をスキップします".format(fc))
+                continue
+            arcpy.AddMessage(u"{0} の xml_genericAttributeSet を {1} に出力します".format(fc, out_format))
+            if out_format == FORMAT_GEOPACKAGE:
+                writer = GeoPackageWriter(conn, fc)
+            else:
+                writer = ParquetWriter(os.path.join(out_folder, fc + ".parquet"), collectColumnKeys(fc))
+            exportFeatureClass(fc, writer, workers)
+    finally:
+        if conn is not None:
+            conn.close()
+
+def main():
+    try:
+        arcpy.AddMessage(u"処理開始：")
+
+        input_gdb = arcpy.GetParameterAsText(0)
+        out_folder = arcpy.GetParameterAsText(1)
+        out_format = FORMAT_PARQUET
+        if arcpy.GetArgumentCount() >= 3 and arcpy.GetParameterAsText(2) != "":
+            out_format = arcpy.GetParameterAsText(2).upper()
+        workers = None
+        if arcpy.GetArgumentCount() >= 4 and arcpy.GetParameterAsText(3) != "":
+            workers = int(arcpy.GetParameterAsText(3))
+
+        # 入力値のチェック
+        if os.path.splitext(input_gdb)[1].upper() != ".GDB":
+            arcpy.AddError(u"{0} は3D都市モデルの変換先ファイル ジオデータベースを選択する必要があります".format(input_gdb))
+            return
+        if out_format not in (FORMAT_PARQUET, FORMAT_GEOPACKAGE):
+            arcpy.AddError(u"出力形式は {0} または {1} を指定してください".format(FORMAT_PARQUET, FORMAT_GEOPACKAGE))
+            return
+        if out_format == FORMAT_PARQUET and pa is None:
+            arcpy.AddError(u"Parquet の出力には pyarrow が必要です。pyarrow をインストールするか、{0} を指定してください".format(FORMAT_GEOPACKAGE))
+            return
+
+        # 処理時間の計測を開始
+        instr.start("export_genericAttributeSet" + ("_parquet" if out_format == FORMAT_PARQUET else ""), input_gdb)
+        exportGenericAttributeSet(input_gdb, out_folder, out_format, workers)
+
+        # 段階ごとの処理時間を GDB と同じフォルダーに出力
+        instr.finish()
+
+        arcpy.AddMessage(u"処理終了：")
+    except arcpy.ExecuteError:
+        arcpy.AddError(arcpy.GetMessages(2))
+    except Exception as e:
+        err = e.args[0]
+        tb = sys.exc_info()[2]
+        tbinfo = traceback.format_tb(tb)[0]
+        pymsg = "PYTHON ERRORS:\nTraceback info:\n" + tbinfo + "\nError Info:\n" + str(err)
+        arcpy.AddError(pymsg)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,356 @@
+# coding:utf-8
+"""
+Name        :extract_building_attributes_v100.py
+Purpose     :FME（bldg_import_*.fmw）を使わずに、建物の CityGML ファイル（udx/bldg/*.gml）から属性だけを読み込み、
+             gml:id をキーにした1つの属性テーブルに出力するツール（分析用。形状は出力しない）
+
+             bldg_import_tokyo23_55cities_v112.fmw の変換では LOD2 までのマルチパッチを作成するため、属性だけが必要な場合でも
+             変換が終わるまで待つ必要があった。
+             ・CityGML ファイルを iterparse で先頭から順に読み込み、建物（bldg:Building）の終了タグで属性を取り出した後に要素を削除する
+               （ファイルの大きさに関わらず、メモリには読み込み中の1件の建物の要素のみを保持）
+             ・ファイルごとの読み込みをプロセスプールで並列処理し、テーブルへの書き込みはファイルの順に行う
+             ・出力する属性
+                 gml:id              → bldg_Building_gml_id（属性インデックスを作成）
+                 gml:name            → gml_name
+                 bldg:usage          → bldg_usage
+                 bldg:measuredHeight → bldg_measuredHeight（DOUBLE）
+                 uro:extendedAttribute の uro:key, uro:codeValue → uro_extendedAttribute_key<key>
+                 gen:stringAttribute など → gen_<name>（gen:genericAttributeSet の中の属性は gen_<セットの name>_<name>）
+             ・汎用属性のフィールド名は calculate_genericAttributeSet_field と同じ規則（同じ name の2つ目以降は _2 から付番、
+               gen_1/2500図郭 などの文字の置換、gen_FID の除外）で、schema_planner で使用できない文字、予約語を置換する
+             ・建物部分（bldg:BuildingPart）の属性は含めない
+             ・同じ gml:id の建物が複数のファイルにある場合は、最初に読み込んだ建物のみを出力する（gml:id がない建物は重複の判定をせずにすべて出力する）
+             ・名前空間は URL ではなく要素名で判定するため、i-UR 1.4 のURLのままのファイル（replace_iurUrl の実行前）も読み込める
+
+             パラメータ
+               0: 建物の CityGML ファイルのフォルダー（udx/bldg。サブフォルダーを含む。出力ファイル "o_*.gml" は対象外）
+               1: 出力テーブル（ファイル ジオデータベースのテーブル。既存の場合は削除して作成）
+               2: 並列処理するワーカープロセス数（省略可。省略時は CPU 数、上限 8。1 の場合は並列処理しない）
+Author      :
+Copyright   :
+Created     :2026/10/18
+Last Updated:2026/10/18
+ArcGIS Version: ArcGIS Pro 2.6 以上
+"""
+import arcpy
+import os
+import sys
+import time
+import collections
+import concurrent.futures
+import xml.etree.ElementTree as et
+import traceback
+
+# 汎用属性のフィールド名の規則は calculate_genericAttributeSet_field と共通
+import calculate_genericAttributeSet_field_v112 as calgen
+import instrumentation_v100 as instr
+import schema_planner_v100 as schplan
+# 値の変換は縦持ちのテーブルと共通
+import generic_attribute_table_v100 as gattbl
+# CityGML ファイルの一覧は replace_iurUrl と共通（出力ファイル "o_*.gml" は対象外）
+import replace_iurUrl_v100 as rplurl
+
+GML_ID_FIELD = "bldg_Building_gml_id"
+FILE_FIELD = "source_file"
+INDEX_NAME = "IDX_" + GML_ID_FIELD
+
+# 名前空間の判定に使用する URL の一部（CityGML 2.0 と 3.0、i-UR 1.4 ～ 3.0 で URL が異なるため）
+BUILDING_NS = "/building/"
+GENERICS_NS = "/generics/"
+GML_NS = "opengis.net/gml"
+URO_NS = "/uro/"
+
+# bldg:Building の属性 (要素名, 型)
+BUILDING_PROPERTIES = {"usage": "TEXT", "measuredHeight": "DOUBLE"}
+# 汎用属性の要素名と型（xml_genericAttributeSet の type と同じ）
+GENERIC_TYPES = {"stringAttribute": "TEXT", "intAttribute": "LONG", "doubleAttribute": "DOUBLE",
+                 "measureAttribute": "DOUBLE", "dateAttribute": "TEXT", "uriAttribute": "TEXT"}
+GENERIC_PREFIX = "gen_"
+EXTATTR_PREFIX = "uro_extendedAttribute_key"
+
+# 並列処理の上限と、処理中のファイル数の上限（ワーカー数の倍数）
+MAX_WORKERS = 8
+QUEUE_FACTOR = 2
+
+def splitTag(tag):
+    '''
+    '{名前空間}要素名' を (名前空間, 要素名) にする
+    '''
+    if tag[:1] == "{":
+        ns, local = tag[1:].split("}", 1)
+        return ns, local
+    return "", tag
+
+def getGmlId(elem):
+    for name, value in elem.attrib.items():
+        ns, local = splitTag(name)
+        if local == "id" and GML_NS in ns:
+            return value
+    return None
+
+def getText(elem):
+    text = elem.text
+    if text is None:
+        return None
+    text = text.strip()
+    return text if text != "" else None
+
+def readGenericAttributes(elem, prefix, shape, values):
+    '''
+    汎用属性の要素から (name, type) の並びと値を取得（gen:genericAttributeSet の中の属性は セットの name_ を付ける）
+    '''
+    for child in elem:
+        ns, local = splitTag(child.tag)
+        if GENERICS_NS not in ns:
+            continue
+        name = child.get("name")
+        if name is None:
+            continue
+        if local == "genericAttributeSet":
+            readGenericAttributes(child, prefix + name + "_", shape, values)
+            continue
+        fieldType = GENERIC_TYPES.get(local)
+        if fieldType is None:
+            continue
+        value = None
+        for v in child:
+            if splitTag(v.tag)[1] == "value":
+                value = getText(v)
+                break
+        shape.append((GENERIC_PREFIX + prefix + name, fieldType))
+        values.append(value)
+
+def readExtendedAttribute(elem, row):
+    '''
+    uro:extendedAttribute の uro:KeyValuePair を uro_extendedAttribute_key<key> の値にする
+    '''
+    for pair in elem.iter():
+        if splitTag(pair.tag)[1] != "KeyValuePair":
+            continue
+        key = None
+        value = None
+        for child in pair:
+            local = splitTag(child.tag)[1]
+            if local == "key":
+                key = getText(child)
+            elif local == "codeValue":
+                value = getText(child)
+        if key is not None:
+            row.setdefault("{0}{1}:TEXT".format(EXTATTR_PREFIX, calgen.sanitize_field_name(key)), value)
+
+def readBuilding(elem):
+    '''
+    bldg:Building の要素から (gml_id, {'name:type': 値}) を作成（子要素のみを対象にし、建物部分の属性は含めない）
+    '''
+    row = collections.OrderedDict()
+    shape = []
+    values = []
+    for child in elem:
+        ns, local = splitTag(child.tag)
+        if local == "name" and GML_NS in ns:
+            row.setdefault("gml_name:TEXT", getText(child))
+        elif BUILDING_NS in ns and local in BUILDING_PROPERTIES:
+            row.setdefault("bldg_{0}:{1}".format(local, BUILDING_PROPERTIES[local]), getText(child))
+        elif URO_NS in ns and local == "extendedAttribute":
+            readExtendedAttribute(child, row)
+    readGenericAttributes(elem, "", shape, values)
+    if len(shape) > 0:
+        # calculate_genericAttributeSet_field と同じ規則で 'name:type' のキーにする（gen_FID は None）
+        for key, value in zip(calgen.parse_cache.getKeys(tuple(shape)), values):
+            if key is not None:
+                row[key] = value
+    return getGmlId(elem), row
+
+def parseFile(path):
+    '''
+    ワーカープロセスで実行する処理。CityGML ファイルを先頭から順に読み込み、
+    (ファイル, [(gml_id, {'name:type': 値})], 処理時間, エラーメッセージ) を返却
+    '''
+    start = time.time()
+    records = []
+    depth = 0
+    root = None
+    try:
+        for event, elem in et.iterparse(path, events=("start", "end")):
+            if event == "start":
+                if root is None:
+                    root = elem
+                depth += 1
+                continue
+            depth -= 1
+            ns, local = splitTag(elem.tag)
+            if local == "Building" and BUILDING_NS in ns:
+                records.append(readBuilding(elem))
+                elem.clear()
+            elif depth == 1:
+                # ルート要素の子要素（cityObjectMember, appearanceMember など）の終わりで、読み込んだ要素を削除
+                root.clear()
+    except et.ParseError as e:
+        return path, records, time.time() - start, str(e)
+    return path, records, time.time() - start, None
+
+def iterParsedFiles(files, workers):
+    '''
+    ファイルの順に parseFile の結果を返却（workers が 2 以上の場合はプロセスプールで並列処理）
+    '''
+    if workers <= 1:
+        for path in files:
+            yield parseFile(path)
+        return
+    calgen.setMultiprocessingExecutable()
+    pending = collections.deque()
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        it = iter(files)
+        while True:
+            while len(pending) < workers * QUEUE_FACTOR:
+                path = next(it, None)
+                if path is None:
+                    break
+                pending.append(executor.submit(parseFile, path))
+            if len(pending) == 0:
+                break
+            yield pending.popleft().result()
+
+class AttributeTableWriter(object):
+    '''
+    読み込んだ建物の属性を出力テーブルに追加するクラス
+    新しい 'name:type' のキーが出てきたファイルの書き込み前に、schema_planner でフィールドを追加する
+    '''
+    def __init__(self, out_table):
+        self.table = out_table
+        out_ws, out_name = os.path.split(out_table)
+        if arcpy.Exists(out_table):
+            arcpy.Delete_management(out_table)
+        arcpy.CreateTable_management(out_ws, out_name)
+        arcpy.AddFields_management(out_table, [[GML_ID_FIELD, "TEXT", "", 255, None, ""], [FILE_FIELD, "TEXT", "", 255, None, ""]])
+        self.plan = schplan.SchemaPlan([out_table], out_ws)
+        # キーごとの (フィールドの位置, 値の変換関数)
+        self.columns = {}
+        self.fields = []
+        self.seen = set()
+        self.buildings = 0
+        self.duplicates = 0
+        self.missing_ids = 0
+
+    def addKeys(self, records):
+        new_keys = []
+        known = set()
+        for gml_id, row in records:
+            for key in row:
+                if key not in self.columns and key not in known:
+                    known.add(key)
+                    new_keys.append(key)
+        if len(new_keys) == 0:
+            return
+        with instr.phase(u"フィールド追加"):
+            names = schplan.planAndAddFields(self.table, new_keys, self.plan)
+        for key, name in zip(new_keys, names):
+            self.columns[key] = (len(self.fields), gattbl.CONVERTERS.get(key.split(":")[1].upper()))
+            self.fields.append(name)
+
+    def write(self, path, records):
+        self.addKeys(records)
+        file_name = os.path.basename(path)
+        with instr.phase(u"テーブル書込") as p:
+            with arcpy.da.InsertCursor(self.table, [GML_ID_FIELD, FILE_FIELD] + self.fields) as icur:
+                for gml_id, row in records:
+                    if gml_id is None:
+                        # gml:id がない建物は重複の判定ができないため、すべて出力する
+                        self.missing_ids += 1
+                    elif gml_id in self.seen:
+                        self.duplicates += 1
+                        continue
+                    else:
+                        self.seen.add(gml_id)
+                    values = [None] * len(self.fields)
+                    for key, value in row.items():
+                        i, converter = self.columns[key]
+                        values[i] = converter(value) if converter is not None else value
+                    icur.insertRow([gml_id, file_name] + values)
+                    p.rows += 1
+                    self.buildings += 1
+
+    def close(self):
+        if self.duplicates > 0:
+            arcpy.AddWarning(u"gml:id が重複する {0} 件の建物は、最初に読み込んだ建物のみを出力しました".format(self.duplicates))
+        if self.missing_ids > 0:
+            arcpy.AddWarning(u"gml:id がない {0} 件の建物は、gml_id を空にして出力しました".format(self.missing_ids))
+        with instr.phase(u"インデックス作成"):
+            arcpy.AddIndex_management(self.table, [GML_ID_FIELD], INDEX_NAME)
+
+def extractBuildingAttributes(folder, out_table, workers=None):
+    '''
+    フォルダー以下の CityGML ファイルの建物の属性を out_table に出力して、出力した建物の件数を返却
+    '''
+    if workers is None or workers <= 0:
+        workers = min(os.cpu_count() or 1, MAX_WORKERS)
+    with instr.phase(u"ファイル一覧"):
+        files = [os.path.join(folder, rel) for rel in rplurl.listGmlFiles(folder)]
+    num = len(files)
+    if num == 0:
+        arcpy.AddError(u"{0} には処理対象のCityGML ファイル（*.gml）がありません。".format(folder))
+        return 0
+    workers = max(1, min(workers, num))
+    arcpy.AddMessage(u"{0} ファイルの建物の属性を読み込みます（並列処理数: {1}）".format(num, workers))
+
+    start = time.time()
+    writer = AttributeTableWriter(out_table)
+    parse_phase = instr.phase(u"CityGML 解析")
+    cnt = 0
+    errors = 0
+    for path, records, secs, error in iterParsedFiles(files, workers):
+        cnt += 1
+        parse_phase.add(secs, len(records))
+        instr.count(u"バイト数", os.path.getsize(path))
+        if error is not None:
+            errors += 1
+            arcpy.AddWarning(u"{0} の読み込み中にエラーが発生したため、エラーまでの {1} 件の建物を出力します（{2}）".format(os.path.basename(path), len(records), error))
+        writer.write(path, records)
+        instr.progress(u"CityGML 読込", cnt, num)
+    writer.close()
+
+    instr.count(u"ファイル数", num)
+    instr.count(u"建物数", writer.buildings)
+    instr.count(u"フィールド数", len(writer.fields))
+    if errors > 0:
+        instr.count(u"エラー", errors)
+    calgen.reportThroughput(u"{0} ファイルの建物の属性の出力".format(num), writer.buildings, time.time() - start)
+    arcpy.AddMessage(u"{0} に {1} 件の建物、{2} 個の属性を出力しました".format(out_table, writer.buildings, len(writer.fields)))
+    return writer.buildings
+
+def main():
+    try:
+        arcpy.AddMessage(u"処理開始：")
+
+        folder = arcpy.GetParameterAsText(0)
+        out_table = arcpy.GetParameterAsText(1)
+        workers = None
+        if arcpy.GetArgumentCount() >= 3 and arcpy.GetParameterAsText(2) != "":
+            workers = int(arcpy.GetParameterAsText(2))
+
+        # 入力値のチェック
+        if not os.path.isdir(folder):
+            arcpy.AddError(u"{0} は建物の CityGML ファイルのフォルダーを選択する必要があります".format(folder))
+            return
+        gdb = os.path.dirname(out_table)
+        if os.path.splitext(gdb)[1].upper() != ".GDB":
+            arcpy.AddError(u"{0} はファイル ジオデータベースのテーブルを指定する必要があります".format(out_table))
+            return
+
+        # 処理時間の計測を開始
+        instr.start("extract_building_attributes", gdb)
+        extractBuildingAttributes(folder, out_table, workers)
+        instr.finish()
+
+        arcpy.AddMessage(u"処理終了：")
+    except arcpy.ExecuteError:
+        arcpy.AddError(arcpy.GetMessages(2))
+    except Exception as e:
+        err = e.args[0]
+        tb = sys.exc_info()[2]
+        tbinfo = traceback.format_tb(tb)[0]
+        pymsg = "PYTHON ERRORS:\nTraceback info:\n" + tbinfo + "\nError Info:\n" + str(err)
+        arcpy.AddError(pymsg)
+
+if __name__ == '__main__':
+    main()
@@ -9,20 +9,25 @@ Purpose     :3D都市モデルの建物（Building）で、gml:name 属性の型
              そのようなケースに対応するため、拡張属性のコード値ドメインの割り当てツール で書いたXML からディクショナリに読み込む実装を使って、
              gml_name の属性に格納されているコードの値を、Building_name.xml 内のgml:description の説明で置換するツールを作成しました。
              
+            v100 → v101 の更新内容
+             ・置換処理を resolve_codeType_v100 の処理に変更（コードの値が入っているレコードのみ読み込み、値が変わるレコードのみ書き込む）
+             ・1件ごとの置換メッセージを廃止し、フィーチャクラスごとの件数のみ表示
+             ・段階ごとの処理時間を計測して GDB と同じフォルダーにJSONで出力
 Author      :
 Copyright   :
 Created     :2022/11/19
-Last Updated:
+Last Updated:2026/10/18
 ArcGIS Version: ArcGIS Pro 2.6 以上
 """
 import arcpy
 import os
-import xml.etree.ElementTree as et
-import pandas as pd
+import sys
 import traceback #v112
 
 # 使いまわし可能な関数をimport 
 import assign_extendedAttributes_v113 as exattr
+import resolve_codeType_v100 as rslv
+import instrumentation_v100 as instr
 
 # 文字列置換の対象フィールド名
 FIELDNAME = "gml_name"
@@ -52,8 +57,12 @@ def main():
 
         arcpy.env.workspace = gdb
 
+        # v101: 処理時間の計測を開始
+        instr.start("field_calculate_buildingName", gdb)
+
         # 1) Building_name.xml をもとに、コード値と説明を取得する
-        domainName, domainDict = exattr.createDomainValues(building_name_xml)
+        with instr.phase(u"コードリスト解析"):
+            domainName, domainDict = exattr.createDomainValues(building_name_xml)
 
         # 2) gml_name フィールドのコード値から説明へ置換
         for fc in FCNAMES:
@@ -61,28 +70,17 @@ def main():
                 num = int(arcpy.GetCount_management(fc).getOutput(0))
                 if num > 0:
                     arcpy.AddMessage(u"{0} の gml_name  コード値 を説明 へ置換する処理を開始します".format(fc))
-                    # 文字列置換の対象フィールド名
-                    update_fields = [FIELDNAME]
-                    cnt = 0
-                    i = 0
-                    with arcpy.da.UpdateCursor(fc, update_fields) as cur:
-                        for r in cur:
-                            cnt += 1
-                            if (cnt == 1) or (cnt == num) or (cnt % 10000 == 1):
-                                s = u"{0}/{1}の gml_name のコード値 を説明 へ置換中・・・".format(cnt, num)
-                                arcpy.AddMessage(s)
-                            key = r[0]
-                            if not key == None:
-                                desc = domainDict.get(key) # ディクショナリからdescription を取得(例外が発生しないようにgetで取得)
-                                if not desc == None:
-                                    arcpy.AddMessage(u"{0} を {1} へ置換します".format(key, desc))
-                                    r[0] = desc
-                                    i += 1
-                            cur.updateRow(r)
+                    # v101: コードの値が入っているレコードのみを読み込み、値が変わるレコードだけを書き込む
+                    with instr.phase(u"カーソル書込") as p:
+                        visited, i = rslv.resolveCodeTypeField(fc, FIELDNAME, domainDict)
+                        p.rows += visited
                     arcpy.AddMessage(u"{0} の gml_name  コード値 {1} 件を説明 へ置換しました".format(fc, i))
                 else:
                     arcpy.AddWarning(u"{0} の レコードがないため処理をスキップします".format(fc))
 
+        # v101: 段階ごとの処理時間を GDB と同じフォルダーに出力
+        instr.finish()
+
         arcpy.AddMessage(u"処理終了：")
     except arcpy.ExecuteError:
         arcpy.AddError(arcpy.GetMessages(2))
@@ -12,18 +12,22 @@ Purpose     :CityGML の設計上、lod0_AreaClassification (lod0_区域区分)
                lod0_AreaClassification_kyojuyudo;居住誘導区域;urf_class in ('31')
                lod0_AreaClassification_tosiyudo;都市機能誘導区域;urf_class in ('32')
                
+             v100 → v101 の更新内容
+             ・filter_export_DistrictAndZones と同様に、入力のフィーチャクラスを1回だけ読み込んで出力するように変更（urf_splitter_v100）
 Author      :
 Copyright   :
 Created     :2021/12/27
-Last Updated:2021/12/27
+Last Updated:2026/10/18
 ArcGIS Version: ArcGIS Pro 2.6 以上
 """
 import arcpy
 import os
+import sys
 import traceback
 
 # 使いまわし可能な関数をimport 
 import filter_export_DistrictAndZones_v100 as flexp
+import instrumentation_v100 as instr
 
 #フィルタ条件を設定する対象のフィールド
 CONFIG_PATH = "config"
@@ -55,7 +59,9 @@ def main():
 
         config_file = getConfigFile() # Export 条件を設定したファイルを指定
         
+        instr.start("filter_export_AreaClassification", os.path.dirname(input_fc)) # 処理時間の計測を開始
         flexp.filterExport(input_fc, out_ws, config_file)
+        instr.finish() # 段階ごとの処理時間を GDB と同じフォルダーに出力
 
         arcpy.AddMessage(u"処理終了：")
     except arcpy.ExecuteError:
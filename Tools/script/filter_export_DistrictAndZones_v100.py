@@ -12,16 +12,25 @@ Purpose     :CityGML の設計上、lod0_DistrictAndZones (lod0_地域地区) 
                lod0_DistrictAndZones_tokuyoto;特別用途地区;urf_class in ('14')
                ～省略～
                
+             v100 → v101 の更新内容
+             ・設定ファイルの行ごとに SelectLayerByAttribute, GetCount, FeatureClassToFeatureClass を実行していたのを、
+               クエリを振り分け表に変換して入力のフィーチャクラスを1回だけ読み込んで出力するように変更（urf_splitter_v100）
 Author      :
 Copyright   :
 Created     :2021/12/27
-Last Updated:2021/12/27
+Last Updated:2026/10/18
 ArcGIS Version: ArcGIS Pro 2.6 以上
 """
 import arcpy
 import os
+import sys
 import traceback
 
+# 処理時間の計測
+import instrumentation_v100 as instr
+# 設定ファイルのクエリごとの振り分け
+import urf_splitter_v100 as urfspl
+
 #フィルタ条件を設定する対象のフィールド
 CONFIG_PATH = "config"
 CONFIG_FILENAME = r"config_地域地区_分類出力.txt"
@@ -50,32 +59,9 @@ def filterExport(input_fc, out_ws, config_file):
             arcpy.AddError(u"設定ファイル: {0} が存在しません".format(config_file))
             return
         
-        # 設定ファイルから出力フィーチャクラス、エイリアス、フィルタ条件を読み込み
-        exportParams = []
-        with open(config_file, encoding='utf-8') as f:
-            next(f) # ヘッダーは読み飛ばす
-            for line in f:
-                line = line.rstrip("\n")
-                params = line.split(";")
-                exportParams.append(params)
-        
         # 設定ファイルから出力フィーチャクラス、エイリアス、フィルタ条件を読み込みし、
-        # クエリ後 > 0 の場合にFeatureClassToFeatureClass でエクスポート
-        for p in exportParams:
-            outfc_name = p[0] #出力フィーチャクラス
-            alias_name = p[1] #エイリアス
-            expression = p[2] #フィルタ条件
-            lyr = arcpy.SelectLayerByAttribute_management(input_fc, "NEW_SELECTION", expression)
-            cnt = int(arcpy.GetCount_management(lyr).getOutput(0))
-            if cnt > 0:
-                arcpy.AddMessage(u"{0} ({1}) へエクスポート".format(outfc_name, alias_name))
-                out_fc = os.path.join(out_ws, outfc_name)
-                if arcpy.Exists(out_fc): #既存のフィーチャクラスがある場合は削除
-                    arcpy.Delete_management(out_fc)
-                arcpy.FeatureClassToFeatureClass_conversion(input_fc, out_ws, outfc_name, expression)
-                arcpy.AlterAliasName(out_fc, alias_name)
-            else:
-                arcpy.AddWarning(u"{0} ({1}) は該当データがないためエクスポートをスキップしました".format(outfc_name, alias_name))
+        # 入力のフィーチャクラスの1回の読み込みで、該当データがある出力のみエクスポート
+        urfspl.splitByConfig(input_fc, out_ws, config_file)
         
     except arcpy.ExecuteError:
         arcpy.AddError(arcpy.GetMessages(2))
@@ -107,7 +93,9 @@ def main():
         
         config_file = getConfigFile() # Export 条件を設定したファイルを指定
         
+        instr.start("filter_export_DistrictAndZones", os.path.dirname(input_fc)) # 処理時間の計測を開始
         filterExport(input_fc, out_ws, config_file)
+        instr.finish() # 段階ごとの処理時間を GDB と同じフォルダーに出力
 
         arcpy.AddMessage(u"処理終了：")
     except arcpy.ExecuteError:
@@ -0,0 +1,224 @@
+# coding:utf-8
+"""
+Name        :generic_attribute_table_v100.py
+Purpose     :xml_genericAttributeSet を展開した汎用属性を、フィールドを追加せずに1つの縦持ちのテーブル
+             （フィーチャクラス名, OBJECTID, gml_id, 属性名, 型, 値）に格納する共通処理（calculate_genericAttributeSet_field の LONG モード）と、
+             指定した属性のみを横持ちに変換（ピボット）して取得する処理。
+
+             フィールドに展開すると、市区町村ごとに異なる汎用属性の和集合のフィールドが全てのフィーチャクラスに追加され、
+             ほとんどの値が空のフィールドが数百になるため、処理時間と GDB のサイズが レコード数 × フィールド数 に比例していた。
+             縦持ちのテーブルには値がある属性のみを格納するため、処理時間とサイズは値の件数に比例する。
+             ・テーブルは GDB に TABLE_NAME の名前で作成し、属性名、gml_id の属性インデックスを作成する
+             ・属性名は calculate_genericAttributeSet_field と同じ展開処理の名前（同じ name の _2 付番、gen_1/2500図郭 などの文字の置換）
+             ・フィーチャクラスごとに既存の行を削除してから追加するため、同じ GDB に繰り返し実行できる
+             ・値は文字列で格納し、ピボット時に型（LONG, DOUBLE など）に変換する
+
+             ピボットの使用例（Python ウィンドウなど）
+               import generic_attribute_table_v100 as gattbl
+               values = gattbl.pivotAttributes(r"C:\\data\\xxx.gdb", ["gen_建物ID", "gen_地上階数"], "lod0_Building")
+               gattbl.pivotToTable(r"C:\\data\\xxx.gdb", ["gen_建物ID", "gen_地上階数"], r"C:\\data\\xxx.gdb\\pivot_Building", "lod0_Building")
+Author      :
+Copyright   :
+Created     :2026/10/18
+Last Updated:2026/10/18
+ArcGIS Version: ArcGIS Pro 2.6 以上
+"""
+import arcpy
+import os
+import time
+import collections
+
+import instrumentation_v100 as instr
+import schema_planner_v100 as schplan
+
+# 縦持ちのテーブル名とフィールド
+TABLE_NAME = "genericAttributeSet_values"
+FC_FIELD = "fc_name"
+OID_FIELD = "src_oid"
+GML_ID_FIELD = "gml_id"
+NAME_FIELD = "attr_name"
+TYPE_FIELD = "attr_type"
+VALUE_FIELD = "attr_value"
+# 値のフィールドの長さ（超える値は切り詰めて警告）
+VALUE_LENGTH = 4000
+# (フィールド名, 型, 長さ)
+TABLE_FIELDS = [(FC_FIELD, "TEXT", 64), (OID_FIELD, "LONG", None), (GML_ID_FIELD, "TEXT", 255),
+                (NAME_FIELD, "TEXT", 255), (TYPE_FIELD, "TEXT", 16), (VALUE_FIELD, "TEXT", VALUE_LENGTH)]
+
+# 属性インデックス (インデックス名, フィールド)
+TABLE_INDEXES = [("IDX_" + NAME_FIELD, NAME_FIELD), ("IDX_" + GML_ID_FIELD, GML_ID_FIELD)]
+
+GML_ID_FIELD_SUFFIX = "_gml_id"
+
+# 'name:type' の type ごとの値の変換関数（TEXT 以外で変換できない値は None）
+def toInteger(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+def toDouble(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+CONVERTERS = {"LONG": toInteger, "SHORT": toInteger, "DOUBLE": toDouble, "FLOAT": toDouble}
+
+def getIdField(fc):
+    '''
+    フィーチャの gml_id を格納している *_gml_id フィールド（複数ある場合は最初のフィールド）を返却
+    '''
+    names = [f.name for f in arcpy.ListFields(fc) if f.name.lower().endswith(GML_ID_FIELD_SUFFIX)]
+    return names[0] if len(names) > 0 else None
+
+def readGmlIds(fc, id_field):
+    '''
+    {OBJECTID: gml_id} を作成（id_field が None の場合は空）
+    '''
+    if id_field is None:
+        return {}
+    with arcpy.da.SearchCursor(fc, ["OID@", id_field]) as scur:
+        return dict((r[0], r[1]) for r in scur)
+
+def createTable(gdb, table_name=TABLE_NAME):
+    '''
+    縦持ちのテーブルを作成（既存の場合はそのまま使用）して、テーブルのパスを返却
+    '''
+    table = os.path.join(gdb, table_name)
+    if not arcpy.Exists(table):
+        arcpy.AddMessage(u"{0} テーブルを作成します".format(table_name))
+        arcpy.CreateTable_management(gdb, table_name)
+        arcpy.AddFields_management(table, [[name, fieldType, "", length, None, ""] for name, fieldType, length in TABLE_FIELDS])
+    return table
+
+def createIndexes(table):
+    '''
+    属性名、gml_id の属性インデックスを作成（作成済みのものはスキップ）
+    '''
+    existing = set([i.name.upper() for i in arcpy.ListIndexes(table)])
+    for index_name, field in TABLE_INDEXES:
+        if index_name.upper() not in existing:
+            arcpy.AddIndex_management(table, [field], index_name)
+
+def createFcWhereClause(table, fc):
+    return "{0} = '{1}'".format(arcpy.AddFieldDelimiters(table, FC_FIELD), fc.replace("'", "''"))
+
+def deleteRows(table, fc):
+    '''
+    指定フィーチャクラスの既存の行を削除して、削除した件数を返却
+    '''
+    cnt = 0
+    with arcpy.da.UpdateCursor(table, ["OID@"], createFcWhereClause(table, fc)) as cur:
+        for r in cur:
+            cur.deleteRow()
+            cnt += 1
+    return cnt
+
+class LongTableWriter(object):
+    '''
+    (OBJECTID, gml_id, 展開したディクショナリ) の値がある属性を、縦持ちのテーブルに1行ずつ追加するクラス
+    フィーチャクラスごとに1つの InsertCursor で追加し、インデックスは close で全ての追加が終わった後に作成する
+    '''
+    def __init__(self, gdb, table_name=TABLE_NAME):
+        self.table = createTable(gdb, table_name)
+        self.truncated = 0
+
+    def writeFeatureClass(self, fc, records):
+        '''
+        指定フィーチャクラスの既存の行を削除してから records を追加し、(フィーチャ数, 値の件数) を返却
+        '''
+        with instr.phase(u"既存の行の削除") as p:
+            p.rows += deleteRows(self.table, fc)
+        # 展開の処理時間を含めないように、追加の処理時間のみを加算
+        write_phase = instr.phase(u"テーブル書込")
+        features = 0
+        values = 0
+        with arcpy.da.InsertCursor(self.table, [f[0] for f in TABLE_FIELDS]) as icur:
+            for oid, gml_id, row in records:
+                start = time.time()
+                features += 1
+                n = 0
+                for key in row:
+                    value = row[key]
+                    if value is None:
+                        continue
+                    if len(value) > VALUE_LENGTH:
+                        value = value[:VALUE_LENGTH]
+                        self.truncated += 1
+                    name, fieldType = key.split(":")
+                    icur.insertRow((fc, oid, gml_id, name, fieldType, value))
+                    n += 1
+                values += n
+                write_phase.add(time.time() - start, n)
+        return features, values
+
+    def close(self):
+        if self.truncated > 0:
+            arcpy.AddWarning(u"{0} 文字を超える {1} 件の値は {0} 文字までを格納しました".format(VALUE_LENGTH, self.truncated))
+        with instr.phase(u"インデックス作成"):
+            createIndexes(self.table)
+
+def getTablePath(gdb_or_table):
+    '''
+    GDB を指定した場合は GDB の TABLE_NAME のテーブル、テーブルを指定した場合はそのまま返却
+    '''
+    if os.path.splitext(os.path.normpath(gdb_or_table))[1].upper() == ".GDB":
+        return os.path.join(gdb_or_table, TABLE_NAME)
+    return gdb_or_table
+
+def pivotAttributes(gdb_or_table, names, fc=None, key_field=GML_ID_FIELD):
+    '''
+    縦持ちのテーブルから指定した属性名の値を取得し、({キー: {属性名: 値}}, {属性名: 型}) を返却
+    キーは gml_id（key_field に OID_FIELD を指定した場合は OBJECTID。fc の指定が必要）
+    値は型に変換し、同じ属性名で型が異なる場合は最初に出現した型に変換する
+    '''
+    if key_field == OID_FIELD and fc is None:
+        raise ValueError(u"OBJECTID をキーにする場合はフィーチャクラスを指定してください")
+    table = getTablePath(gdb_or_table)
+    name_list = ", ".join(["'{0}'".format(n.replace("'", "''")) for n in names])
+    where_clause = "{0} IN ({1})".format(arcpy.AddFieldDelimiters(table, NAME_FIELD), name_list)
+    if fc is not None:
+        where_clause = createFcWhereClause(table, fc) + " AND " + where_clause
+    records = collections.OrderedDict()
+    types = collections.OrderedDict((n, None) for n in names)
+    with arcpy.da.SearchCursor(table, [key_field, NAME_FIELD, TYPE_FIELD, VALUE_FIELD], where_clause) as scur:
+        for key, name, fieldType, value in scur:
+            if types.get(name) is None:
+                types[name] = fieldType.upper()
+            converter = CONVERTERS.get(types[name])
+            record = records.get(key)
+            if record is None:
+                record = {}
+                records[key] = record
+            record[name] = converter(value) if converter is not None else value
+    return records, types
+
+def pivotToTable(gdb_or_table, names, out_table, fc=None, key_field=GML_ID_FIELD):
+    '''
+    pivotAttributes の結果を、キーと指定した属性名のフィールドを持つテーブル（out_table）に出力して、出力した件数を返却
+    フィールド名は schema_planner と同じ規則で、使用できない文字、予約語を置換する
+    '''
+    records, types = pivotAttributes(gdb_or_table, names, fc, key_field)
+    out_ws, out_name = os.path.split(out_table)
+    if arcpy.Exists(out_table):
+        arcpy.Delete_management(out_table)
+    arcpy.CreateTable_management(out_ws, out_name)
+    fields = [[key_field, "LONG" if key_field == OID_FIELD else "TEXT", "", None if key_field == OID_FIELD else 255, None, ""]]
+    used = set([key_field.upper()])
+    for name in names:
+        field_name = schplan.validateFieldName(name, out_ws)
+        n = 1
+        base = field_name
+        while field_name.upper() in used:
+            n += 1
+            field_name = schplan.createSuffixedName(base, n)
+        used.add(field_name.upper())
+        fieldType = types.get(name) or "TEXT"
+        fields.append([field_name, fieldType, name, VALUE_LENGTH if fieldType == "TEXT" else None, None, ""])
+    arcpy.AddFields_management(out_table, fields)
+    with arcpy.da.InsertCursor(out_table, [f[0] for f in fields]) as icur:
+        for key, record in records.items():
+            icur.insertRow([key] + [record.get(name) for name in names])
+    arcpy.AddMessage(u"{0} に {1} 件を出力しました".format(out_table, len(records)))
+    return len(records)
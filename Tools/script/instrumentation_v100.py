@@ -0,0 +1,235 @@
+# coding:utf-8
+"""
+Name        :instrumentation_v100.py
+Purpose     :スクリプトツールの処理時間を計測する共通処理。
+             処理の段階（コードリスト解析、AddField、カーソル読込、XML解析、カーソル書込、ドメイン適用 など）ごとに
+             処理時間と件数を集計し、ピークメモリを取得して、実行ごとの結果をJSONファイルに出力する。
+             都市やツールのバージョンごとに結果を比較して、どの段階を改善すべきか確認するために使用する。
+
+             例）
+               import instrumentation_v100 as instr
+               instr.start("calculate_genericAttributeSet_field", gdb)
+               with instr.phase(u"カーソル読込") as p:
+                   for r in cur:
+                       p.rows += 1
+                       instr.progress(u"xml_genericAttributeSet  読込", p.rows, num)
+               instr.finish() # <GDBのフォルダー>\\<GDB名>_<ツール名>_<日時>.json に出力
+Author      :
+Copyright   :
+Created     :2026/10/18
+Last Updated:2026/10/18
+ArcGIS Version: ArcGIS Pro 2.6 以上
+"""
+import os
+import sys
+import json
+import time
+import datetime
+import platform
+import tracemalloc
+
+import arcpy
+
+# 進捗表示のメッセージを出力する間隔（件数）
+PROGRESS_INTERVAL = 10000
+
+# tracemalloc で Python のメモリ確保も計測する場合は True（処理が遅くなるので通常は False）
+TRACE_PYTHON_MEMORY = False
+
+def getPeakMemory():
+    '''
+    プロセスのピークメモリ(バイト)を取得（取得できない場合は None）
+    '''
+    try:
+        if sys.platform == "win32":
+            import ctypes
+            from ctypes import wintypes
+            class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+                _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD),
+                            ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                            ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                            ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t), ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                            ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t)]
+            counters = PROCESS_MEMORY_COUNTERS()
+            counters.cb = ctypes.sizeof(counters)
+            handle = ctypes.windll.kernel32.GetCurrentProcess()
+            if ctypes.windll.psapi.GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb):
+                return counters.PeakWorkingSetSize
+            return None
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    except Exception:
+        return None
+
+def formatSeconds(sec):
+    '''
+    秒を h:mm:ss の形式にする
+    '''
+    sec = int(sec)
+    return "{0}:{1:02d}:{2:02d}".format(sec // 3600, (sec % 3600) // 60, sec % 60)
+
+class Phase(object):
+    '''
+    処理の段階ごとの処理時間と件数
+    '''
+    def __init__(self, name):
+        self.name = name
+        self.seconds = 0.0
+        self.calls = 0
+        self.rows = 0
+        self.started = None
+
+    def __enter__(self):
+        self.started = time.time()
+        self.calls += 1
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.seconds += time.time() - self.started
+        self.started = None
+        return False
+
+    def add(self, seconds, rows=0):
+        '''
+        with を使わずに処理時間と件数を加算（1件ごとの処理を段階に振り分ける場合など）
+        '''
+        self.seconds += seconds
+        self.rows += rows
+
+    def toDict(self):
+        rate = self.rows / self.seconds if (self.seconds > 0 and self.rows > 0) else None
+        return {"seconds": round(self.seconds, 3), "calls": self.calls, "rows": self.rows, "rows_per_sec": rate}
+
+class RunProfiler(object):
+    '''
+    1回の実行の計測結果
+    '''
+    def __init__(self, tool, gdb=None):
+        self.tool = tool
+        self.gdb = gdb
+        self.started = time.time()
+        self.started_at = datetime.datetime.now()
+        self.phases = {}
+        self.counters = {}
+        self.progress_started = {}
+        self.peak_memory = None
+        self.peak_python_memory = None
+        if TRACE_PYTHON_MEMORY and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def phase(self, name):
+        p = self.phases.get(name)
+        if p is None:
+            p = Phase(name)
+            self.phases[name] = p
+        return p
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def sampleMemory(self):
+        peak = getPeakMemory()
+        if peak is not None:
+            self.peak_memory = max(self.peak_memory or 0, peak)
+        if tracemalloc.is_tracing():
+            self.peak_python_memory = max(self.peak_python_memory or 0, tracemalloc.get_traced_memory()[1])
+
+    def progress(self, label, cnt, num, force=False):
+        '''
+        件数/秒 と残り時間の目安をつけた進捗表示のメッセージを出力（PROGRESS_INTERVAL 件ごと）
+        '''
+        now = time.time()
+        if cnt <= 1 or label not in self.progress_started:
+            self.progress_started[label] = (now, cnt)
+        if not (force or (cnt == 1) or (cnt == num) or (cnt % PROGRESS_INTERVAL == 1)):
+            return
+        self.sampleMemory()
+        start, start_cnt = self.progress_started[label]
+        elapsed = now - start
+        done = cnt - start_cnt
+        if elapsed > 0 and done > 0:
+            rate = done / elapsed
+            eta = formatSeconds(max(num - cnt, 0) / rate)
+            arcpy.AddMessage(u"{0}/{1}の {2}処理中・・・（{3:.0f} 件/秒, 残り約 {4}）".format(cnt, num, label, rate, eta))
+        else:
+            arcpy.AddMessage(u"{0}/{1}の {2}処理中・・・".format(cnt, num, label))
+
+    def toDict(self):
+        self.sampleMemory()
+        data = {
+            "tool": self.tool,
+            "gdb": self.gdb,
+            "started": self.started_at.isoformat(),
+            "elapsed_sec": round(time.time() - self.started, 3),
+            "peak_memory_mb": round(self.peak_memory / 1048576.0, 1) if self.peak_memory else None,
+            "phases": dict((name, self.phases[name].toDict()) for name in self.phases),
+            "counters": self.counters,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        }
+        if self.peak_python_memory is not None:
+            data["peak_python_memory_mb"] = round(self.peak_python_memory / 1048576.0, 1)
+        return data
+
+    def getReportPath(self, folder=None):
+        '''
+        結果を出力するファイルのパス。GDB と同じフォルダーに <GDB名>_<ツール名>_<日時>.json
+        '''
+        if folder is None:
+            folder = os.path.dirname(os.path.normpath(self.gdb)) if self.gdb else os.getcwd()
+        base = os.path.splitext(os.path.basename(os.path.normpath(self.gdb)))[0] if self.gdb else "run"
+        return os.path.join(folder, "{0}_{1}_{2}.json".format(base, self.tool, self.started_at.strftime("%Y%m%d_%H%M%S")))
+
+    def writeReport(self, folder=None):
+        data = self.toDict()
+        path = self.getReportPath(folder)
+        with open(path, "w", encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=1)
+        return path
+
+    def summary(self):
+        '''
+        段階ごとの処理時間をメッセージに出力
+        '''
+        data = self.toDict()
+        arcpy.AddMessage(u"処理時間: {0}（ピークメモリ: {1} MB）".format(formatSeconds(data["elapsed_sec"]), data["peak_memory_mb"]))
+        for name in self.phases:
+            p = self.phases[name]
+            if p.rows > 0 and p.seconds > 0:
+                arcpy.AddMessage(u"  {0}: {1:.1f} 秒 / {2} 件 ({3:.0f} 件/秒)".format(name, p.seconds, p.rows, p.rows / p.seconds))
+            else:
+                arcpy.AddMessage(u"  {0}: {1:.1f} 秒 ({2} 回)".format(name, p.seconds, p.calls))
+
+# 実行中の計測結果（start を呼び出すまでは、ツール名なしで計測）
+current = RunProfiler("script")
+
+def start(tool, gdb=None):
+    '''
+    計測を開始
+    '''
+    global current
+    current = RunProfiler(tool, gdb)
+    return current
+
+def phase(name):
+    return current.phase(name)
+
+def count(name, n=1):
+    current.count(name, n)
+
+def progress(label, cnt, num, force=False):
+    current.progress(label, cnt, num, force)
+
+def finish(folder=None):
+    '''
+    計測を終了して、段階ごとの処理時間をメッセージに出力し、JSONファイルに出力したパスを返却
+    '''
+    current.summary()
+    try:
+        path = current.writeReport(folder)
+        arcpy.AddMessage(u"処理時間の計測結果を出力しました: {0}".format(path))
+        return path
+    except (OSError, IOError) as e:
+        arcpy.AddWarning(u"処理時間の計測結果を出力できませんでした: {0}".format(e))
+        return None
@@ -0,0 +1,320 @@
+# coding:utf-8
+"""
+Name        :merge_gdbs_v100.py
+Purpose     :フォルダー、メッシュ、fld のサブフォルダーごとなど、分割して変換した3D都市モデルのファイル ジオデータベース（同じ gdb_schema/*.xml から作成したもの）を
+             1つのファイル ジオデータベースにまとめるツール。
+
+             ・フィーチャクラスごとに、追加元のGDBと件数の一覧（計画）を作成してから処理する
+             ・出力先のGDBが存在しない場合は、1つ目のGDBをコピーして作成する（ドメイン、エイリアスもそのままコピーされる）
+             ・フィールドの型、長さ、ジオメトリタイプ、空間参照をチェックし、追加元にしかないフィールド（gen_ で展開したフィールドなど）は
+               出力先にエイリアス、ドメインとともに追加してから、Append で複数のGDBのフィーチャをまとめて追加する
+             ・追加元のコード値ドメインのコードで、出力先のドメインにないものは追加する（出力先にないドメインは追加元と同じ型で作成）
+             ・ファイル ジオデータベースの場合は、フィーチャクラスごとにプロセスを分けて並列に追加する
+             ・calculate_genericAttributeSet_field の LONG モードの縦持ちのテーブル（genericAttributeSet_values）は、フィーチャの追加後に
+               出力先にまとめ、Append で変わった OBJECTID（src_oid）は出力先のフィーチャクラスの gml_id から付け直す
+               （それ以外のテーブルはまとめる対象外のため、警告を表示して追加しない）
+             ・フィーチャクラスごとに追加した件数と 件数/秒 を表示する
+
+             パラメータ
+               0: まとめる3D都市モデルのファイル ジオデータベース（複数指定）
+               1: 出力先のファイル ジオデータベース（存在しない場合は作成）
+               2: 並列処理数（省略可。0 または省略した場合は CPU 数、上限 MERGE_WORKERS_MAX）
+Author      :
+Copyright   :
+Created     :2026/10/18
+Last Updated:2026/10/18
+ArcGIS Version: ArcGIS Pro 2.6 以上
+"""
+import arcpy
+import os
+import sys
+import time
+import traceback
+import concurrent.futures
+
+# 使いまわし可能な関数をimport
+import calculate_genericAttributeSet_field_v112 as calgen
+import domain_builder_v100 as dombld
+import instrumentation_v100 as instr
+import generic_attribute_table_v100 as gattbl
+
+# 並列処理数の上限
+MERGE_WORKERS_MAX = 4
+
+# ListFields の型 → AddField の型
+FIELD_TYPES = {"String": "TEXT", "Integer": "LONG", "SmallInteger": "SHORT", "BigInteger": "BIGINTEGER",
+               "Double": "DOUBLE", "Single": "FLOAT", "Date": "DATE", "GUID": "GUID", "Blob": "BLOB"}
+# ListDomains の型（大文字） → ドメインのコードのフィールドの型
+DOMAIN_FIELD_TYPES = {"TEXT": "TEXT", "STRING": "TEXT", "SHORT": "SHORT", "SMALLINTEGER": "SHORT", "LONG": "LONG", "INTEGER": "LONG",
+                      "FLOAT": "FLOAT", "SINGLE": "FLOAT", "DOUBLE": "DOUBLE", "DATE": "DATE"}
+
+def listFeatureClasses(gdb):
+    arcpy.env.workspace = gdb
+    return arcpy.ListFeatureClasses() or []
+
+def listTables(gdb):
+    arcpy.env.workspace = gdb
+    return arcpy.ListTables() or []
+
+def readOidsByGmlId(fc):
+    '''
+    フィーチャクラスの {gml_id: OBJECTID} を作成（同じ gml_id がある場合は後のフィーチャ）
+    '''
+    return dict((gml_id, oid) for oid, gml_id in gattbl.readGmlIds(fc, gattbl.getIdField(fc)).items() if gml_id is not None)
+
+def mergeLongTables(source_gdbs, target_gdb):
+    '''
+    追加元の縦持ちのテーブル（gattbl.TABLE_NAME）の行を出力先のテーブルに追加し、追加した件数を返却
+    src_oid は出力先のフィーチャクラスの gml_id から付け直す（gml_id がない、出力先にない行は None）
+    それ以外のテーブルは追加しないため警告を表示
+    '''
+    sources = []
+    for gdb in source_gdbs:
+        for table in listTables(gdb):
+            if table.upper() == gattbl.TABLE_NAME.upper():
+                sources.append(os.path.join(gdb, table))
+            else:
+                arcpy.AddWarning(u"{0} の {1} テーブルはまとめる対象外のため追加しません".format(os.path.basename(gdb), table))
+    if len(sources) == 0:
+        return 0
+
+    target_table = gattbl.createTable(target_gdb)
+    fields = [f[0] for f in gattbl.TABLE_FIELDS]
+    fc_index = fields.index(gattbl.FC_FIELD)
+    oid_index = fields.index(gattbl.OID_FIELD)
+    gml_id_index = fields.index(gattbl.GML_ID_FIELD)
+    oid_maps = {}
+    cnt = 0
+    unmatched = 0
+    with arcpy.da.InsertCursor(target_table, fields) as icur:
+        for source_table in sources:
+            with arcpy.da.SearchCursor(source_table, fields) as scur:
+                for r in scur:
+                    r = list(r)
+                    fc = r[fc_index]
+                    oid_map = oid_maps.get(fc)
+                    if oid_map is None:
+                        target_fc = os.path.join(target_gdb, fc)
+                        oid_map = readOidsByGmlId(target_fc) if arcpy.Exists(target_fc) else {}
+                        oid_maps[fc] = oid_map
+                    r[oid_index] = oid_map.get(r[gml_id_index])
+                    if r[oid_index] is None:
+                        unmatched += 1
+                    icur.insertRow(r)
+                    cnt += 1
+    gattbl.createIndexes(target_table)
+    arcpy.AddMessage(u"{0}: {1} 個のGDBから {2} 件を追加しました".format(gattbl.TABLE_NAME, len(sources), cnt))
+    if unmatched > 0:
+        arcpy.AddWarning(u"{0}: 出力先のフィーチャの gml_id と対応づけできない {1} 件は src_oid を空にしました".format(gattbl.TABLE_NAME, unmatched))
+    return cnt
+
+def getAttributeFields(fc):
+    '''
+    OBJECTID、Shape、Shape_Length、Shape_Area などのシステムのフィールドを除いたフィールドを、名前（大文字）をキーに返却
+    '''
+    desc = arcpy.Describe(fc)
+    system_names = set([n.upper() for n in (getattr(desc, "lengthFieldName", ""), getattr(desc, "areaFieldName", "")) if n])
+    fields = {}
+    for f in arcpy.ListFields(fc):
+        if f.type in FIELD_TYPES and f.name.upper() not in system_names:
+            fields[f.name.upper()] = f
+    return fields
+
+def checkSchema(source_fc, target_fc):
+    '''
+    追加元と出力先のスキーマを比較し、(エラーメッセージの一覧, 出力先に追加するフィールドの一覧) を返却
+    '''
+    errors = []
+    src_desc = arcpy.Describe(source_fc)
+    dst_desc = arcpy.Describe(target_fc)
+    if src_desc.shapeType != dst_desc.shapeType:
+        errors.append(u"ジオメトリタイプが異なります（{0} / {1}）".format(src_desc.shapeType, dst_desc.shapeType))
+    if src_desc.spatialReference.factoryCode != dst_desc.spatialReference.factoryCode:
+        errors.append(u"空間参照が異なります（{0} / {1}）".format(src_desc.spatialReference.name, dst_desc.spatialReference.name))
+
+    src_fields = getAttributeFields(source_fc)
+    dst_fields = getAttributeFields(target_fc)
+    missing = []
+    for key in src_fields:
+        f = src_fields[key]
+        d = dst_fields.get(key)
+        if d is None:
+            missing.append(f)
+        elif d.type != f.type:
+            errors.append(u"{0} フィールドの型が異なります（{1} / {2}）".format(f.name, f.type, d.type))
+        elif f.type == "String" and f.length > d.length:
+            errors.append(u"{0} フィールドの長さが出力先より長いです（{1} / {2}）".format(f.name, f.length, d.length))
+    return errors, missing
+
+def mergeDomains(source_gdb, target_gdb, existing):
+    '''
+    追加元のコード値ドメインのコードで、出力先にないものを追加（出力先にないドメインは追加元と同じ型で作成）
+    '''
+    for domain in arcpy.da.ListDomains(source_gdb):
+        if domain.domainType != "CodedValue":
+            continue
+        field_type = DOMAIN_FIELD_TYPES.get(str(domain.type).upper())
+        if domain.name not in existing and field_type is None:
+            arcpy.AddWarning(u"{0}: ドメイン の型（{1}）は作成できないため、出力先への作成をスキップします".format(domain.name, domain.type))
+            continue
+        current = existing.get(domain.name) or {}
+        if all(code in current for code in domain.codedValues):
+            continue
+        dombld.buildCodedValueDomain(target_gdb, domain.name, domain.description, dict(domain.codedValues), existing, field_type or "TEXT")
+
+def createMergePlan(source_gdbs, target_gdb, existing):
+    '''
+    フィーチャクラスごとの計画を作成
+    {フィーチャクラス名: [(追加元のフィーチャクラス, 件数), ...]} と、出力先にないためコピーするフィーチャクラスの一覧を返却
+    出力先のフィーチャクラスがある場合はスキーマをチェックし、追加元にしかないフィールドは出力先に追加する
+    （existing（listCodedValues の結果）にない、出力先に作成できなかったドメインは適用しない）
+    '''
+    target_fcs = set([fc.upper() for fc in listFeatureClasses(target_gdb)])
+    plan = {}
+    copies = []
+    for gdb in source_gdbs:
+        for fc in listFeatureClasses(gdb):
+            source_fc = os.path.join(gdb, fc)
+            target_fc = os.path.join(target_gdb, fc)
+            num = int(arcpy.GetCount_management(source_fc).getOutput(0))
+            if fc.upper() not in target_fcs:
+                # 出力先にないフィーチャクラスは、ドメイン、エイリアスごとコピー
+                arcpy.Copy_management(source_fc, target_fc)
+                target_fcs.add(fc.upper())
+                copies.append((fc, num))
+                continue
+
+            errors, missing = checkSchema(source_fc, target_fc)
+            if len(errors) > 0:
+                arcpy.AddWarning(u"{0} の {1} はスキーマが異なるため追加しません: {2}".format(os.path.basename(gdb), fc, " / ".join(errors)))
+                instr.count(u"スキップ", 1)
+                continue
+            for f in missing:
+                domain = f.domain
+                if domain and domain not in existing:
+                    arcpy.AddWarning(u"{0} の {1} フィールドの {2} ドメインは出力先にないため、ドメインなしで追加します".format(fc, f.name, domain))
+                    domain = None
+                arcpy.AddField_management(target_fc, f.name, FIELD_TYPES[f.type], f.precision, f.scale, f.length,
+                                          f.aliasName, "NULLABLE", "NON_REQUIRED", domain)
+                arcpy.AddMessage(u"{0} に {1} フィールドを追加しました".format(fc, f.name))
+            if num > 0:
+                plan.setdefault(fc, []).append((source_fc, num))
+    return plan, copies
+
+def appendFeatureClass(target_fc, source_fcs):
+    '''
+    複数の追加元のフィーチャクラスを Append で1回で追加し、(追加した件数, 処理時間(秒), エラーメッセージ) を返却
+    並列処理の場合はワーカープロセスで実行
+    '''
+    started = time.time()
+    try:
+        before = int(arcpy.GetCount_management(target_fc).getOutput(0))
+        arcpy.Append_management(source_fcs, target_fc, "NO_TEST")
+        after = int(arcpy.GetCount_management(target_fc).getOutput(0))
+        return after - before, time.time() - started, None
+    except Exception as e:
+        return 0, time.time() - started, u"{0}\n{1}".format(e, arcpy.GetMessages(2))
+
+def reportAppended(fc, expected, appended, secs, error):
+    if error is not None:
+        arcpy.AddError(u"{0}: 追加できませんでした: {1}".format(fc, error))
+        return
+    rate = appended / secs if secs > 0 else 0
+    msg = u"{0}: {1} 件を追加しました（{2:.1f} 秒, {3:.0f} 件/秒）".format(fc, appended, secs, rate)
+    if appended != expected:
+        arcpy.AddWarning(u"{0} 追加元の件数 {1} 件と一致しません".format(msg, expected))
+    else:
+        arcpy.AddMessage(msg)
+
+def mergeGdbs(source_gdbs, target_gdb, workers=None):
+    '''
+    同じスキーマのファイル ジオデータベースを、出力先のファイル ジオデータベースにまとめる
+    '''
+    if not arcpy.Exists(target_gdb):
+        # 1つ目のGDBをコピーして出力先を作成
+        with instr.phase(u"コピー"):
+            arcpy.Copy_management(source_gdbs[0], target_gdb)
+        arcpy.AddMessage(u"{0} をコピーして {1} を作成しました".format(os.path.basename(source_gdbs[0]), target_gdb))
+        source_gdbs = source_gdbs[1:]
+
+    with instr.phase(u"ドメイン"):
+        existing = dombld.listCodedValues(target_gdb)
+        for gdb in source_gdbs:
+            mergeDomains(gdb, target_gdb, existing)
+
+    with instr.phase(u"計画"):
+        plan, copies = createMergePlan(source_gdbs, target_gdb, existing)
+    for fc, num in copies:
+        arcpy.AddMessage(u"{0}: 出力先にないため {1} 件をコピーしました".format(fc, num))
+    for fc in sorted(plan):
+        arcpy.AddMessage(u"{0}: {1} 個のGDBから {2} 件を追加します".format(fc, len(plan[fc]), sum([n for _, n in plan[fc]])))
+
+    if workers is None or workers <= 0:
+        workers = min(os.cpu_count() or 1, MERGE_WORKERS_MAX)
+    # ファイル ジオデータベースはフィーチャクラスごとに別のプロセスから同時に書き込める
+    if os.path.splitext(target_gdb)[1].upper() != ".GDB":
+        workers = 1
+    workers = max(1, min(workers, len(plan)))
+
+    with instr.phase(u"追加") as p:
+        fcs = sorted(plan, key=lambda fc: -sum([n for _, n in plan[fc]])) # 件数の多い順に開始
+        if workers == 1:
+            for fc in fcs:
+                appended, secs, error = appendFeatureClass(os.path.join(target_gdb, fc), [s for s, _ in plan[fc]])
+                reportAppended(fc, sum([n for _, n in plan[fc]]), appended, secs, error)
+                p.rows += appended
+        else:
+            arcpy.AddMessage(u"{0} プロセスで並列に追加します".format(workers))
+            calgen.setMultiprocessingExecutable()
+            with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = dict((executor.submit(appendFeatureClass, os.path.join(target_gdb, fc), [s for s, _ in plan[fc]]), fc) for fc in fcs)
+                for future in concurrent.futures.as_completed(futures):
+                    fc = futures[future]
+                    appended, secs, error = future.result()
+                    reportAppended(fc, sum([n for _, n in plan[fc]]), appended, secs, error)
+                    p.rows += appended
+
+    # フィーチャの追加後に、縦持ちのテーブルの OBJECTID を付け直して追加
+    with instr.phase(u"テーブル") as p:
+        p.rows += mergeLongTables(source_gdbs, target_gdb)
+
+def main():
+    try:
+        arcpy.AddMessage(u"処理開始：")
+
+        gdbs = arcpy.GetParameterAsText(0)
+        target_gdb = arcpy.GetParameterAsText(1)
+        workers = None
+        if arcpy.GetArgumentCount() >= 3 and arcpy.GetParameterAsText(2) != "":
+            workers = int(arcpy.GetParameterAsText(2))
+
+        # 入力値のチェック
+        source_gdbs = [gdb.strip("'") for gdb in gdbs.split(";") if gdb != ""]
+        for gdb in source_gdbs + [target_gdb]:
+            if os.path.splitext(gdb)[1].upper() != ".GDB":
+                arcpy.AddError(u"{0} は3D都市モデルの変換先ファイル ジオデータベースを選択する必要があります".format(gdb))
+                return
+        source_gdbs = [gdb for gdb in source_gdbs if os.path.normcase(os.path.abspath(gdb)) != os.path.normcase(os.path.abspath(target_gdb))]
+        if len(source_gdbs) == 0:
+            arcpy.AddError(u"まとめるファイル ジオデータベースを指定してください")
+            return
+
+        # 処理時間の計測を開始
+        instr.start("merge_gdbs", target_gdb)
+        mergeGdbs(source_gdbs, target_gdb, workers)
+
+        # 段階ごとの処理時間を GDB と同じフォルダーに出力
+        instr.finish()
+
+        arcpy.AddMessage(u"処理終了：")
+    except arcpy.ExecuteError:
+        arcpy.AddError(arcpy.GetMessages(2))
+    except Exception as e:
+        err = e.args[0]
+        tb = sys.exc_info()[2]
+        tbinfo = traceback.format_tb(tb)[0]
+        pymsg = "PYTHON ERRORS:\nTraceback info:\n" + tbinfo + "\nError Info:\n" + str(err)
+        arcpy.AddError(pymsg)
+
+if __name__ == '__main__':
+    main()
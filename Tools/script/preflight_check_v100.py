@@ -0,0 +1,418 @@
+# coding:utf-8
+"""
+Name        :preflight_check_v100.py
+Purpose     :FMEで変換する前に、3D都市モデルの CityGML ファイル（udx 以下の *.gml）をすべて読み込んで、
+             変換の失敗やデータの欠落の原因になる次の内容を確認し、レポートを出力するツール
+
+             変換は数時間かかる場合があり、i-UR 1.4 の schemaLocation（ADE_XSD_DOC_CITYGML の xsd が必要）や、
+             codelists にないコード値、extendedAttribute の不正なキーは、変換後（assign_extendedAttributes の実行時など）に分かっていた。
+             ・名前空間と schemaLocation の宣言
+                 i-UR 1.4 のURLを宣言しているファイル（replace_iurUrl で置換するか、xsd の指定が必要）
+                 i-UR 1.4 の要素を使用している地物（変換時に i-UR 1.4 の urbanObject.xsd の指定が必要）
+                 schemaLocation があるが名前空間が宣言されていないもの、ADE の要素を使用しているが schemaLocation がないもの
+             ・codeSpace のある要素（bldg:usage, uro:key など）で使用しているコード値を集計し、codeSpace のコードリストにないコード値、
+               コードリストのファイルがないものを確認
+             ・uro:extendedAttribute のキー（数字でないもの、extendedAttribute_keyXX.xml がないもの、
+               ファイル内の <gml:name> がファイル名と一致しないもの。assign_extendedAttributes でドメインを適用できない）
+             ・XMLとして読み込めないファイル
+             ファイルは iterparse で先頭から順に読み込み（読み込んだ要素は削除）、ファイルごとにプロセスプールで並列処理する。
+
+             レポートは <出力フォルダー>/<フォルダー名>_preflight_<日時>.json に出力し、概要をメッセージに表示する。
+
+             パラメータ
+               0: 3D都市モデルのフォルダー（udx, codelists を含むフォルダー）、または udx フォルダー
+               1: レポートの出力フォルダー（省略可。省略時は 0 のフォルダー）
+               2: 並列処理するワーカープロセス数（省略可。省略時は CPU 数、上限 8。1 の場合は並列処理しない）
+Author      :
+Copyright   :
+Created     :2026/10/18
+Last Updated:2026/10/18
+ArcGIS Version: ArcGIS Pro 2.6 以上
+"""
+import arcpy
+import os
+import re
+import sys
+import json
+import time
+import datetime
+import collections
+import concurrent.futures
+import xml.etree.ElementTree as et
+import traceback
+
+import instrumentation_v100 as instr
+# コードリストの解析結果を共有するインデックス
+import codelist_index_v100 as cdidx
+# CityGML ファイルの一覧、i-UR 1.4 のURLは replace_iurUrl と共通
+import replace_iurUrl_v100 as rplurl
+# 拡張属性のファイル名の規則は assign_extendedAttributes と共通
+import assign_extendedAttributes_v113 as asgext
+# 要素名の判定、並列処理の上限は extract_building_attributes と共通
+import extract_building_attributes_v100 as extbld
+# ワーカープロセスの python.exe の設定
+import calculate_genericAttributeSet_field_v112 as calgen
+
+UDX_FOLDER = "udx"
+CODELIST_FOLDER = "codelists"
+REPORT_SUFFIX = "_preflight_"
+
+XSI_SCHEMA_LOCATION = "{http://www.w3.org/2001/XMLSchema-instance}schemaLocation"
+# FMEが標準で読み込めるスキーマの名前空間（これ以外は ADE として schemaLocation を確認）
+STANDARD_NAMESPACES = ("http://www.opengis.net/", "http://www.w3.org/", "urn:oasis:names:tc:ciq:")
+
+# レポートに記録するファイル数の上限（問題ごと、コード値ごと）
+SAMPLE_FILES = 5
+# コード値が数字だけの拡張属性のキー
+EXTATTR_KEY_PATTERN = re.compile(r"^\d+$")
+
+def isStandardNamespace(ns):
+    return ns == "" or ns.startswith(STANDARD_NAMESPACES)
+
+def parseSchemaLocation(value):
+    '''
+    xsi:schemaLocation の "名前空間 URL 名前空間 URL ..." を {名前空間: URL} にする
+    '''
+    if not value:
+        return {}
+    items = value.split()
+    return dict(zip(items[0::2], items[1::2]))
+
+def scanFile(path):
+    '''
+    ワーカープロセスで実行する処理。CityGML ファイルを先頭から順に読み込み、
+    {名前空間の宣言, schemaLocation, 名前空間ごとの要素数, codeSpace ごとのコード値の件数, エラー} と処理時間を返却
+    '''
+    start = time.time()
+    namespaces = []
+    schema_locations = {}
+    used = collections.Counter()
+    codes = {}
+    error = None
+    depth = 0
+    root = None
+    try:
+        for event, item in et.iterparse(path, events=("start-ns", "start", "end")):
+            if event == "start-ns":
+                if item[1] not in namespaces:
+                    namespaces.append(item[1])
+                continue
+            if event == "start":
+                if root is None:
+                    root = item
+                    schema_locations = parseSchemaLocation(item.get(XSI_SCHEMA_LOCATION))
+                depth += 1
+                continue
+            depth -= 1
+            used[extbld.splitTag(item.tag)[0]] += 1
+            codeSpace = item.get("codeSpace")
+            if codeSpace is not None:
+                counter = codes.get(codeSpace)
+                if counter is None:
+                    counter = collections.Counter()
+                    codes[codeSpace] = counter
+                counter[(item.text or "").strip()] += 1
+            if depth == 1:
+                # ルート要素の子要素（cityObjectMember など）の終わりで、読み込んだ要素を削除
+                root.clear()
+    except et.ParseError as e:
+        error = str(e)
+    result = {"namespaces": namespaces, "schema_locations": schema_locations, "used": dict(used),
+              "codes": dict((cs, dict(c)) for cs, c in codes.items()), "error": error}
+    return path, result, time.time() - start
+
+def iterScannedFiles(files, workers):
+    '''
+    ファイルの順に scanFile の結果を返却（workers が 2 以上の場合はプロセスプールで並列処理）
+    '''
+    if workers <= 1:
+        for path in files:
+            yield scanFile(path)
+        return
+    calgen.setMultiprocessingExecutable()
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = collections.deque()
+        it = iter(files)
+        while True:
+            while len(pending) < workers * extbld.QUEUE_FACTOR:
+                path = next(it, None)
+                if path is None:
+                    break
+                pending.append(executor.submit(scanFile, path))
+            if len(pending) == 0:
+                break
+            yield pending.popleft().result()
+
+def addSample(samples, rel):
+    if len(samples) < SAMPLE_FILES and rel not in samples:
+        samples.append(rel)
+
+class PreflightReport(object):
+    '''
+    ファイルごとの読み込み結果を集計して、確認結果を作成するクラス
+    '''
+    def __init__(self, udx_folder):
+        self.udx_folder = udx_folder
+        self.files = 0
+        self.elements = 0
+        self.feature_types = collections.Counter()
+        self.errors = []
+        # 名前空間ごとの {"files": 宣言したファイル数, "used_files": 使用したファイル数, "elements": 要素数, "schema_locations": [URL]}
+        self.namespaces = collections.OrderedDict()
+        self.replace_files = []
+        self.iur14_types = collections.Counter()
+        self.schema_issues = collections.OrderedDict()
+        # コードリストのパスごとの {コード値: [件数, [ファイル]]}
+        self.codes = collections.OrderedDict()
+        self.codelist_refs = {}
+
+    def getNamespace(self, ns):
+        entry = self.namespaces.get(ns)
+        if entry is None:
+            entry = {"files": 0, "used_files": 0, "elements": 0, "schema_locations": []}
+            self.namespaces[ns] = entry
+        return entry
+
+    def addIssue(self, issue, rel):
+        samples = self.schema_issues.setdefault(issue, [0, []])
+        samples[0] += 1
+        addSample(samples[1], rel)
+
+    def add(self, path, result):
+        rel = os.path.relpath(path, self.udx_folder)
+        # udx の下のフォルダー名（bldg, tran など）を地物とする
+        parts = rel.replace("\\", "/").split("/")
+        feature_type = parts[0] if len(parts) > 1 else ""
+        self.files += 1
+        self.feature_types[feature_type] += 1
+        self.elements += sum(result["used"].values())
+        if result["error"] is not None:
+            self.errors.append({"file": rel, "error": result["error"]})
+
+        declared = set(result["namespaces"])
+        for ns in result["namespaces"]:
+            self.getNamespace(ns)["files"] += 1
+        for ns, n in result["used"].items():
+            entry = self.getNamespace(ns)
+            entry["used_files"] += 1
+            entry["elements"] += n
+        for ns, url in result["schema_locations"].items():
+            entry = self.getNamespace(ns)
+            if url not in entry["schema_locations"]:
+                entry["schema_locations"].append(url)
+            if ns not in declared:
+                self.addIssue(u"schemaLocation の名前空間 {0} が宣言されていません".format(ns), rel)
+        for ns in result["used"]:
+            if not isStandardNamespace(ns) and ns not in result["schema_locations"]:
+                self.addIssue(u"名前空間 {0} の要素を使用していますが、schemaLocation がありません".format(ns), rel)
+
+        # i-UR 1.4 のURLを宣言しているファイル、i-UR 1.4 の要素を使用している地物
+        locations = " ".join(result["schema_locations"].values())
+        if rplurl.IUR14_URL in declared or rplurl.IUR14_SCHEMAS_URL in locations:
+            self.replace_files.append(rel)
+        if result["used"].get(rplurl.IUR14_URL, 0) > 0:
+            self.iur14_types[feature_type] += 1
+
+        # codeSpace はファイルからの相対パス（../../codelists/Building_usage.xml など）
+        folder = os.path.dirname(path)
+        for codeSpace, counter in result["codes"].items():
+            if not codeSpace.lower().endswith(".xml"):
+                continue
+            codelist = os.path.normpath(os.path.join(folder, codeSpace))
+            self.codelist_refs.setdefault(codelist, codeSpace)
+            codes = self.codes.setdefault(codelist, {})
+            for code, n in counter.items():
+                entry = codes.get(code)
+                if entry is None:
+                    entry = [0, []]
+                    codes[code] = entry
+                entry[0] += n
+                addSample(entry[1], rel)
+
+    def checkCodelists(self):
+        '''
+        使用しているコード値とコードリストを照合して、コードリストごとの結果の一覧を返却
+        '''
+        results = []
+        for codelist, codes in self.codes.items():
+            result = {"codelist": codelist, "codeSpace": self.codelist_refs[codelist], "exists": os.path.exists(codelist),
+                      "codes_used": len(codes), "values_used": sum(e[0] for e in codes.values()), "missing": {}}
+            if result["exists"]:
+                domainName, domainDict = cdidx.getCodelist(codelist)
+                defined = domainDict
+            else:
+                defined = {}
+            for code in sorted(codes):
+                if code not in defined:
+                    result["missing"][code] = {"count": codes[code][0], "files": codes[code][1]}
+            results.append(result)
+        return results
+
+    def checkExtendedAttributes(self):
+        '''
+        extendedAttribute_key.xml のコード値（キー）ごとに、assign_extendedAttributes でドメインを適用できるかを確認
+        '''
+        issues = []
+        for codelist, codes in self.codes.items():
+            if os.path.basename(codelist) != asgext.EXTATTR_KEYFILE:
+                continue
+            folder = os.path.dirname(codelist)
+            for key in sorted(codes):
+                files = codes[key][1]
+                if not EXTATTR_KEY_PATTERN.match(key):
+                    issues.append({"key": key, "issue": u"キーが数字ではありません", "files": files})
+                    continue
+                keyfile = os.path.join(folder, asgext.createFileName(asgext.EXTATTR_KEYFILE, key))
+                if not os.path.exists(keyfile):
+                    issues.append({"key": key, "issue": u"{0} がありません".format(os.path.basename(keyfile)), "files": files})
+                    continue
+                domainName, domainDict = cdidx.getCodelist(keyfile)
+                if domainName.upper() != os.path.splitext(os.path.basename(keyfile))[0].upper():
+                    issues.append({"key": key, "issue": u"{0} の <gml:name>{1}</gml:name> がファイル名と一致しません".format(os.path.basename(keyfile), domainName),
+                                   "files": files})
+        return issues
+
+    def createXsdRecommendation(self):
+        if len(self.iur14_types) > 0:
+            return u"i-UR 1.4 の要素を使用している地物（{0}）の変換では、i-UR 1.4 の urbanObject.xsd をローカルに保存して xsd（ADE_XSD_DOC_CITYGML）に指定するか、" \
+                   u"replace_iurUrl で i-UR 1.5 のURLに置換してください".format(", ".join(sorted(self.iur14_types)))
+        if len(self.replace_files) > 0:
+            return u"i-UR 1.4 のURLを宣言しているファイルがあるため、replace_iurUrl で i-UR 1.5 のURLに置換してください（i-UR 1.4 の要素は使用していないため xsd の指定は不要）"
+        return u"xsd の指定は不要です"
+
+    def toDict(self):
+        return {
+            "folder": self.udx_folder,
+            "created": datetime.datetime.now().isoformat(),
+            "files": self.files,
+            "elements": self.elements,
+            "feature_types": dict(self.feature_types),
+            "xsd": {"recommendation": self.createXsdRecommendation(), "iur14_feature_types": dict(self.iur14_types)},
+            "replace_iurUrl": {"files": len(self.replace_files), "list": self.replace_files},
+            "namespaces": self.namespaces,
+            "schema_issues": [{"issue": issue, "count": v[0], "files": v[1]} for issue, v in self.schema_issues.items()],
+            "codelists": self.checkCodelists(),
+            "extendedAttribute": self.checkExtendedAttributes(),
+            "parse_errors": self.errors,
+        }
+
+def reportSummary(data):
+    '''
+    レポートの概要をメッセージに表示し、問題の件数を返却
+    '''
+    problems = 0
+    arcpy.AddMessage(u"{0} ファイル（{1}）、{2} 要素を確認しました".format(
+        data["files"], ", ".join(u"{0}: {1}".format(t, n) for t, n in sorted(data["feature_types"].items())), data["elements"]))
+    arcpy.AddMessage(u"xsd: {0}".format(data["xsd"]["recommendation"]))
+    if data["replace_iurUrl"]["files"] > 0:
+        problems += 1
+        arcpy.AddWarning(u"i-UR 1.4 のURLを宣言しているファイル: {0} ファイル（replace_iurUrl の対象）".format(data["replace_iurUrl"]["files"]))
+    for issue in data["schema_issues"]:
+        problems += 1
+        arcpy.AddWarning(u"{0}: {1} ファイル（{2} など）".format(issue["issue"], issue["count"], issue["files"][0]))
+    for result in data["codelists"]:
+        if not result["exists"]:
+            problems += 1
+            arcpy.AddWarning(u"コードリスト {0} がありません（{1} 種類のコード値を使用）".format(result["codeSpace"], result["codes_used"]))
+        elif len(result["missing"]) > 0:
+            problems += 1
+            missing = sorted(result["missing"].items(), key=lambda m: -m[1]["count"])
+            arcpy.AddWarning(u"{0} にないコード値: {1}".format(os.path.basename(result["codelist"]),
+                             ", ".join(u"{0}（{1} 件, {2} など）".format(code if code != "" else u"空", m["count"], m["files"][0]) for code, m in missing[:SAMPLE_FILES])
+                             + (u" ほか {0} 種類".format(len(missing) - SAMPLE_FILES) if len(missing) > SAMPLE_FILES else "")))
+    for issue in data["extendedAttribute"]:
+        problems += 1
+        arcpy.AddWarning(u"拡張属性のキー {0}: {1}（{2} など）".format(issue["key"], issue["issue"], issue["files"][0]))
+    for error in data["parse_errors"]:
+        problems += 1
+        arcpy.AddWarning(u"{0} はXMLとして読み込めません（{1}）".format(error["file"], error["error"]))
+    return problems
+
+def getFolders(folder):
+    '''
+    3D都市モデルのフォルダー、または udx フォルダーから (udx フォルダー, codelists フォルダー) を返却
+    '''
+    folder = os.path.normpath(folder)
+    if os.path.isdir(os.path.join(folder, UDX_FOLDER)):
+        return os.path.join(folder, UDX_FOLDER), os.path.join(folder, CODELIST_FOLDER)
+    return folder, os.path.join(os.path.dirname(folder), CODELIST_FOLDER)
+
+def runPreflight(folder, out_folder=None, workers=None):
+    '''
+    フォルダー以下の CityGML ファイルを確認してレポートを出力し、(レポートのパス, 問題の件数) を返却
+    '''
+    udx_folder, codelist_folder = getFolders(folder)
+    if out_folder is None or out_folder == "":
+        out_folder = os.path.normpath(folder)
+    if workers is None or workers <= 0:
+        workers = min(os.cpu_count() or 1, extbld.MAX_WORKERS)
+    with instr.phase(u"ファイル一覧"):
+        files = [os.path.join(udx_folder, rel) for rel in rplurl.listGmlFiles(udx_folder)]
+    num = len(files)
+    if num == 0:
+        arcpy.AddError(u"{0} には処理対象のCityGML ファイル（*.gml）がありません。".format(udx_folder))
+        return None, 0
+    workers = max(1, min(workers, num))
+    arcpy.AddMessage(u"{0} ファイルを確認します（並列処理数: {1}）".format(num, workers))
+
+    if os.path.isdir(codelist_folder):
+        with instr.phase(u"コードリスト解析"):
+            cdidx.loadFolder(codelist_folder)
+
+    report = PreflightReport(udx_folder)
+    scan_phase = instr.phase(u"CityGML 解析")
+    cnt = 0
+    for path, result, secs in iterScannedFiles(files, workers):
+        cnt += 1
+        report.add(path, result)
+        scan_phase.add(secs, sum(result["used"].values()))
+        instr.count(u"バイト数", os.path.getsize(path))
+        instr.progress(u"CityGML 確認", cnt, num)
+
+    with instr.phase(u"コード値照合"):
+        data = report.toDict()
+    problems = reportSummary(data)
+    instr.count(u"要素数", data["elements"])
+    instr.count(u"問題", problems)
+
+    name = os.path.basename(os.path.normpath(folder))
+    path = os.path.join(out_folder, "{0}{1}{2}.json".format(name, REPORT_SUFFIX, datetime.datetime.now().strftime("%Y%m%d_%H%M%S")))
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=1)
+    arcpy.AddMessage(u"確認結果を出力しました（問題 {0} 件）: {1}".format(problems, path))
+    return path, problems
+
+def main():
+    try:
+        arcpy.AddMessage(u"処理開始：")
+
+        folder = arcpy.GetParameterAsText(0)
+        out_folder = None
+        if arcpy.GetArgumentCount() >= 2 and arcpy.GetParameterAsText(1) != "":
+            out_folder = arcpy.GetParameterAsText(1)
+        workers = None
+        if arcpy.GetArgumentCount() >= 3 and arcpy.GetParameterAsText(2) != "":
+            workers = int(arcpy.GetParameterAsText(2))
+
+        # 入力値のチェック
+        if not os.path.isdir(folder):
+            arcpy.AddError(u"{0} は3D都市モデルのフォルダーを選択する必要があります".format(folder))
+            return
+
+        # 処理時間の計測を開始（段階ごとの処理時間をレポートと同じフォルダーに出力）
+        instr.start("preflight_check")
+        runPreflight(folder, out_folder, workers)
+        instr.finish(out_folder if out_folder else folder)
+
+        arcpy.AddMessage(u"処理終了：")
+    except arcpy.ExecuteError:
+        arcpy.AddError(arcpy.GetMessages(2))
+    except Exception as e:
+        err = e.args[0]
+        tb = sys.exc_info()[2]
+        tbinfo = traceback.format_tb(tb)[0]
+        pymsg = "PYTHON ERRORS:\nTraceback info:\n" + tbinfo + "\nError Info:\n" + str(err)
+        arcpy.AddError(pymsg)
+
+if __name__ == '__main__':
+    main()
@@ -12,15 +12,38 @@ Purpose     :2021年9月18日にi-UR1.4の名前空間及びXMLSchema ファイ
              
              本ツールは、上記のローカルでのxsd ファイルを指定しなくても変換可能なように、2020年度のCityGML　ファイルのi-UR1.4の所在を強制的にi-UR1.5のものに置換してしまうツールです。
              このツールでURLの文字をi-UR1.5のものに置換すると、各インポートツールでのXSDスキーマファイルの指定は不要になります。
+
+             v100 → v101 の更新内容
+             ・ファイル全体を文字列として読み込んで置換していたため、数百MBのファイルではメモリを大量に使用していた。
+               i-UR のURLはルート要素（core:CityModel）の名前空間と schemaLocation の宣言にしかないため、
+               ルート要素の開始タグの終わりまでのヘッダー部分だけをバイト列で置換し、残りはバイト列のまま大きいバッファでコピーするように変更
+             ・置換するURLがない場合は、ファイルをそのままコピー（OSのファイルコピーを使用）
+             ・パラメータ 1: ファイル全体を検証（省略可）を追加。true の場合は、ヘッダー以外にもURLが使われている場合に備えて、
+               ファイル全体をチャンク単位で読み込み、チャンクの境界をまたぐURLも置換する
+             ・パラメータ 2: サブフォルダーも処理（省略可）、3: 並列処理数（省略可）を追加。
+               サブフォルダーも処理する場合は、指定フォルダー（udx など）以下の bldg, luse, urf, fld などのフォルダーの *.gml を
+               スレッドで並列に処理し、ファイルごとのハッシュ値、サイズ、更新日時、出力ファイルを
+               指定フォルダーの replace_iurUrl_manifest.json に記録する。再実行時は変更のないファイルをスキップし、
+               置換するURLがないファイルは出力しない（出力ファイル "o_*.gml" は処理対象外）
 Author      :
 Copyright   :
 Created     :2021/12/17
-Last Updated:202x/xx/xx
+Last Updated:2026/10/18
 ArcGIS Version: ArcGIS Pro 2.6 以上
 """
 import arcpy
 import os
+import re
+import sys
+import json
+import time
+import shutil
+import hashlib
 import traceback
+import concurrent.futures
+
+# 処理時間の計測
+import instrumentation_v100 as instr
 
 # 置換するURLの文字列を定義
 IUR14_SCHEMAS_URL = "http://www.kantei.go.jp/jp/singi/tiiki/toshisaisei/itoshisaisei/iur/schemas/uro/1.4"
@@ -29,10 +52,160 @@ IUR14_URL = "http://www.kantei.go.jp/jp/singi/tiiki/toshisaisei/itoshisaisei/iur
 IUR15_SCHEMAS_URL = "https://www.chisou.go.jp/tiiki/toshisaisei/itoshisaisei/iur/schemas/uro/1.5"
 IUR15_URL = "https://www.chisou.go.jp/tiiki/toshisaisei/itoshisaisei/iur/uro/1.5"
 
-def convertUrls(folder):
+# バイト列で置換するURLの組み合わせ（i-UR1.4 のURLはお互いを含まないため、1回の走査で置換できる）
+REPLACE_URLS = [(IUR14_SCHEMAS_URL.encode('utf-8'), IUR15_SCHEMAS_URL.encode('utf-8')),
+                (IUR14_URL.encode('utf-8'), IUR15_URL.encode('utf-8'))]
+REPLACE_PATTERN = re.compile(b"|".join([re.escape(old) for old, new in REPLACE_URLS]))
+REPLACE_DICT = dict(REPLACE_URLS)
+
+# ヘッダー部分（ルート要素の開始タグの終わりまで）を探すときに読み込むサイズと上限（バイト）
+HEADER_READ_SIZE = 65536
+HEADER_MAX_SIZE = 4 * 1048576
+
+# ヘッダー以降をコピーするときのバッファ、ファイル全体を検証するときのチャンクのサイズ（バイト）
+COPY_BUFFER_SIZE = 16 * 1048576
+
+# 出力ファイル名の接頭辞
+OUTPUT_PREFIX = "o_"
+
+# サブフォルダーも処理する場合の、処理結果を記録するファイル名と、記録を保存する間隔（ファイル数）
+MANIFEST_FILENAME = "replace_iurUrl_manifest.json"
+MANIFEST_VERSION = 1
+MANIFEST_SAVE_INTERVAL = 500
+
+# サブフォルダーも処理する場合の並列処理数（0 の場合は CPU 数、上限 8）
+BATCH_WORKERS = 0
+
+def replaceBytes(data):
+    '''
+    バイト列の i-UR1.4 のURLを i-UR1.5 のURLに置換し、(置換後のバイト列, 置換した件数) を返却
+    '''
+    return REPLACE_PATTERN.subn(lambda m: REPLACE_DICT[m.group(0)], data)
+
+def findRootStartTagEnd(data):
+    '''
+    バイト列から、ルート要素の開始タグの終わり（'>' の次の位置）を返却。見つからない場合は -1
+    XML宣言、処理命令、コメント、DOCTYPE はスキップし、属性値の引用符内の '>' は無視する
+    '''
+    pos = 0
+    n = len(data)
+    while True:
+        lt = data.find(b"<", pos)
+        if lt < 0 or lt + 1 >= n:
+            return -1
+        if data.startswith(b"<?", lt):
+            end = data.find(b"?>", lt + 2)
+            if end < 0:
+                return -1
+            pos = end + 2
+            continue
+        if data.startswith(b"<!--", lt):
+            end = data.find(b"-->", lt + 4)
+            if end < 0:
+                return -1
+            pos = end + 3
+            continue
+        if data.startswith(b"<!", lt):
+            # DOCTYPE（内部サブセット [...] を含む場合は ']' の後の '>' まで）
+            end = data.find(b">", lt + 2)
+            bracket = data.find(b"[", lt + 2)
+            if bracket >= 0 and (end < 0 or bracket < end):
+                close = data.find(b"]", bracket + 1)
+                end = data.find(b">", close + 1) if close >= 0 else -1
+            if end < 0:
+                return -1
+            pos = end + 1
+            continue
+        quote = None
+        for i in range(lt + 1, n):
+            c = data[i:i + 1]
+            if quote is not None:
+                if c == quote:
+                    quote = None
+            elif c == b'"' or c == b"'":
+                quote = c
+            elif c == b">":
+                return i + 1
+        return -1
+
+def replaceHeader(input_file, out_file):
+    '''
+    ルート要素の開始タグの終わりまでのヘッダー部分だけを置換し、残りはそのままコピー
+    置換した件数を返却（ヘッダー部分が見つからない場合は None を返却し、出力ファイルは作成しない）
+    '''
+    with open(input_file, "rb") as infile:
+        header = b""
+        end = -1
+        while len(header) < HEADER_MAX_SIZE:
+            data = infile.read(HEADER_READ_SIZE)
+            if not data:
+                break
+            header += data
+            end = findRootStartTagEnd(header)
+            if end >= 0:
+                break
+        if end < 0:
+            return None
+
+        replaced, replace_cnt = replaceBytes(header[:end])
+        if replace_cnt == 0:
+            # 置換するURLがない場合はOSのファイルコピーを使用
+            infile.close()
+            shutil.copyfile(input_file, out_file)
+            return 0
+
+        with open(out_file, "wb") as outfile:
+            outfile.write(replaced)
+            outfile.write(header[end:])
+            shutil.copyfileobj(infile, outfile, COPY_BUFFER_SIZE)
+    return replace_cnt
+
+def replaceAll(input_file, out_file):
+    '''
+    ファイル全体をチャンク単位で読み込んで置換し、置換した件数を返却
+    チャンクの末尾の（URLの最大長 - 1）バイトは次のチャンクとつなげて置換するので、境界をまたぐURLも置換される
+    '''
+    keep = max([len(old) for old, new in REPLACE_URLS]) - 1
+    replace_cnt = 0
+    with open(input_file, "rb") as infile, open(out_file, "wb") as outfile:
+        carry = b""
+        while True:
+            data = infile.read(COPY_BUFFER_SIZE)
+            if not data:
+                replaced, n = replaceBytes(carry)
+                outfile.write(replaced)
+                replace_cnt += n
+                break
+            buf = carry + data
+            # cut より前から始まるURLは buf 内で完結するため、cut（またはURLの終わり）までを置換して出力
+            cut = max(len(buf) - keep, 0)
+            for m in REPLACE_PATTERN.finditer(buf, max(cut - keep, 0), cut + keep):
+                if m.start() < cut < m.end():
+                    cut = m.end()
+                    break
+            replaced, n = replaceBytes(buf[:cut])
+            outfile.write(replaced)
+            replace_cnt += n
+            carry = buf[cut:]
+    return replace_cnt
+
+def convertFile(input_file, out_file, verify=False):
+    '''
+    CityGML ファイルの i-UR1.4 のURLを i-UR1.5 のURLに置換して保存し、置換した件数を返却
+    verify の場合、またはヘッダー部分が見つからない場合はファイル全体を置換
+    '''
+    if not verify:
+        replace_cnt = replaceHeader(input_file, out_file)
+        if replace_cnt is not None:
+            return replace_cnt
+        arcpy.AddWarning(u"{0} のルート要素の開始タグが見つからないため、ファイル全体を置換します".format(os.path.basename(input_file)))
+    return replaceAll(input_file, out_file)
+
+def convertUrls(folder, verify=False):
     '''
     指定フォルダ内の*.gml ファイルを開いて、URLを書きかえて別ファイルに保存する処理
     出力ファイル名は元ファイル名の接頭辞に"o_"をつけて、"o_元のファイル名.gml"　として決め打ち
+    verify の場合はヘッダー部分だけでなく、ファイル全体のURLを置換
     '''
 
     blResult = True
@@ -40,7 +213,7 @@ def convertUrls(folder):
         
         arcpy.AddMessage(u"CityGML ファイルのURL 置換処理を開始します。")
         arcpy.env.workspace = folder
-        input_files = arcpy.ListFiles("*.gml")
+        input_files = [f for f in arcpy.ListFiles("*.gml") if not f.startswith(OUTPUT_PREFIX)] # 出力ファイルは対象外
 
         # 進捗表示のメッセージ用
         cnt = 0
@@ -52,7 +225,7 @@ def convertUrls(folder):
         
         for input_file_name in input_files:
             # 出力ファイル名は接頭辞に"o_"をつける
-            out_file_name = "o_{0}".format(input_file_name)
+            out_file_name = "{0}{1}".format(OUTPUT_PREFIX, input_file_name)
             
             # 入出力のファイルをフルパスに
             out_file = os.path.join(folder, out_file_name)
@@ -63,16 +236,14 @@ def convertUrls(folder):
                 arcpy.management.Delete(out_file)
             
             cnt += 1
-            if (cnt == 1) or (cnt == num) or (cnt % 10000 == 1):
-                s = u"{0}/{1}の URL 置換処理中・・・ファイル:{2}".format(cnt, num, input_file_name)
-                arcpy.AddMessage(s)             
+            instr.progress(u"URL 置換", cnt, num)
             
             # URLの書き換え処理
-            with open(input_file, "r", encoding='utf-8') as infile, open(out_file, "w", encoding='utf-8') as outfile:
-                data = infile.read()
-                data = data.replace(IUR14_SCHEMAS_URL, IUR15_SCHEMAS_URL)
-                data = data.replace(IUR14_URL, IUR15_URL)    
-                outfile.write(data)
+            with instr.phase(u"URL置換") as p:
+                replace_cnt = convertFile(input_file, out_file, verify)
+                p.rows += 1
+            instr.count(u"バイト数", os.path.getsize(input_file))
+            instr.count(u"置換件数", replace_cnt)
 
         arcpy.AddMessage(u"CityGML ファイルのURL 置換処理を終了しました")
     except arcpy.ExecuteError:
@@ -88,15 +259,220 @@ def convertUrls(folder):
     
     return blResult
 
+def scanFile(input_file, verify=False):
+    '''
+    ファイルを1回読み込んで、(ハッシュ値, 置換が必要かどうか) を返却
+    verify でない場合はルート要素の開始タグまで、verify の場合はファイル全体から置換するURLを探す
+    '''
+    keep = max([len(old) for old, new in REPLACE_URLS]) - 1
+    sha1 = hashlib.sha1()
+    needed = False
+    header = b""
+    header_done = verify
+    carry = b""
+    with open(input_file, "rb") as infile:
+        while True:
+            data = infile.read(COPY_BUFFER_SIZE)
+            if not data:
+                break
+            sha1.update(data)
+            if needed:
+                continue
+            if not header_done:
+                header += data
+                end = findRootStartTagEnd(header)
+                if end >= 0:
+                    needed = REPLACE_PATTERN.search(header, 0, end) is not None
+                    header_done = True
+                    header = b""
+                    continue
+                if len(header) < HEADER_MAX_SIZE:
+                    continue
+                # ヘッダー部分が見つからない場合はファイル全体を探す
+                header_done = verify = True
+                data = header
+                header = b""
+            if verify:
+                buf = carry + data
+                needed = REPLACE_PATTERN.search(buf) is not None
+                carry = buf[-keep:]
+        if not header_done:
+            # ルート要素の開始タグの途中でファイルが終わっている場合
+            needed = REPLACE_PATTERN.search(header) is not None
+    return sha1.hexdigest(), needed
+
+class UrlManifest(object):
+    '''
+    サブフォルダーも処理する場合の、ファイルごとの処理結果の記録（指定フォルダーからの相対パスをキー）
+    '''
+    def __init__(self, folder):
+        self.folder = folder
+        self.path = os.path.join(folder, MANIFEST_FILENAME)
+        self.files = {}
+        if os.path.exists(self.path):
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") == MANIFEST_VERSION:
+                self.files = data.get("files", {})
+
+    def save(self):
+        data = {"version": MANIFEST_VERSION, "files": self.files}
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=1)
+        os.replace(tmp, self.path) # 書き込み途中で中断されても記録が壊れないように置き換える
+
+    def isUnchanged(self, rel, st, verify):
+        '''
+        前回の処理からサイズ、更新日時が変わっておらず、出力ファイルもある場合は True
+        前回がヘッダー部分だけの処理で、今回 verify の場合は処理し直す
+        '''
+        entry = self.files.get(rel)
+        if entry is None or entry["size"] != st.st_size or entry["mtime"] != st.st_mtime:
+            return False
+        if verify and not entry.get("verify", False):
+            return False
+        output = entry.get("output")
+        return output is None or os.path.exists(os.path.join(self.folder, output))
+
+def listGmlFiles(folder):
+    '''
+    指定フォルダー以下のすべての *.gml の相対パスを返却（出力ファイル "o_*.gml" は対象外）
+    '''
+    rels = []
+    for dirpath, dirnames, filenames in os.walk(folder):
+        dirnames.sort()
+        for name in sorted(filenames):
+            if name.lower().endswith(".gml") and not name.startswith(OUTPUT_PREFIX):
+                rels.append(os.path.relpath(os.path.join(dirpath, name), folder))
+    return rels
+
+def processFile(folder, rel, entry, verify):
+    '''
+    1ファイルの置換処理（スレッドで実行）。(新しい記録, 状態, 秒数) を返却
+    状態は "skip"（内容が前回と同じ）、"none"（置換するURLなし）、"replace"（置換して出力）
+    '''
+    started = time.time()
+    input_file = os.path.join(folder, rel)
+    st = os.stat(input_file)
+    digest, needed = scanFile(input_file, verify)
+    out_rel = os.path.join(os.path.dirname(rel), OUTPUT_PREFIX + os.path.basename(rel))
+    out_file = os.path.join(folder, out_rel)
+    new_entry = {"size": st.st_size, "mtime": st.st_mtime, "hash": digest, "output": None, "verify": verify}
+
+    if entry is not None and entry.get("hash") == digest and (entry.get("verify", False) or not verify):
+        # 更新日時だけが変わった場合は前回の出力をそのまま使う
+        output = entry.get("output")
+        if output is None or os.path.exists(os.path.join(folder, output)):
+            new_entry["output"] = output
+            new_entry["verify"] = entry.get("verify", False)
+            return new_entry, "skip", time.time() - started
+
+    if not needed:
+        # 前回出力したファイルが残っている場合は削除（内容が変わって置換が不要になった場合）
+        if os.path.exists(out_file):
+            os.remove(out_file)
+        return new_entry, "none", time.time() - started
+
+    if verify:
+        replaceAll(input_file, out_file)
+    else:
+        if replaceHeader(input_file, out_file) is None:
+            replaceAll(input_file, out_file)
+    new_entry["output"] = out_rel
+    return new_entry, "replace", time.time() - started
+
+def convertUrlsRecursive(folder, verify=False, workers=None):
+    '''
+    指定フォルダー以下のすべての *.gml を並列に処理し、URLを書きかえて同じフォルダーに "o_元のファイル名.gml" で保存する処理
+    前回の処理から変更のないファイルはスキップし、置換するURLがないファイルは出力しない
+    '''
+    blResult = True
+    try:
+        arcpy.AddMessage(u"CityGML ファイルのURL 置換処理を開始します（サブフォルダーを含む）。")
+        if workers is None or workers <= 0:
+            workers = BATCH_WORKERS if BATCH_WORKERS > 0 else min(os.cpu_count() or 1, 8)
+
+        with instr.phase(u"ファイル一覧"):
+            rels = listGmlFiles(folder)
+            manifest = UrlManifest(folder)
+            targets = []
+            unchanged = 0
+            for rel in rels:
+                if manifest.isUnchanged(rel, os.stat(os.path.join(folder, rel)), verify):
+                    unchanged += 1
+                else:
+                    targets.append(rel)
+            # 削除されたファイルの記録を削除
+            rel_set = set(rels)
+            removed = [rel for rel in manifest.files if rel not in rel_set]
+            for rel in removed:
+                del manifest.files[rel]
+
+        num = len(rels)
+        if num == 0:
+            arcpy.AddError(u"{0} には処理対象のCityGML ファイル（*.gml）がありません。".format(folder))
+            return False
+        arcpy.AddMessage(u"{0} ファイル中 {1} ファイルは前回から変更がないためスキップします（並列処理数: {2}）".format(num, unchanged, workers))
+
+        states = {"skip": unchanged, "none": 0, "replace": 0}
+        cnt = 0
+        with instr.phase(u"URL置換") as p:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(processFile, folder, rel, manifest.files.get(rel), verify) for rel in targets]
+                for rel, future in zip(targets, futures):
+                    new_entry, state, secs = future.result()
+                    manifest.files[rel] = new_entry
+                    states[state] += 1
+                    cnt += 1
+                    p.rows += 1
+                    instr.count(u"バイト数", new_entry["size"])
+                    instr.progress(u"URL 置換", cnt, len(targets))
+                    if cnt % MANIFEST_SAVE_INTERVAL == 0:
+                        manifest.save()
+            manifest.save()
+
+        instr.count(u"スキップ", states["skip"])
+        instr.count(u"置換不要", states["none"])
+        instr.count(u"置換", states["replace"])
+        arcpy.AddMessage(u"置換 {0} ファイル、置換不要 {1} ファイル、スキップ {2} ファイル".format(states["replace"], states["none"], states["skip"]))
+        arcpy.AddMessage(u"CityGML ファイルのURL 置換処理を終了しました")
+    except arcpy.ExecuteError:
+        arcpy.AddError(arcpy.GetMessages(2))
+        blResult = False
+    except Exception as e:
+        err = e.args[0]
+        tb = sys.exc_info()[2]
+        tbinfo = traceback.format_tb(tb)[0]
+        pymsg = "PYTHON ERRORS:\nTraceback info:\n" + tbinfo + "\nError Info:\n" + str(err)
+        arcpy.AddError(pymsg)
+        blResult = False
+
+    return blResult
+
 
 def main():
     try:
         arcpy.AddMessage(u"処理開始：")
         
         folder = arcpy.GetParameterAsText(0) # 解凍したcityを入れてあるフォルダ
+        verify = False
+        if arcpy.GetArgumentCount() >= 2:
+            verify = arcpy.GetParameterAsText(1).lower() == "true" # ファイル全体を検証
+        recursive = False
+        if arcpy.GetArgumentCount() >= 3:
+            recursive = arcpy.GetParameterAsText(2).lower() == "true" # サブフォルダーも処理
+        workers = None
+        if arcpy.GetArgumentCount() >= 4 and arcpy.GetParameterAsText(3) != "":
+            workers = int(arcpy.GetParameterAsText(3)) # 並列処理数
 
         # フォルダ内に格納されているCityGML ファイルのURLを置換する処理
-        convertUrls(folder)
+        instr.start("replace_iurUrl") # 処理時間の計測を開始
+        if recursive:
+            convertUrlsRecursive(folder, verify, workers)
+        else:
+            convertUrls(folder, verify)
+        instr.finish(folder) # 段階ごとの処理時間を指定フォルダに出力
 
         arcpy.AddMessage(u"処理終了：")
     except arcpy.ExecuteError:
@@ -0,0 +1,143 @@
+# coding:utf-8
+"""
+Name        :resolve_codeType_v100.py
+Purpose     :3D都市モデルで gml:CodeType の属性（例: 建物の gml:name → Building_name.xml）は、フィーチャクラスではコードの値のままになっているため、
+             コードリストの gml:description の説明で置換するツール。
+             field_calculate_buildingName_v100.py の処理を、任意のフィールドとコードリストの組み合わせ、複数のフィーチャクラスで実行できるようにしたもの。
+
+             ・コードリストのコード値を where 句（フィールド in (...)）にしてカーソルに渡し、コードの値が入っているレコードだけを読み込む
+             ・値が変わるレコードだけを updateRow で書き込む
+             ・メッセージはフィーチャクラス、フィールドごとに件数のみ表示
+             ・フィールド名は大文字小文字を区別せずに判定し、フィールドがあるフィーチャクラスがない場合は警告を表示
+
+             パラメータ
+               0: 3D都市モデルの変換先ファイル ジオデータベース
+               1: フィールド名 と コードリストファイル の組み合わせ（値テーブル。例: gml_name, Building_name.xml）
+               2: 対象のフィーチャクラス（複数指定可。省略した場合はフィールドがあるすべてのフィーチャクラス）
+Author      :
+Copyright   :
+Created     :2026/10/18
+Last Updated:2026/10/18
+ArcGIS Version: ArcGIS Pro 2.6 以上
+"""
+import arcpy
+import os
+import sys
+import traceback
+
+# 使いまわし可能な関数をimport
+import codelist_index_v100 as cdidx
+import instrumentation_v100 as instr
+
+# where 句にするコード値の件数の上限。超える場合は where 句を使わずに全件を読み込み、値が変わるレコードだけを書き込む
+WHERE_IN_MAX_CODES = 1000
+
+def createInWhereClause(fc, field, codes):
+    '''
+    コード値の一覧から「フィールド IN ('コード1','コード2',...)」の where 句を作成
+    '''
+    values = ",".join(["'{0}'".format(code.replace("'", "''")) for code in codes])
+    return "{0} IN ({1})".format(arcpy.AddFieldDelimiters(fc, field), values)
+
+def resolveCodeTypeField(fc, field, domainDict):
+    '''
+    指定フィーチャクラスの field に格納されているコードの値を、domainDict の説明に置換
+    (対象レコード件数, 置換した件数) を返却
+    '''
+    codes = [code for code in domainDict if (code is not None) and (domainDict[code] is not None)]
+    if len(codes) == 0:
+        return 0, 0
+    where_clause = None
+    if len(codes) <= WHERE_IN_MAX_CODES:
+        where_clause = createInWhereClause(fc, field, codes)
+
+    visited = 0
+    updated = 0
+    with arcpy.da.UpdateCursor(fc, [field], where_clause) as cur:
+        for r in cur:
+            visited += 1
+            key = r[0]
+            if key is None:
+                continue
+            desc = domainDict.get(key) # ディクショナリからdescription を取得(例外が発生しないようにgetで取得)
+            if (desc is not None) and (desc != key):
+                r[0] = desc
+                cur.updateRow(r) # 値が変わるレコードだけを書き込む
+                updated += 1
+    return visited, updated
+
+def resolveCodeTypeFields(pairs, fcnames):
+    '''
+    (フィールド名, コードリストファイル) の組み合わせごとに、フィーチャクラスのコードの値を説明に置換
+    フィールドがないフィーチャクラスはスキップ（フィールド名は大文字小文字を区別しない）
+    '''
+    for field, codelist_xml in pairs:
+        with instr.phase(u"コードリスト解析"):
+            domainName, domainDict = cdidx.getCodelist(codelist_xml)
+        arcpy.AddMessage(u"{0} のコード値 を {1} の説明 へ置換します（コード {2} 件）".format(field, os.path.basename(codelist_xml), len(domainDict)))
+        found = False
+        for fc in fcnames:
+            if not arcpy.Exists(fc):
+                continue
+            # ファイル ジオデータベースのフィールド名は大文字小文字を区別しないため、フィーチャクラスのフィールド名で処理する
+            fieldNames = dict((f.name.upper(), f.name) for f in arcpy.ListFields(fc))
+            fc_field = fieldNames.get(field.upper())
+            if fc_field is None:
+                continue
+            found = True
+            with instr.phase(u"カーソル書込") as p:
+                visited, updated = resolveCodeTypeField(fc, fc_field, domainDict)
+                p.rows += visited
+            instr.count(u"置換件数", updated)
+            arcpy.AddMessage(u"{0} の {1}: コード値 {2} 件を説明 へ置換しました（対象 {3} 件）".format(fc, fc_field, updated, visited))
+        if not found:
+            arcpy.AddWarning(u"{0} フィールドがあるフィーチャクラスがないため、{1} の置換は行いませんでした".format(field, os.path.basename(codelist_xml)))
+
+def main():
+    try:
+        arcpy.AddMessage(u"処理開始：")
+
+        gdb = arcpy.GetParameterAsText(0)
+        value_table = arcpy.GetParameter(1)
+        fcs = ""
+        if arcpy.GetArgumentCount() >= 3:
+            fcs = arcpy.GetParameterAsText(2)
+
+        # 入力値のチェック
+        if os.path.splitext(gdb)[1].upper() != ".GDB":
+            arcpy.AddError(u"{0} は3D都市モデルの変換先ファイル ジオデータベースを選択する必要があります".format(gdb))
+            return
+        pairs = []
+        for i in range(value_table.rowCount):
+            field = value_table.getValue(i, 0)
+            codelist_xml = value_table.getValue(i, 1)
+            if not os.path.exists(codelist_xml):
+                arcpy.AddError(u"{0} が存在しません".format(codelist_xml))
+                return
+            pairs.append((field, codelist_xml))
+
+        arcpy.env.workspace = gdb
+        # 処理時間の計測を開始
+        instr.start("resolve_codeType", gdb)
+        if fcs != "":
+            fcnames = [os.path.basename(fc.strip("'")) for fc in fcs.split(";")]
+        else:
+            fcnames = arcpy.ListFeatureClasses()
+
+        resolveCodeTypeFields(pairs, fcnames)
+
+        # 段階ごとの処理時間を GDB と同じフォルダーに出力
+        instr.finish()
+
+        arcpy.AddMessage(u"処理終了：")
+    except arcpy.ExecuteError:
+        arcpy.AddError(arcpy.GetMessages(2))
+    except Exception as e:
+        err = e.args[0]
+        tb = sys.exc_info()[2]
+        tbinfo = traceback.format_tb(tb)[0]
+        pymsg = "PYTHON ERRORS:\nTraceback info:\n" + tbinfo + "\nError Info:\n" + str(err)
+        arcpy.AddError(pymsg)
+
+if __name__ == '__main__':
+    main()
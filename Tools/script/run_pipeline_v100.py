@@ -0,0 +1,504 @@
+# coding:utf-8
+"""
+Name        :run_pipeline_v100.py
+Purpose     :1つの都市の3D都市モデル（解凍したフォルダー）を、地物ごとにFMEで変換して後処理のスクリプトツールまで実行するツール
+
+             これまでは model フォルダーの *_import_*.fmw の変換ツールと、後処理のツール（拡張属性のドメイン、汎用属性の展開、
+             土地利用の属性、建物名称、鉛直座標系の更新、urf の分類出力）を ArcGIS Pro で1つずつ順番に実行する必要があった。
+             ・地物（bldg, tran, dem, luse, urf, lsld, fld/tnm）ごとに 変換 → 後処理 の依存関係（DAG）のタスクを作成
+               （同じ GDB を更新する後処理は順番に実行し、異なる地物のタスクは並列数まで同時に実行する）
+             ・変換は Create_FME_PARAMETER_FILE と同じパラメータファイルを作成して「fme.exe PARAMETER_FILE」で実行
+               （fme.exe のパスに *.py のスタブを指定して、Data Interoperability がない環境でも実行できる）
+             ・後処理は各スクリプトツールを別プロセスの python で実行（arcpy.AddError のメッセージがあった場合は失敗とする）
+             ・完了したタスクは <出力フォルダー>/<都市名>_pipeline_state.json に記録し、再実行時は完了したタスクをスキップする
+               （タスクの引数が変わった場合、変換元の CityGML ファイルが追加、変更、削除された場合、出力の GDB がない場合、
+                 依存するタスクを実行した場合は再実行）
+             ・失敗したタスクに依存するタスクは実行しない
+             ・変換の前に GDB と、GDB と同じフォルダーの記録（汎用属性の展開の進捗、差分変換のマニフェスト）を削除
+             ・タスクごとの処理時間をメッセージと <出力フォルダー>/<都市名>_run_pipeline_<日時>.json に出力
+             ・各タスクの出力は <出力フォルダー>/<都市名>_pipeline_logs フォルダーにタスクごとに保存
+
+             入力のフォルダーの構成（G空間情報センターからダウンロードして解凍したフォルダー）
+               <都市名>/udx/bldg, tran, dem, luse, urf, lsld, fld, tnm（fld, tnm はサブフォルダーを含む）
+               <都市名>/codelists
+
+             パラメータ
+               0: 3D都市モデルのフォルダー、1: 出力フォルダー（GDB は <都市名>_<地物>.gdb で作成）
+               2: 並列数（省略可。省略時は DEFAULT_WORKERS）、3: 記録を削除して最初から実行する(true/false)（省略可）
+               4: fme.exe のパス（省略可。省略時はレジストリの Data Interoperability のインストール先）
+               5: iur1.4のxsdスキーマファイル（省略可）、6: 実行する地物（; 区切り。省略時はすべて）
+Author      :
+Copyright   :
+Created     :2026/10/18
+Last Updated:2026/10/18
+ArcGIS Version: ArcGIS Pro 2.6 以上
+"""
+import arcpy
+import os
+import sys
+import glob
+import json
+import time
+import hashlib
+import datetime
+import subprocess
+import collections
+import concurrent.futures
+import traceback
+
+import instrumentation_v100 as instr
+
+SCRIPT_FOLDER = os.path.dirname(os.path.abspath(__file__))
+TOOLS_FOLDER = os.path.dirname(SCRIPT_FOLDER)
+MODEL_FOLDER = os.path.join(TOOLS_FOLDER, "model")
+SCHEMA_FOLDER = os.path.join(TOOLS_FOLDER, "gdb_schema")
+FME_TOOL_FOLDER = os.path.join(TOOLS_FOLDER, u"FMEバッチファイル作成ツール")
+VCS_TOOL_FOLDER = os.path.join(TOOLS_FOLDER, u"鉛直座標系更新ツール")
+
+# パラメータファイルの作成、FMEの実行は Create_FME_PARAMETER_FILE と共通
+if FME_TOOL_FOLDER not in sys.path:
+    sys.path.append(FME_TOOL_FOLDER)
+import Create_FME_PARAMETER_FILE as cfp
+# 差分変換のマニフェスト、作業用のFGDBのパスは Update_FME_CONVERSION と共通
+import Update_FME_CONVERSION as updfme
+# 汎用属性の展開の進捗の記録のパスは calculate_genericAttributeSet_field と共通
+import expand_journal_v100 as expjnl
+
+DEFAULT_WORKERS = 2
+
+STATE_SUFFIX = "_pipeline_state.json"
+LOG_FOLDER_SUFFIX = "_pipeline_logs"
+
+UDX_FOLDER = "udx"
+CODELIST_FOLDER = "codelists"
+
+# 地物ごとの (地物, udx のフォルダー, FMW のモデル, テンプレートGDBスキーマファイル)
+FEATURE_TYPES = [
+    ("bldg", ["bldg"], "bldg_import_tokyo23_55cities_v112.fmw", "bldg_tokyo23_55cities_v112.xml"),
+    ("tran", ["tran"], "tran_import_tokyo23_55cities_v112.fmw", "tran_tokyo23_55cities_v112.xml"),
+    ("dem", ["dem"], "dem_import_tokyo23_55cities_v110.fmw", "dem_tokyo23_55cities_v112.xml"),
+    ("luse", ["luse"], "luse_import_tokyo23_55cities_v113.fmw", "luse_tokyo23_55cities_v111.xml"),
+    ("urf", ["urf"], "urf_import_tokyo23_55cities_v111.fmw", "urf_tokyo23_55cities_v111.xml"),
+    ("lsld", ["lsld"], "lsld_import_tokyo23_55cities_v111.fmw", "lsld_tokyo23_55cities_v111.xml"),
+    ("fld_tnm", ["fld", "tnm"], "fld_tnm_import_tokyo23_55cities_v112.fmw", "fld_tnm_tokyo23_55cities_v113.xml"),
+]
+
+# 地物ごとの後処理 [(タスク名, スクリプト, 引数を作成する関数, 実行に必要なファイル・データを返す関数)]
+# 引数を作成する関数には (GDB, コードリストのフォルダー) を渡す。必要なファイル・データがない場合はスキップする
+def codelist(name):
+    return lambda gdb, codelists: os.path.join(codelists, name)
+
+def inGdb(name):
+    return lambda gdb, codelists: os.path.join(gdb, name)
+
+POST_PROCESSES = {
+    "bldg": [
+        ("extendedAttributes", os.path.join(SCRIPT_FOLDER, "assign_extendedAttributes_v113.py"),
+         lambda gdb, codelists: [os.path.join(codelists, "extendedAttribute_key.xml"), gdb], [codelist("extendedAttribute_key.xml")]),
+        ("genericAttributeSet", os.path.join(SCRIPT_FOLDER, "calculate_genericAttributeSet_field_v112.py"),
+         lambda gdb, codelists: [gdb], []),
+        ("buildingName", os.path.join(SCRIPT_FOLDER, "field_calculate_buildingName_v100.py"),
+         lambda gdb, codelists: [os.path.join(codelists, "Building_name.xml"), gdb], [codelist("Building_name.xml")]),
+    ],
+    "luse": [
+        ("landuseAttributes", os.path.join(SCRIPT_FOLDER, "assign_landuseAttributes_v113.py"),
+         lambda gdb, codelists: [os.path.join(codelists, "LandUse_genUsage.xml"), gdb], [codelist("LandUse_genUsage.xml")]),
+    ],
+    "urf": [
+        ("areaClassification", os.path.join(SCRIPT_FOLDER, "filter_export_AreaClassification_v100.py"),
+         lambda gdb, codelists: [os.path.join(gdb, "lod0_AreaClassification"), gdb], [inGdb("lod0_AreaClassification")]),
+        ("districtAndZones", os.path.join(SCRIPT_FOLDER, "filter_export_DistrictAndZones_v100.py"),
+         lambda gdb, codelists: [os.path.join(gdb, "lod0_DistrictAndZones"), gdb], [inGdb("lod0_DistrictAndZones")]),
+    ],
+    "lsld": [
+        ("genericAttributeSet", os.path.join(SCRIPT_FOLDER, "calculate_genericAttributeSet_field_v112.py"),
+         lambda gdb, codelists: [gdb], []),
+    ],
+    "fld_tnm": [
+        ("genericAttributeSet", os.path.join(SCRIPT_FOLDER, "calculate_genericAttributeSet_field_v112.py"),
+         lambda gdb, codelists: [gdb], []),
+    ],
+}
+# 全ての地物の最後に実行する後処理
+FINAL_PROCESSES = [
+    ("vcs", os.path.join(VCS_TOOL_FOLDER, "Update_VCS_Spref.py"), lambda gdb, codelists: [gdb], []),
+]
+
+# 後処理のスクリプトを実行するコード。arcpy.AddError が呼び出された場合は終了コード 1 で終了する
+# （スクリプトツールは例外を AddError で出力して正常終了するため）
+TASK_RUNNER_CODE = u"""
+import os, sys, runpy, arcpy
+errors = []
+addError = arcpy.AddError
+def recordError(message):
+    errors.append(message)
+    addError(message)
+arcpy.AddError = recordError
+sys.argv = sys.argv[1:]
+sys.path.insert(0, os.path.dirname(os.path.abspath(sys.argv[0])))
+runpy.run_path(sys.argv[0], run_name="__main__")
+sys.exit(1 if errors else 0)
+"""
+
+# タスクの状態
+DONE = "done"
+SKIPPED = "skipped"
+CACHED = "cached"
+FAILED = "failed"
+BLOCKED = "blocked"
+
+class Task(object):
+    '''
+    パイプラインの1つのタスク（FMEの変換、または後処理のスクリプト）
+    '''
+    def __init__(self, name, feature_type, deps, gdb):
+        self.name = name
+        self.feature_type = feature_type
+        self.deps = deps
+        self.gdb = gdb
+        self.requires = []
+        self.status = None
+        self.seconds = 0.0
+        self.returncode = None
+
+    def getSignature(self):
+        data = json.dumps(self.getCommand(), ensure_ascii=False, sort_keys=True)
+        return hashlib.md5(data.encode("utf-8")).hexdigest()
+
+    def getOutputs(self):
+        return [self.gdb]
+
+class ConvertTask(Task):
+    '''
+    FMEの変換タスク。実行前に Create_FME_PARAMETER_FILE と同じパラメータファイルを作成する
+    '''
+    def __init__(self, name, feature_type, gdb, model, schema_xml, citygml_folders, param_file, xsd_file):
+        Task.__init__(self, name, feature_type, [], gdb)
+        self.model = model
+        self.schema_xml = schema_xml
+        self.citygml_folders = citygml_folders
+        self.param_file = param_file
+        self.xsd_file = xsd_file
+
+    def getCommand(self):
+        return ["fme", self.model, self.schema_xml, self.citygml_folders, self.gdb, self.xsd_file]
+
+    def getSourceFiles(self):
+        '''
+        変換元の CityGML ファイルの [(udx からの相対パス, サイズ, 更新日時)]
+        （ファイルの追加、再公開による変更、削除があった場合にタスクの署名を変えるため）
+        '''
+        files = cfp.listCityGmlFiles(self.citygml_folders)
+        base = os.path.commonpath([os.path.dirname(os.path.normpath(folder)) for folder in self.citygml_folders.split(";")])
+        sources = []
+        for f in sorted(files):
+            st = os.stat(f)
+            sources.append([os.path.relpath(f, base).replace("\\", "/"), st.st_size, st.st_mtime])
+        return sources
+
+    def getSignature(self):
+        data = json.dumps([self.getCommand(), self.getSourceFiles()], ensure_ascii=False, sort_keys=True)
+        return hashlib.md5(data.encode("utf-8")).hexdigest()
+
+    def getSidecars(self):
+        '''
+        GDB と同じフォルダーに作成される、GDB の内容に対応した記録（展開処理の進捗、差分変換のマニフェスト）と作業用のFGDB
+        '''
+        return [expjnl.getJournalPath(self.gdb), updfme.getManifestPath(self.gdb), updfme.getStagingPath(self.gdb)]
+
+    def prepare(self):
+        # 途中まで変換された GDB が残っている場合は削除してから変換
+        if arcpy.Exists(self.gdb):
+            arcpy.Delete_management(self.gdb)
+        # 削除した GDB の記録が残っていると、後処理がスキップされたり差分変換で誤ったフィーチャを置き換えるため削除
+        for path in self.getSidecars():
+            if os.path.splitext(path)[1].upper() == ".GDB":
+                if arcpy.Exists(path):
+                    arcpy.Delete_management(path)
+            elif os.path.exists(path):
+                os.remove(path)
+        return cfp.createParameterFile(self.model, self.citygml_folders, self.schema_xml, self.gdb, self.param_file, self.xsd_file)
+
+    def run(self, context):
+        returncode, elapsed = cfp.runParameterFile(context.fme_exe, self.param_file)
+        return returncode, self.param_file + cfp.LOG_FILE_EXT
+
+class ScriptTask(Task):
+    '''
+    後処理のスクリプトツールを別プロセスで実行するタスク
+    '''
+    def __init__(self, name, feature_type, deps, gdb, script, args, requires):
+        Task.__init__(self, name, feature_type, deps, gdb)
+        self.script = script
+        self.args = args
+        self.requires = requires
+
+    def getCommand(self):
+        return [os.path.basename(self.script)] + self.args
+
+    def prepare(self):
+        return True
+
+    def run(self, context):
+        log_file = os.path.join(context.log_folder, self.name + ".log")
+        with open(log_file, "wb") as log:
+            proc = subprocess.run([getPythonExecutable(), "-c", TASK_RUNNER_CODE, self.script] + self.args,
+                                  stdout=log, stderr=subprocess.STDOUT, cwd=os.path.dirname(self.script))
+        return proc.returncode, log_file
+
+def getPythonExecutable():
+    '''
+    ArcGIS Pro から実行する場合は sys.executable が ArcGISPro.exe になるので、python.exe を使用する
+    '''
+    exe = os.path.join(sys.exec_prefix, "python.exe")
+    return exe if os.path.exists(exe) else sys.executable
+
+def findCityGmlFolders(udx_folder, names):
+    '''
+    udx の下の指定フォルダー（サブフォルダーを含む）のうち、*.gml があるフォルダーの一覧を返却
+    '''
+    folders = []
+    for name in names:
+        for root, dirs, files in os.walk(os.path.join(udx_folder, name)):
+            dirs.sort()
+            if any(f.lower().endswith(".gml") for f in files):
+                folders.append(root)
+    return folders
+
+class PipelineContext(object):
+    '''
+    タスクの作成と実行に使う、入力、出力のフォルダーなどの設定
+    '''
+    def __init__(self, city_folder, out_folder, fme_exe=None, xsd_file=None):
+        self.city_folder = os.path.normpath(city_folder)
+        self.city_name = os.path.basename(self.city_folder)
+        self.out_folder = out_folder
+        self.codelists = os.path.join(self.city_folder, CODELIST_FOLDER)
+        # fme.exe は fme.exe のフォルダーで実行するため絶対パスにする
+        self.fme_exe = os.path.abspath(fme_exe) if fme_exe else cfp.getFmeExePath()
+        self.xsd_file = xsd_file
+        self.log_folder = os.path.join(out_folder, self.city_name + LOG_FOLDER_SUFFIX)
+        self.state_file = os.path.join(out_folder, self.city_name + STATE_SUFFIX)
+
+    def getGdb(self, feature_type):
+        return os.path.join(self.out_folder, "{0}_{1}.gdb".format(self.city_name, feature_type))
+
+def createPostProcessTasks(context, feature_type, gdb, prev):
+    tasks = []
+    for step, script, createArgs, requires in POST_PROCESSES.get(feature_type, []) + FINAL_PROCESSES:
+        name = "{0}.{1}".format(feature_type, step)
+        task = ScriptTask(name, feature_type, [prev], gdb, script, createArgs(gdb, context.codelists),
+                          [r(gdb, context.codelists) for r in requires])
+        tasks.append(task)
+        prev = name
+    return tasks
+
+def buildTasks(context, feature_types=None):
+    '''
+    地物ごとに 変換 → 後処理 のタスクを作成して、{タスク名: タスク} を依存関係の順に返却
+    CityGML のフォルダーがない地物はタスクを作成しない
+    '''
+    tasks = collections.OrderedDict()
+    udx_folder = os.path.join(context.city_folder, UDX_FOLDER)
+    for feature_type, names, model, schema in FEATURE_TYPES:
+        if feature_types and feature_type not in feature_types:
+            continue
+        folders = findCityGmlFolders(udx_folder, names)
+        if len(folders) == 0:
+            arcpy.AddMessage(u"{0}: CityGML ファイルがないため変換しません".format(feature_type))
+            continue
+        gdb = context.getGdb(feature_type)
+        name = "{0}.convert".format(feature_type)
+        param_file = os.path.join(context.out_folder, "{0}_{1}.par".format(context.city_name, feature_type))
+        tasks[name] = ConvertTask(name, feature_type, gdb, os.path.join(MODEL_FOLDER, model), os.path.join(SCHEMA_FOLDER, schema),
+                                  ";".join(folders), param_file, context.xsd_file)
+        for task in createPostProcessTasks(context, feature_type, gdb, name):
+            tasks[task.name] = task
+    return tasks
+
+class PipelineState(object):
+    '''
+    完了したタスクの記録（{タスク名: {"status", "signature", "seconds", "finished"}}）
+    '''
+    def __init__(self, path, force=False):
+        self.path = path
+        self.tasks = {}
+        if force and os.path.exists(path):
+            os.remove(path)
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self.tasks = json.load(f).get("tasks", {})
+
+    def isDone(self, task):
+        record = self.tasks.get(task.name)
+        return record is not None and record.get("status") == DONE and record.get("signature") == task.getSignature()
+
+    def record(self, task):
+        self.tasks[task.name] = {"status": task.status, "signature": task.getSignature(), "seconds": round(task.seconds, 3),
+                                 "finished": datetime.datetime.now().isoformat()}
+        self.save()
+
+    def save(self):
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"tasks": self.tasks}, f, ensure_ascii=False, indent=1)
+        os.replace(tmp, self.path)
+
+def getReadiness(task, tasks):
+    '''
+    依存するタスクの状態から、実行できる場合は True、待つ場合は False、実行しない場合は BLOCKED を返却
+    '''
+    for dep in task.deps:
+        status = tasks[dep].status
+        if status in (FAILED, BLOCKED):
+            return BLOCKED
+        if status is None:
+            return False
+    return True
+
+def canSkip(task, tasks, state):
+    '''
+    前回完了していて、引数が同じで出力があり、依存するタスクを今回実行していない場合は True
+    '''
+    if not state.isDone(task):
+        return False
+    if any(tasks[dep].status != CACHED for dep in task.deps):
+        return False
+    return all(arcpy.Exists(path) for path in task.getOutputs())
+
+def runTasks(context, tasks, workers, state):
+    '''
+    依存関係の順に、実行できるタスクを workers の並列数で実行
+    '''
+    pending = list(tasks.values())
+    running = {}
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        while len(pending) > 0 or len(running) > 0:
+            for task in list(pending):
+                if len(running) >= workers:
+                    break
+                ready = getReadiness(task, tasks)
+                if ready is False:
+                    continue
+                pending.remove(task)
+                if ready == BLOCKED:
+                    task.status = BLOCKED
+                    arcpy.AddWarning(u"{0}: 依存するタスクが失敗したため実行しません".format(task.name))
+                elif canSkip(task, tasks, state):
+                    task.status = CACHED
+                    arcpy.AddMessage(u"{0}: 前回の実行で完了しているためスキップします".format(task.name))
+                elif not all(arcpy.Exists(path) or os.path.exists(path) for path in task.requires):
+                    task.status = SKIPPED
+                    arcpy.AddWarning(u"{0}: {1} がないためスキップします".format(task.name, ", ".join(task.requires)))
+                elif not task.prepare():
+                    task.status = FAILED
+                    state.record(task)
+                else:
+                    arcpy.AddMessage(u"{0}: 開始".format(task.name))
+                    running[executor.submit(runTask, task, context)] = task
+            if len(running) == 0:
+                continue
+            finished, unused = concurrent.futures.wait(list(running.keys()), return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in finished:
+                task = running.pop(future)
+                try:
+                    returncode, log_file = future.result()
+                except OSError as e:
+                    returncode, log_file = None, None
+                    arcpy.AddError(u"{0}: 実行できませんでした（{1}）".format(task.name, e))
+                task.returncode = returncode
+                task.status = DONE if returncode == 0 else FAILED
+                p = instr.phase(task.name)
+                p.calls += 1
+                p.add(task.seconds)
+                if task.status == DONE:
+                    arcpy.AddMessage(u"{0}: 終了 {1}".format(task.name, cfp.formatSeconds(task.seconds)))
+                else:
+                    arcpy.AddWarning(u"{0}: 終了コード {1}, 処理時間 {2}（ログ: {3}）".format(task.name, returncode, cfp.formatSeconds(task.seconds), log_file))
+                state.record(task)
+
+def runTask(task, context):
+    '''
+    ワーカーのスレッドで実行する処理。(終了コード, ログファイル) を返却し、処理時間は task.seconds に設定
+    '''
+    start = time.time()
+    try:
+        return task.run(context)
+    finally:
+        task.seconds = time.time() - start
+
+def reportSummary(tasks):
+    '''
+    タスクごとの状態と処理時間を表示
+    '''
+    arcpy.AddMessage(u"タスクごとの処理時間:")
+    for task in tasks.values():
+        arcpy.AddMessage(u"  {0}: {1} {2}".format(task.name, task.status, cfp.formatSeconds(task.seconds) if task.seconds > 0 else ""))
+    counts = collections.Counter(task.status for task in tasks.values())
+    for status in (DONE, CACHED, SKIPPED, FAILED, BLOCKED):
+        instr.count(status, counts.get(status, 0))
+    arcpy.AddMessage(u"実行 {0} / スキップ {1} / 失敗 {2} / 未実行 {3}".format(
+        counts.get(DONE, 0), counts.get(CACHED, 0) + counts.get(SKIPPED, 0), counts.get(FAILED, 0), counts.get(BLOCKED, 0)))
+
+def runPipeline(city_folder, out_folder, workers=None, force=False, fme_exe=None, xsd_file=None, feature_types=None):
+    '''
+    3D都市モデルのフォルダーの地物ごとのタスクを作成して実行し、{タスク名: タスク} を返却
+    '''
+    if workers is None or workers <= 0:
+        workers = DEFAULT_WORKERS
+    if not os.path.exists(out_folder):
+        os.makedirs(out_folder)
+    context = PipelineContext(city_folder, out_folder, fme_exe, xsd_file)
+    if not os.path.exists(context.log_folder):
+        os.makedirs(context.log_folder)
+    tasks = buildTasks(context, feature_types)
+    arcpy.AddMessage(u"{0} 件のタスクを {1} 並列で実行します（fme.exe: {2}）".format(len(tasks), workers, context.fme_exe))
+    state = PipelineState(context.state_file, force)
+    runTasks(context, tasks, workers, state)
+    reportSummary(tasks)
+    return tasks
+
+def main():
+    try:
+        arcpy.AddMessage(u"処理開始：")
+
+        city_folder = arcpy.GetParameterAsText(0)
+        out_folder = arcpy.GetParameterAsText(1)
+        workers = None
+        if arcpy.GetArgumentCount() >= 3 and arcpy.GetParameterAsText(2) != "":
+            workers = int(arcpy.GetParameterAsText(2))
+        force = False
+        if arcpy.GetArgumentCount() >= 4:
+            force = arcpy.GetParameterAsText(3).lower() == "true"
+        fme_exe = None
+        if arcpy.GetArgumentCount() >= 5 and arcpy.GetParameterAsText(4) != "":
+            fme_exe = arcpy.GetParameterAsText(4)
+        xsd_file = None
+        if arcpy.GetArgumentCount() >= 6 and arcpy.GetParameterAsText(5) != "":
+            xsd_file = arcpy.GetParameterAsText(5)
+        feature_types = None
+        if arcpy.GetArgumentCount() >= 7 and arcpy.GetParameterAsText(6) != "":
+            feature_types = [t.strip() for t in arcpy.GetParameterAsText(6).split(";") if t.strip() != ""]
+
+        # 入力値のチェック
+        if not os.path.isdir(os.path.join(city_folder, UDX_FOLDER)):
+            arcpy.AddError(u"{0} には {1} フォルダーがありません。解凍した3D都市モデルのフォルダーを指定してください".format(city_folder, UDX_FOLDER))
+            return
+
+        # 処理時間の計測を開始（タスクごとの処理時間を <都市名>_run_pipeline_<日時>.json に出力）
+        instr.start("run_pipeline", os.path.join(out_folder, os.path.basename(os.path.normpath(city_folder))))
+        runPipeline(city_folder, out_folder, workers, force, fme_exe, xsd_file, feature_types)
+        instr.finish()
+
+        arcpy.AddMessage(u"処理終了：")
+    except arcpy.ExecuteError:
+        arcpy.AddError(arcpy.GetMessages(2))
+    except Exception as e:
+        err = e.args[0]
+        tb = sys.exc_info()[2]
+        tbinfo = traceback.format_tb(tb)[0]
+        pymsg = "PYTHON ERRORS:\nTraceback info:\n" + tbinfo + "\nError Info:\n" + str(err)
+        arcpy.AddError(pymsg)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,163 @@
+# coding:utf-8
+"""
+Name        :schema_planner_v100.py
+Purpose     :xml_genericAttributeSet を展開する 'name:type' のキーから、追加するフィールドの計画（スキーマ）を作成して、
+             フィーチャクラスごとに AddFields_management の1回の呼び出しで追加する共通処理。
+
+             AddField_management でフィールドを1件ずつ追加すると、フィールドの件数分スキーマのロックと書き換えが必要になり、
+             使用できない名前は警告のみでフィールド名が変更されるため、追加後に ListFields で確認する必要があった。
+             フィールドを追加する前に、次の処理で全てのキーのフィールド名を確定することで、追加時のフィールド名の変更が起こらないようにする。
+             ・arcpy.ValidateFieldName でファイル ジオデータベースで使用できない文字を置換し、FIELD_NAME_MAX_LENGTH 文字以内にする
+             ・予約語（SQL のキーワード）、システムのフィールド名（OBJECTID, SHAPE など）は末尾に "_" を付ける
+             ・大文字小文字のみが異なる名前、置換後に同じになる名前、同じ name で型が異なるキーは、2つ目以降を "名前_x" にする（x=2から付番）
+             ・対象のフィーチャクラス（FCNAMES）の既存のフィールドは最初にまとめて取得し、同じ名前の既存のフィールドにはそのまま展開する
+             ・同じキーは、全てのフィーチャクラスで同じフィールド名にする
+Author      :
+Copyright   :
+Created     :2026/10/18
+Last Updated:2026/10/18
+ArcGIS Version: ArcGIS Pro 2.6 以上
+"""
+import arcpy
+
+# ファイル ジオデータベースのフィールド名の最大文字数
+FIELD_NAME_MAX_LENGTH = 64
+
+# フィールド名に使用しない予約語（ファイル ジオデータベースの SQL のキーワード）
+RESERVED_WORDS = set([
+    "ADD", "ALL", "ALTER", "AND", "ANY", "AS", "ASC", "AVG", "BETWEEN", "BY", "CASE", "CAST", "CHAR", "CHARACTER", "CHECK",
+    "COLUMN", "COUNT", "CREATE", "CURRENT", "DATE", "DECIMAL", "DEFAULT", "DELETE", "DESC", "DISTINCT", "DOUBLE", "DROP",
+    "ELSE", "END", "ESCAPE", "EXISTS", "EXTRACT", "FALSE", "FLOAT", "FOR", "FOREIGN", "FROM", "FULL", "GROUP", "HAVING",
+    "IN", "INDEX", "INNER", "INSERT", "INT", "INTEGER", "INTERVAL", "INTO", "IS", "JOIN", "KEY", "LEFT", "LIKE", "LOWER",
+    "MAX", "MIN", "NOT", "NULL", "NUMERIC", "ON", "OR", "ORDER", "OUTER", "POSITION", "PRIMARY", "REAL", "REFERENCES",
+    "RIGHT", "SELECT", "SET", "SMALLINT", "SOME", "SUM", "TABLE", "THEN", "TIME", "TIMESTAMP", "TO", "TRIM", "TRUE",
+    "UNION", "UNIQUE", "UPDATE", "UPPER", "USER", "VALUES", "VARCHAR", "WHEN", "WHERE", "WITH"])
+# 展開したフィールドに使用しないシステムのフィールド名
+SYSTEM_FIELDS = set(["OBJECTID", "OID", "FID", "SHAPE", "SHAPE_LENGTH", "SHAPE_AREA", "GLOBALID", "XML_GENERICATTRIBUTESET"])
+
+# AddFields_management で使用できるフィールドの型（それ以外は TEXT で追加）
+ADDFIELDS_TYPES = set(["TEXT", "FLOAT", "DOUBLE", "SHORT", "LONG", "DATE", "BLOB", "GUID"])
+
+def validateFieldName(name, workspace=None):
+    '''
+    使用できない文字を置換し、予約語、システムのフィールド名の場合は末尾に "_" を付けたフィールド名を返却
+    '''
+    new_name = arcpy.ValidateFieldName(name, workspace)
+    if new_name.upper() in RESERVED_WORDS or new_name.upper() in SYSTEM_FIELDS:
+        new_name = new_name + "_"
+    return new_name[:FIELD_NAME_MAX_LENGTH]
+
+def createSuffixedName(name, n):
+    '''
+    "名前_x" のフィールド名を作成（最大文字数を超える場合は名前を切り詰める）
+    '''
+    suffix = "_{0}".format(n)
+    return name[:FIELD_NAME_MAX_LENGTH - len(suffix)] + suffix
+
+class SchemaPlan(object):
+    '''
+    'name:type' のキーと追加するフィールド名の対応を保持するクラス
+    作成時に対象のフィーチャクラスの既存のフィールドを取得し、resolveKey で確定したフィールド名は全てのフィーチャクラスで共通にする
+    '''
+    def __init__(self, fcs, workspace=None):
+        self.workspace = workspace
+        # フィーチャクラスごとの既存のフィールド {大文字のフィールド名: (フィールド名, 型)}
+        self.existing = {}
+        for fc in fcs:
+            self.existing[fc] = dict((f.name.upper(), (f.name, f.type)) for f in arcpy.ListFields(fc))
+        # 確定したキーとフィールド名の対応、フィールド名（大文字）ごとのキー
+        self.names = {}
+        self.owners = {}
+
+    def getExisting(self, fc):
+        fields = self.existing.get(fc)
+        if fields is None:
+            fields = dict((f.name.upper(), (f.name, f.type)) for f in arcpy.ListFields(fc))
+            self.existing[fc] = fields
+        return fields
+
+    def isClaimed(self, name, key):
+        '''
+        他のキーのフィールド名、または予約語、システムのフィールド名と重複する場合は True
+        '''
+        owner = self.owners.get(name.upper())
+        if owner is not None and owner != key:
+            return True
+        return name.upper() in SYSTEM_FIELDS or name.upper() in RESERVED_WORDS
+
+    def resolveKey(self, key):
+        '''
+        キーのフィールド名を確定して返却（確定済みの場合は同じフィールド名）
+        '''
+        name = self.names.get(key)
+        if name is not None:
+            return name
+        fieldName, fieldType = key.split(":")
+        base = validateFieldName(fieldName, self.workspace)
+        name = base
+        n = 1
+        while self.isClaimed(name, key):
+            n += 1
+            name = createSuffixedName(base, n)
+        self.names[key] = name
+        self.owners[name.upper()] = key
+        return name
+
+    def claimKeys(self, column_keys):
+        '''
+        付番しなくても重複しないキーのフィールド名を先に確定する
+        （gen_備考_2 のように name の時点で付番されているキーが、型の異なる gen_備考 の付番と重複しないようにする）
+        '''
+        for key in column_keys:
+            if key not in self.names:
+                name = validateFieldName(key.split(":")[0], self.workspace)
+                if not self.isClaimed(name, key):
+                    self.names[key] = name
+                    self.owners[name.upper()] = key
+
+    def planFields(self, fc, column_keys):
+        '''
+        キーの一覧から、(展開するフィールド名の一覧, 追加するフィールドの AddFields の定義の一覧) を作成
+        フィールド名が変更される場合はメッセージを表示
+        '''
+        existing = self.getExisting(fc)
+        self.claimKeys(column_keys)
+        update_fields = []
+        new_fields = []
+        for key in column_keys:
+            fieldName, fieldType = key.split(":")
+            name = self.resolveKey(key)
+            if name != fieldName:
+                arcpy.AddMessage(u"{0}: フィールド名を {1} にして展開します".format(fieldName, name))
+            current = existing.get(name.upper())
+            if current is not None:
+                arcpy.AddWarning(u"{0}: フィールド はすでに存在しているので、フィールド追加の処理はスキップします".format(current[0]))
+                name = current[0]
+            else:
+                addType = fieldType.upper() if fieldType.upper() in ADDFIELDS_TYPES else "TEXT"
+                new_fields.append([name, addType, "", None, None, ""])
+            update_fields.append(name)
+        return update_fields, new_fields
+
+    def applyFields(self, fc, new_fields):
+        '''
+        AddFields_management の1回の呼び出しでフィールドを追加し、既存のフィールドに追加
+        '''
+        if len(new_fields) == 0:
+            return
+        arcpy.AddMessage(u"{0}: フィールド を追加します".format(", ".join([f[0] for f in new_fields])))
+        arcpy.AddFields_management(fc, new_fields)
+        existing = self.getExisting(fc)
+        for f in new_fields:
+            existing[f[0].upper()] = (f[0], f[1])
+
+def planAndAddFields(fc, column_keys, plan=None):
+    '''
+    キーの一覧からフィールドを追加して、キーと同じ順の展開するフィールド名の一覧を返却
+    plan を指定しない場合は、指定したフィーチャクラスのみの計画を作成する
+    '''
+    if plan is None:
+        plan = SchemaPlan([fc])
+    update_fields, new_fields = plan.planFields(fc, column_keys)
+    plan.applyFields(fc, new_fields)
+    return update_fields
@@ -0,0 +1,212 @@
+# coding:utf-8
+"""
+Name        :urf_splitter_v100.py
+Purpose     :lod0_DistrictAndZones, lod0_AreaClassification を設定ファイルのクエリごとに別フィーチャクラスに出力する共通処理（filter_export の振り分け）。
+
+             設定ファイルの行ごとに SelectLayerByAttribute + GetCount + FeatureClassToFeatureClass を実行すると、
+             入力のフィーチャクラスを出力の件数の2～3倍読み込むことになるため、次の手順で1回の読み込みで出力する。
+             ・設定ファイルのクエリ（urf_class in ('0','1') や urf_class = '14' の形式）を {値: [出力の番号]} の振り分け表に変換
+             ・入力のフィーチャクラスを SearchCursor で1回読み込み、値に該当する全ての出力の InsertCursor に追加
+             ・出力のフィーチャクラスは該当するデータが最初に見つかったときに作成する（該当データがない出力は作成しない）
+             ・振り分け表に変換できないクエリ（AND, LIKE などを含むもの）の出力は、従来どおり FeatureClassToFeatureClass で出力する
+Author      :
+Copyright   :
+Created     :2026/10/18
+Last Updated:2026/10/18
+ArcGIS Version: ArcGIS Pro 2.6 以上
+"""
+import arcpy
+import os
+import re
+import contextlib
+
+import instrumentation_v100 as instr
+
+# 振り分け表に変換するクエリの形式（フィールド名 in (値, ...) または フィールド名 = 値）
+IN_PATTERN = re.compile(r"^\s*(\w+)\s+in\s*\((.*)\)\s*$", re.IGNORECASE | re.DOTALL)
+EQUAL_PATTERN = re.compile(r"^\s*(\w+)\s*=\s*('(?:[^']|'')*'|[-+]?\d+(?:\.\d+)?)\s*$")
+VALUE_PATTERN = re.compile(r"\s*('(?:[^']|'')*'|[-+]?\d+(?:\.\d+)?)\s*(,|$)")
+
+# 出力しないフィールドの型
+SKIP_FIELD_TYPES = set(["OID", "Geometry", "GlobalID", "Raster"])
+
+class ExportClass(object):
+    '''
+    設定ファイルの1行（出力フィーチャクラス、エイリアス、クエリ）
+    '''
+    def __init__(self, name, alias, expression):
+        self.name = name
+        self.alias = alias
+        self.expression = expression
+        self.field = None
+        self.values = None
+        self.count = 0
+
+    def compile(self):
+        '''
+        クエリを (フィールド名, 値の一覧) に変換（変換できない場合は False）
+        '''
+        m = IN_PATTERN.match(self.expression)
+        if m is not None:
+            values = parseValues(m.group(2))
+        else:
+            m = EQUAL_PATTERN.match(self.expression)
+            values = parseValues(m.group(2)) if m is not None else None
+        if values is None:
+            return False
+        self.field = m.group(1)
+        self.values = values
+        return True
+
+def parseValues(text):
+    '''
+    'a','b',1 の形式の値を文字列の一覧に変換（変換できない場合は None）
+    '''
+    values = []
+    pos = 0
+    text = text.strip()
+    while pos < len(text):
+        m = VALUE_PATTERN.match(text, pos)
+        if m is None or m.end() == pos:
+            return None
+        v = m.group(1)
+        values.append(v[1:-1].replace("''", "'") if v.startswith("'") else v)
+        pos = m.end()
+    return values if len(values) > 0 else None
+
+def readConfig(config_file):
+    '''
+    設定ファイル（utf-8, 区切り文字は;, 1行目はヘッダー）から ExportClass の一覧を作成
+    '''
+    classes = []
+    with open(config_file, encoding='utf-8') as f:
+        next(f) # ヘッダーは読み飛ばす
+        for line in f:
+            line = line.rstrip("\r\n")
+            if line.strip() == "":
+                continue
+            params = line.split(";")
+            # クエリに ; が含まれる場合も読み込めるように、3列目以降はクエリとする
+            classes.append(ExportClass(params[0], params[1], ";".join(params[2:])))
+    return classes
+
+def normalizeValue(value):
+    '''
+    フィールドの値を振り分け表のキー（文字列）に変換（1.0 のような整数の値は 1 にする）
+    '''
+    if value is None:
+        return None
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value)
+
+def createRoutes(classes):
+    '''
+    変換できたクエリから {フィールド名: {値: [出力の番号]}} の振り分け表を作成
+    '''
+    routes = {}
+    for i, c in enumerate(classes):
+        if c.field is None:
+            continue
+        table = routes.setdefault(c.field, {})
+        for v in c.values:
+            indexes = table.setdefault(v, [])
+            if i not in indexes:
+                indexes.append(i)
+    return routes
+
+def getCopyFields(input_fc):
+    '''
+    入力のフィーチャクラスから出力にコピーするフィールドの一覧を取得
+    '''
+    desc = arcpy.Describe(input_fc)
+    skip = set([n.upper() for n in (getattr(desc, "lengthFieldName", ""), getattr(desc, "areaFieldName", "")) if n])
+    return [f.name for f in arcpy.ListFields(input_fc) if f.type not in SKIP_FIELD_TYPES and f.name.upper() not in skip]
+
+def createOutput(input_fc, out_ws, c):
+    '''
+    入力のフィーチャクラスをテンプレートに出力のフィーチャクラスを作成（既存のフィーチャクラスがある場合は削除）
+    '''
+    arcpy.AddMessage(u"{0} ({1}) へエクスポート".format(c.name, c.alias))
+    out_fc = os.path.join(out_ws, c.name)
+    if arcpy.Exists(out_fc):
+        arcpy.Delete_management(out_fc)
+    desc = arcpy.Describe(input_fc)
+    arcpy.CreateFeatureclass_management(out_ws, c.name, desc.shapeType, input_fc,
+                                        "ENABLED" if getattr(desc, "hasM", False) else "DISABLED",
+                                        "ENABLED" if getattr(desc, "hasZ", False) else "DISABLED",
+                                        desc.spatialReference)
+    arcpy.AlterAliasName(out_fc, c.alias)
+    return out_fc
+
+def splitFeatures(input_fc, out_ws, classes):
+    '''
+    振り分け表に変換できた出力を、入力のフィーチャクラスの1回の読み込みで作成
+    '''
+    routes = createRoutes(classes)
+    if len(routes) == 0:
+        return
+    fields = getCopyFields(input_fc)
+    upper = [f.upper() for f in fields]
+    # 振り分けに使用するフィールドの位置
+    keys = []
+    for name, table in routes.items():
+        if name.upper() not in upper:
+            raise ValueError(u"{0} に {1} フィールドがありません".format(input_fc, name))
+        keys.append((upper.index(name.upper()), table))
+    fields = fields + ["SHAPE@"]
+
+    # 出力ごとの InsertCursor（ExitStack を閉じたときに全ての出力を確定）
+    cursors = {}
+    with contextlib.ExitStack() as stack:
+        with instr.phase(u"振り分け") as p:
+            with arcpy.da.SearchCursor(input_fc, fields) as scur:
+                for row in scur:
+                    p.rows += 1
+                    for i, table in keys:
+                        for n in table.get(normalizeValue(row[i]), ()):
+                            icur = cursors.get(n)
+                            if icur is None:
+                                out_fc = createOutput(input_fc, out_ws, classes[n])
+                                icur = stack.enter_context(arcpy.da.InsertCursor(out_fc, fields))
+                                cursors[n] = icur
+                            icur.insertRow(row)
+                            classes[n].count += 1
+
+def exportByQuery(input_fc, out_ws, c):
+    '''
+    振り分け表に変換できない出力は、クエリで該当データを確認して FeatureClassToFeatureClass で出力
+    '''
+    with instr.phase(u"選択"):
+        lyr = arcpy.SelectLayerByAttribute_management(input_fc, "NEW_SELECTION", c.expression)
+        cnt = int(arcpy.GetCount_management(lyr).getOutput(0))
+    if cnt > 0:
+        arcpy.AddMessage(u"{0} ({1}) へエクスポート".format(c.name, c.alias))
+        out_fc = os.path.join(out_ws, c.name)
+        with instr.phase(u"エクスポート") as p:
+            if arcpy.Exists(out_fc): #既存のフィーチャクラスがある場合は削除
+                arcpy.Delete_management(out_fc)
+            arcpy.FeatureClassToFeatureClass_conversion(input_fc, out_ws, c.name, c.expression)
+            arcpy.AlterAliasName(out_fc, c.alias)
+            p.rows += cnt
+    c.count = cnt
+
+def splitByConfig(input_fc, out_ws, config_file):
+    '''
+    設定ファイルの出力ごとに、該当データがある場合のみ出力のフィーチャクラスを作成
+    '''
+    classes = readConfig(config_file)
+    fallback = [c for c in classes if not c.compile()]
+    for c in fallback:
+        arcpy.AddMessage(u"{0}: クエリ {1} は振り分け表に変換できないため、FeatureClassToFeatureClass で出力します".format(c.name, c.expression))
+
+    splitFeatures(input_fc, out_ws, classes)
+    for c in fallback:
+        exportByQuery(input_fc, out_ws, c)
+
+    for c in classes:
+        if c.count > 0:
+            instr.count(c.name, c.count)
+        else:
+            arcpy.AddWarning(u"{0} ({1}) は該当データがないためエクスポートをスキップしました".format(c.name, c.alias))
+    return classes